@@ -1,13 +1,177 @@
-from flask import Flask
-from tornado.wsgi import WSGIContainer
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
 from tornado.httpserver import HTTPServer
-from tornado.ioloop import IOLoop
 
-from app import initialize_app
+from app import initialize_app, services
+from app.admission import AdmissionController, RateLimiter
+from app.async_api import ProductChangesStreamHandler, make_tornado_app
+from app.replication import Follower
 
 app = initialize_app()
 
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Product Management API on Tornado.")
+    parser.add_argument("--host", default=os.environ.get("HOST", ""))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5000)))
+    parser.add_argument(
+        "--mode",
+        choices=["threaded", "single", "async"],
+        default=os.environ.get("SERVER_MODE", "threaded"),
+        help="threaded: run Flask requests on a thread pool so slow requests don't "
+             "block the IOLoop (default). single: run every request on the IOLoop thread. "
+             "async: serve /api/products natively on asyncio, the rest through Flask on the thread pool.",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.environ.get("SERVER_THREADS", 16)),
+        help="worker threads for Flask requests in threaded and async modes",
+    )
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=float,
+        default=float(os.environ.get("SHUTDOWN_TIMEOUT", 30)),
+        help="seconds to wait for in-flight requests on SIGINT/SIGTERM",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=int(os.environ.get("MAX_CONCURRENT", -1)),
+        help="requests handled at once, the rest wait in the admission queue; 0 for no limit "
+             "(default: --threads, or 4 x --threads in async mode)",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=int(os.environ.get("ADMISSION_QUEUE", 1024)),
+        help="requests that may wait for a slot before new ones get 503",
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        type=float,
+        default=float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 0.5)),
+        help="seconds a request may wait for a slot before it gets 503",
+    )
+    parser.add_argument(
+        "--queue-target",
+        type=float,
+        default=float(os.environ.get("ADMISSION_QUEUE_TARGET", 0.05)),
+        help="queueing delay in seconds past which writes and bulk requests are shed immediately",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=float(os.environ.get("RATE_LIMIT", 0)),
+        help="requests per second allowed per client IP, 0 for no limit",
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=float,
+        default=float(os.environ.get("RATE_BURST", 0)),
+        help="requests a client may burst above --rate-limit (default: 2 x --rate-limit)",
+    )
+    parser.add_argument(
+        "--trusted-proxies",
+        metavar="ADDRESSES",
+        default=os.environ.get("TRUSTED_PROXIES", ""),
+        help="comma-separated addresses of proxies (and read replicas) whose X-Forwarded-For header "
+             "names the client for --rate-limit; by default the header is ignored",
+    )
+    parser.add_argument(
+        "--follow",
+        metavar="URL",
+        default=os.environ.get("FOLLOW"),
+        help="run as a read replica of the server at URL: copy its catalog, follow its changes "
+             "and serve reads locally",
+    )
+    parser.add_argument(
+        "--max-lag",
+        type=float,
+        default=float(os.environ.get("REPLICA_MAX_LAG", 10)),
+        help="with --follow, seconds behind the primary past which reads get 503, 0 for no limit",
+    )
+    parser.add_argument(
+        "--reject-writes",
+        action="store_true",
+        help="with --follow, reject writes with 405 instead of forwarding them to the primary",
+    )
+    return parser.parse_args()
+
+
+def make_admission_controller(args):
+    """
+    Build the admission controller described by the command line arguments.
+    """
+    max_concurrent = args.max_concurrent
+    if max_concurrent < 0:
+        max_concurrent = args.threads * (4 if args.mode == "async" else 1)
+    rate_limiter = None
+    if args.rate_limit > 0:
+        rate_limiter = RateLimiter(args.rate_limit, args.rate_burst or 2 * args.rate_limit)
+    return AdmissionController(
+        max_concurrent or float("inf"),
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+        queue_target=args.queue_target,
+        rate_limiter=rate_limiter,
+        trusted_proxies=[address.strip() for address in args.trusted_proxies.split(",") if address.strip()],
+    )
+
+
+async def serve(args):
+    """
+    Serve the app until SIGINT/SIGTERM, then stop accepting connections and
+    let in-flight requests finish before exiting.
+    """
+    executor = None
+    if args.mode != "single":
+        executor = ThreadPoolExecutor(max_workers=args.threads, thread_name_prefix="wsgi")
+    follower = None
+    if args.follow:
+        follower = Follower(args.follow, services.store, max_lag=args.max_lag, forward_writes=not args.reject_writes)
+    application = make_tornado_app(
+        app, executor=executor, native_crud=args.mode == "async", admission=make_admission_controller(args),
+        follower=follower,
+    )
+    # No xheaders: X-Forwarded-For is only believed from --trusted-proxies (see admission.client_address)
+    http_server = HTTPServer(application)
+    http_server.listen(args.port, address=args.host)
+    logger.info("Serving on port %s (%s mode%s)", args.port, args.mode,
+                f", {args.threads} threads" if executor else "")
+    replication = None
+    if follower is not None:
+        logger.info("Following %s", follower.primary)
+        replication = asyncio.ensure_future(follower.run())
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    logger.info("Shutting down, waiting up to %ss for in-flight requests", args.shutdown_timeout)
+    http_server.stop()
+    if replication is not None:
+        replication.cancel()
+    ProductChangesStreamHandler.close_all()  # event streams would otherwise stay open until the timeout
+    try:
+        await asyncio.wait_for(http_server.close_all_connections(), args.shutdown_timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Some connections were still open after %ss", args.shutdown_timeout)
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+    services.store.close()  # flush anything not yet on disk
+
+
 if __name__ == "__main__":
-    http_server = HTTPServer(WSGIContainer(app))
-    http_server.listen(5000)
-    IOLoop.instance().start()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("tornado.access").setLevel(logging.WARNING)  # no per-request log lines
+    asyncio.run(serve(parse_args()))
@@ -1,7 +1,11 @@
-from flask import Flask, send_from_directory
-from flasgger import Swagger
+from flask import Flask, Response, abort
 import os
 
+from .metrics import REGISTRY, instrument_app
+from .assets import StaticAssets, generate_asset_response
+from .codec import CodecJSONProvider
+from .compression import compress_response
+from .docs import LazyDocs
 from .routes import blueprint
 
 def initialize_app():
@@ -11,19 +15,48 @@ def initialize_app():
     # Set static folder to the correct path at the project root
     static_folder_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'static')
     app = Flask(__name__, static_folder=static_folder_path)
-
-    # Configure Swagger for API documentation
-    app.config['SWAGGER'] = {
-        'title': 'Product Management API',
-        'uiversion': 3
-    }
-    Swagger(app)  # Initialize Swagger
+    app.json = CodecJSONProvider(app)  # orjson when installed, see app/codec.py
 
     app.register_blueprint(blueprint, url_prefix='/api')
 
+    # Request metrics for /metrics. Set PROFILE_SLOW_REQUEST_MS to also log
+    # the hottest stacks of requests slower than that.
+    slow_request_ms = os.environ.get("PROFILE_SLOW_REQUEST_MS")
+    profiler = None
+    if slow_request_ms:
+        from .profiler import create_profiler
+        profiler = create_profiler(float(slow_request_ms), float(os.environ.get("PROFILE_INTERVAL_MS", 10)))
+    instrument_app(app, profiler)
+    # Registered after the metrics hook so it runs first (after_request hooks
+    # run in reverse order), and the metrics see the compressed size
+    app.after_request(compress_response)
+
+    @app.route('/metrics')
+    def serve_metrics():
+        """
+        Metrics in the Prometheus text format.
+        """
+        return Response(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    # Static files are served from memory, precompressed (see app/assets.py)
+    assets = StaticAssets(app.static_folder)
+    assets.preload()
+
+    def serve_static(filename):
+        asset = assets.get(filename)
+        if asset is None:
+            abort(404)
+        return generate_asset_response(asset)
+
+    app.view_functions['static'] = serve_static
+
     # Route to serve the index.html at root URL
     @app.route('/')
     def serve_index():
-        return send_from_directory(app.static_folder, 'index.html')
+        return serve_static('index.html')
+
+    # Swagger docs at /apidocs. Flasgger is only loaded when they are first
+    # requested, and the spec is cached on disk (see app/docs.py).
+    app.wsgi_app = LazyDocs(app.wsgi_app, app, blueprint, '/api')
 
     return app
@@ -0,0 +1,334 @@
+"""
+Admission control for the Tornado server.
+
+Every request asks `AdmissionController.admit` for a slot before any work is
+done for it. Under overload it is better to turn some requests away quickly
+than to let a queue build up until every client times out together, so a
+request is either:
+
+- run right away, if fewer than `max_concurrent` requests are running,
+- queued, behind requests of a higher priority (cheap reads first, then
+  writes, then bulk requests and full listings), or
+- rejected with a Retry-After header: 429 when its client is over its rate
+  limit, 503 when the server is overloaded.
+
+The queue is bounded. When it is full, a new request displaces the newest
+queued request of a lower priority, or is rejected itself. Queued requests
+give up with a 503 after `queue_timeout`. Like CoDel, the controller also
+watches how long admitted requests waited: once even the shortest wait in an
+interval is above `queue_target`, the queue is standing rather than absorbing
+a burst, and new writes and bulk requests are rejected right away instead
+of being queued. That keeps the latency of the requests that are admitted
+bounded, however much load is offered.
+
+Everything here runs on the IOLoop thread, so no locks are needed.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+
+from .metrics import Counter, Gauge, Histogram
+from .utils import serialize_json
+
+# Priorities, lowest first
+READ, WRITE, BULK = 0, 1, 2
+PRIORITY_NAMES = {READ: "read", WRITE: "write", BULK: "bulk"}
+
+# Never queued or rate limited, so monitoring keeps working under overload.
+# The change stream is exempt too: it stays open, so it would hold a slot for good.
+EXEMPT_PATHS = frozenset(["/metrics", "/api/products/changes/stream"])
+
+admission_rejected = Counter(
+    "admission_rejected_total", "Requests turned away by admission control, by reason and priority.",
+    ["reason", "priority"],
+)
+admission_queue_wait = Histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot, by priority.", ["priority"]
+)
+admission_active = Gauge("admission_active", "Requests holding an admission slot.")
+admission_queued = Gauge("admission_queued", "Requests waiting for an admission slot.")
+
+
+def request_priority(method, path, query_arguments):
+    """
+    Classify a request: single-product reads, searches and other small GETs
+    are READ; bulk endpoints, the NDJSON export and listings without a
+    `limit` (every product) are BULK; anything else is a WRITE.
+    """
+    if path == "/api/products/export" or path.startswith("/api/products/bulk"):
+        return BULK
+    if method in ("GET", "HEAD"):
+        if path == "/api/products" and "limit" not in query_arguments:
+            return BULK
+        return READ
+    return WRITE
+
+
+def client_address(request, trusted_proxies=frozenset()):
+    """
+    The address a request's rate limit is counted against.
+
+    That is the socket peer, unless the peer is a trusted proxy (e.g. a
+    load balancer, or a read replica forwarding writes): then the
+    X-Forwarded-For header is read from the right, past every trusted proxy.
+    Anyone else can put anything in that header, so it is never trusted by default.
+
+    Args:
+        request (tornado.httputil.HTTPServerRequest): The request.
+        trusted_proxies (frozenset): Addresses whose X-Forwarded-For is believed.
+
+    Returns:
+        str: The client's address.
+    """
+    address = request.remote_ip
+    if address not in trusted_proxies:
+        return address
+    hops = [hop.strip() for hop in ",".join(request.headers.get_list("X-Forwarded-For")).split(",")]
+    for hop in reversed(hops):
+        if not hop:
+            break
+        address = hop
+        if hop not in trusted_proxies:
+            break
+    return address
+
+
+class Rejected(Exception):
+    """
+    A request was turned away.
+
+    Args:
+        status (int): 429 or 503.
+        reason (str): Short label for the metrics, e.g. "queue_full".
+        message (str): The error message sent to the client.
+        retry_after (float): Seconds the client should wait before retrying.
+    """
+
+    def __init__(self, status, reason, message, retry_after=1):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.message = message
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    A token bucket per client: `rate` requests per second, with bursts of
+    up to `burst`.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (float): Size of each bucket.
+        max_clients (int): Past this many buckets, full ones are dropped.
+    """
+
+    def __init__(self, rate, burst, max_clients=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = {}  # client -> [tokens, time they were counted]
+
+    def acquire(self, client, now=None):
+        """
+        Take a token from the client's bucket.
+
+        Returns:
+            float: 0 if the request may go ahead, otherwise the seconds until a token is available.
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._prune(now)
+            bucket = self._buckets[client] = [self.burst, now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+    def _prune(self, now):
+        # A bucket that has refilled is the same as no bucket
+        full = [
+            client for client, (tokens, counted) in self._buckets.items()
+            if tokens + (now - counted) * self.rate >= self.burst
+        ]
+        for client in full:
+            del self._buckets[client]
+
+
+class Slot:
+    """
+    Permission to run one request. Release it once the response is finished.
+    """
+
+    __slots__ = ("_controller", "_released")
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release()
+
+
+class AdmissionController:
+    """
+    Caps concurrent requests, queues the overflow by priority and sheds load
+    when the queue stops draining.
+
+    Args:
+        max_concurrent (int): Requests that may run at once.
+        max_queue (int): Requests that may wait for a slot.
+        queue_timeout (float): Seconds a request may wait before it gets a 503.
+        queue_target (float): Acceptable queueing delay in seconds. Once the
+            shortest wait in an `interval` is above it, new writes and bulk
+            requests are rejected instead of queued.
+        interval (float): Seconds over which waits are watched.
+        rate_limiter (RateLimiter): Optional per-client rate limits.
+        trusted_proxies (iterable): Addresses whose X-Forwarded-For header
+            names the client, see `client_address`.
+    """
+
+    def __init__(self, max_concurrent, max_queue=256, queue_timeout=0.5, queue_target=0.05, interval=0.1,
+                 rate_limiter=None, trusted_proxies=()):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.queue_target = queue_target
+        self.interval = interval
+        self.rate_limiter = rate_limiter
+        self.trusted_proxies = frozenset(trusted_proxies)
+        self.active = 0
+        self.overloaded = False
+        self._waiters = []  # heap of [priority, sequence, future, enqueued time]
+        self._sequence = itertools.count()
+        self._interval_end = 0.0
+        self._interval_min_wait = None
+
+    def _record_wait(self, wait, now):
+        # CoDel-style: a queue whose shortest wait stays above the target is standing
+        if self._interval_min_wait is None or wait < self._interval_min_wait:
+            self._interval_min_wait = wait
+        if now >= self._interval_end:
+            self.overloaded = self._interval_min_wait > self.queue_target
+            self._interval_min_wait = None
+            self._interval_end = now + self.interval
+
+    def _update_gauges(self):
+        admission_active.set(self.active)
+        admission_queued.set(len(self._waiters))
+
+    def _remove_waiter(self, waiter):
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+
+    def _release(self):
+        self.active -= 1
+        if self._waiters:
+            priority, _, future, enqueued = heapq.heappop(self._waiters)
+            self.active += 1
+            now = time.monotonic()
+            self._record_wait(now - enqueued, now)
+            admission_queue_wait.observe(now - enqueued, PRIORITY_NAMES[priority])
+            future.set_result(None)
+        self._update_gauges()
+
+    async def acquire(self, priority, client=None):
+        """
+        Wait for a slot.
+
+        Args:
+            priority (int): READ, WRITE or BULK.
+            client (str): Who is asking, for the rate limits.
+
+        Returns:
+            Slot: The slot, to be released when the request is finished.
+
+        Raises:
+            Rejected: If the request is turned away.
+        """
+        if self.rate_limiter is not None and client is not None:
+            wait = self.rate_limiter.acquire(client)
+            if wait:
+                raise Rejected(429, "rate_limited", "Too many requests.", wait)
+
+        now = time.monotonic()
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._record_wait(0.0, now)
+            self._update_gauges()
+            return Slot(self)
+
+        if self.overloaded and priority != READ:
+            raise Rejected(503, "overloaded", "The server is overloaded.")
+        if len(self._waiters) >= self.max_queue:
+            # Make room by shedding the newest waiter of the lowest priority, if it ranks below this request
+            lowest = max(self._waiters)
+            if lowest[0] <= priority:
+                raise Rejected(503, "queue_full", "The server is overloaded.")
+            self._remove_waiter(lowest)
+            admission_rejected.inc("displaced", PRIORITY_NAMES[lowest[0]])
+            lowest[2].set_exception(Rejected(503, "displaced", "The server is overloaded."))
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = [priority, next(self._sequence), future, now]
+        heapq.heappush(self._waiters, waiter)
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                self._remove_waiter(waiter)
+                self._update_gauges()
+                raise Rejected(503, "queue_timeout", "The server is overloaded.") from None
+        except asyncio.CancelledError:
+            if not future.done():
+                self._remove_waiter(waiter)
+                self._update_gauges()
+            elif future.exception() is None:
+                self._release()  # granted just as we were cancelled
+            raise
+        future.result()  # raises if this waiter was displaced
+        return Slot(self)
+
+    async def admit(self, handler):
+        """
+        Get a slot for a Tornado request, or send the rejection.
+
+        Args:
+            handler (tornado.web.RequestHandler): The request's handler.
+
+        Returns:
+            Slot: The slot to release when the request is finished, or None
+                if the request was rejected (the response is already sent).
+        """
+        request = handler.request
+        if request.path in EXEMPT_PATHS:
+            return Slot(_Unlimited)
+        priority = request_priority(request.method, request.path, request.query_arguments)
+        try:
+            return await self.acquire(priority, client_address(request, self.trusted_proxies))
+        except Rejected as rejection:
+            if rejection.reason != "displaced":
+                admission_rejected.inc(rejection.reason, PRIORITY_NAMES[priority])
+            handler.set_status(rejection.status)
+            handler.set_header("Content-Type", "application/json")
+            # Retry-After is in whole seconds
+            handler.set_header("Retry-After", str(max(1, math.ceil(rejection.retry_after))))
+            handler.finish(serialize_json({"error": rejection.message}))
+            return None
+
+
+class _Unlimited:
+    # Stands in for the controller in the slots of exempt requests
+    @staticmethod
+    def _release():
+        pass
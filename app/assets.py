@@ -0,0 +1,147 @@
+"""
+Static files (the web page in static/), precompressed and cached in memory.
+
+Every file is read and compressed once, at the highest gzip and brotli
+settings since that only happens once, and kept with its ETag. The cache is
+keyed by the file's mtime and size, so an edited file is picked up on its
+next request without a restart. Compressed variants are only kept when they
+are smaller.
+
+HTML pages link to the other assets with a version parameter
+(/static/script.js?v=<hash>), rewritten as the page is loaded. A versioned URL
+never changes content, so it is served with a year-long, immutable
+Cache-Control. Unversioned URLs, the page itself included, must be
+revalidated each time, which is a cheap 304 thanks to the ETag.
+"""
+import mimetypes
+import os
+import re
+
+from flask import Response, request
+from werkzeug.security import safe_join
+
+from .cache import make_etag
+from .compression import ENCODINGS, MIN_SIZE, compress, negotiate, variant_etag
+
+# Highest settings, the files are only compressed once
+STATIC_LEVELS = {"br": 11, "gzip": 9}
+COMPRESSIBLE_TYPES = frozenset(["application/javascript", "application/json", "image/svg+xml"])
+ASSET_LINK = re.compile(r'(src|href)="/static/([^"?#]+)"')
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class Asset:
+    """
+    One static file, as served.
+
+    Attributes:
+        body (bytes): The file's content (with versioned links, for HTML).
+        etag (str): Its strong ETag.
+        version (str): Short hash used as the ?v= parameter in links to it.
+        mimetype (str): Its content type.
+        variants (dict): encoding -> (compressed body, ETag), most preferred first.
+        links (list): (filename, version) of the assets an HTML page links to.
+    """
+
+    __slots__ = ("key", "body", "etag", "version", "mimetype", "variants", "links")
+
+    def __init__(self, key, body, mimetype, links=()):
+        self.key = key
+        self.body = body
+        self.etag = make_etag(body)
+        self.version = self.etag[1:13]
+        self.mimetype = mimetype
+        self.links = list(links)
+        self.variants = {}
+        if len(body) >= MIN_SIZE and (mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES):
+            for encoding in ENCODINGS:
+                compressed = compress(body, encoding, STATIC_LEVELS[encoding])
+                if len(compressed) < len(body):
+                    self.variants[encoding] = (compressed, variant_etag(self.etag, encoding))
+
+
+class StaticAssets:
+    """
+    Serves the files in `folder` from memory, precompressed.
+
+    Two threads loading the same changed file at once both do the work, and
+    the last one wins. That is harmless, so there is no lock.
+
+    Args:
+        folder (str): The static folder.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._assets = {}  # filename -> Asset
+
+    def preload(self):
+        """
+        Load and compress every file now, so no request has to.
+        """
+        for directory, _, filenames in os.walk(self.folder):
+            for filename in filenames:
+                self.get(os.path.relpath(os.path.join(directory, filename), self.folder).replace(os.sep, "/"))
+
+    def get(self, filename):
+        """
+        Returns:
+            Asset: The file, loaded again if it changed on disk, or None if
+                there is no such file.
+        """
+        path = safe_join(self.folder, filename)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        asset = self._assets.get(filename)
+        if asset is None or asset.key != key or any(self._version(name) != version for name, version in asset.links):
+            asset = self._assets[filename] = self._load(path, key)
+        return asset
+
+    def _version(self, filename):
+        asset = self.get(filename)
+        return asset and asset.version
+
+    def _load(self, path, key):
+        with open(path, "rb") as source:
+            body = source.read()
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        links = []
+        if mimetype == "text/html":
+            def version_link(match):
+                version = self._version(match.group(2))
+                if version is None:
+                    return match.group(0)
+                links.append((match.group(2), version))
+                return f'{match.group(1)}="/static/{match.group(2)}?v={version}"'
+
+            body = ASSET_LINK.sub(version_link, body.decode()).encode()
+        return Asset(key, body, mimetype, links)
+
+
+def generate_asset_response(asset):
+    """
+    Build the response for a static file: its best compressed variant for
+    the client, an ETag, and Cache-Control depending on whether the URL is
+    versioned. Returns 304 Not Modified when If-None-Match already has it.
+
+    Args:
+        asset (Asset): The file.
+
+    Returns:
+        Flask response: The file, or an empty 304.
+    """
+    encoding = negotiate(request.headers.get("Accept-Encoding"), asset.variants)
+    body, etag = asset.variants[encoding] if encoding is not None else (asset.body, asset.etag)
+    response = Response(body, mimetype=asset.mimetype)
+    response.headers["ETag"] = etag
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    if asset.variants:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = IMMUTABLE if request.args.get("v") == asset.version else "no-cache"
+    return response.make_conditional(request)
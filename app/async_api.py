@@ -0,0 +1,513 @@
+"""
+Asyncio-native implementation of the /api/products endpoints on Tornado.
+
+The handlers follow the same request/response contracts as the Flask views
+in app/routes.py and share their validation helpers from app/utils.py.
+Any other path is passed through to the Flask app.
+
+The NDJSON export is always served from here, in every serving mode, because
+Tornado's WSGIContainer buffers a whole WSGI response before sending it.
+So is the change feed's event stream, which stays open for as long as the
+client listens.
+
+With an AdmissionController (see app/admission.py), every request, native or
+passed through to Flask, waits for an admission slot first and holds it until
+its response is finished.
+"""
+import asyncio
+
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado.httpclient import HTTPClientError
+from tornado.routing import Rule
+from tornado.web import Application, FallbackHandler, RequestHandler
+from tornado.wsgi import WSGIContainer
+
+from . import async_services as services
+from .codec import loads
+from .compression import encode_body
+from .schemas import NEW_PRODUCT, NOT_AN_OBJECT, PRODUCT_CHANGES
+from .services import InsufficientStock, PreconditionFailed, change_log, changes_version
+from .metrics import http_in_flight, record_request
+from .replication import HOP_BY_HOP, IMAGE_PATH, READ_METHODS, ReplicaMatcher
+from .utils import (
+    parse_product_query,
+    parse_if_match,
+    parse_adjustment,
+    encode_cursor,
+    accepts_gzip,
+    generate_ndjson,
+    serialize_json
+)
+
+
+class JSONHandler(RequestHandler):
+    """
+    Base handler that writes JSON the same way Flask's `jsonify` does.
+
+    Requests are recorded in the same metrics as the Flask views, labelled
+    with `route`, the matching Flask URL rule.
+    """
+
+    route = None
+
+    async def prepare(self):
+        self._bytes_sent = 0
+        self._in_flight = False
+        self._slot = None
+        admission = self.settings.get("admission")
+        if admission is not None:
+            self._slot = await admission.admit(self)
+            if self._slot is None:
+                return  # rejected, the response is sent
+        self._in_flight = True
+        http_in_flight.inc()
+
+    def write(self, chunk):
+        super().write(chunk)
+        if isinstance(chunk, (bytes, str)):
+            self._bytes_sent += len(chunk)
+
+    def _leave_in_flight(self):
+        if getattr(self, "_in_flight", False):
+            self._in_flight = False
+            http_in_flight.dec()
+        if getattr(self, "_slot", None) is not None:
+            self._slot.release()
+
+    def on_connection_close(self):
+        # A client that goes away mid-request may never reach on_finish
+        super().on_connection_close()
+        self._leave_in_flight()
+
+    def on_finish(self):
+        self._leave_in_flight()
+        record_request(
+            self.request.method, self.route, self.get_status(),
+            self.request.request_time(), getattr(self, "_bytes_sent", 0),
+        )
+
+    def compute_etag(self):
+        return None  # only cached responses get an ETag, set in send_cached
+
+    def encode(self, body, etag=None):
+        """
+        Compress a JSON body as the client accepts (see app/compression.py)
+        and set the matching headers.
+
+        Returns:
+            tuple: (the body to send, its ETag)
+        """
+        body, encoding, etag, vary = encode_body(body, self.request.headers.get("Accept-Encoding"), etag)
+        if encoding is not None:
+            self.set_header("Content-Encoding", encoding)
+        if vary:
+            self.set_header("Vary", "Accept-Encoding")
+        return body, etag
+
+    def send_json(self, data, status_code=200, headers=None):
+        self.set_status(status_code)
+        self.set_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.set_header(name, value)
+        body = serialize_json(data)
+        if status_code == 200:
+            body, _ = self.encode(body)
+        self.finish(body)
+
+    def send_cached(self, body, etag):
+        """
+        Send a cached JSON body with its ETag, or 304 if the client has it already.
+        """
+        body, etag = self.encode(body, etag)
+        self.set_header("Content-Type", "application/json")
+        self.set_header("Etag", etag)
+        self.set_header("Cache-Control", "no-cache")
+        if self.check_etag_header():
+            self.set_status(304)
+            self.finish()
+            return
+        self.finish(body)
+
+    def send_error_message(self, message, status_code):
+        self.send_json({"error": message}, status_code)
+
+    def query_args(self):
+        """
+        Returns:
+            dict: The query string parameters. Like Flask's `request.args`, a
+                repeated parameter takes its first value, and values aren't stripped.
+        """
+        return {name: self.get_query_arguments(name, strip=False)[0] for name in self.request.query_arguments}
+
+    def read_json(self):
+        """
+        Returns:
+            The decoded request body, or None if it isn't a JSON body (a 400 is sent).
+            Like Flask's `get_json`, only application/json (or */*+json) bodies are read.
+        """
+        mimetype = self.request.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if not (mimetype == "application/json" or (mimetype.startswith("application/") and mimetype.endswith("+json"))):
+            self.send_error_message(NOT_AN_OBJECT, 400)
+            return None
+        try:
+            return loads(self.request.body)
+        except ValueError:
+            self.send_error_message(NOT_AN_OBJECT, 400)
+            return None
+
+
+class ProductListHandler(JSONHandler):
+    route = "/api/products"
+
+    async def get(self):
+        args = self.query_args()
+        if not args:
+            self.set_header("X-Changes-Version", str(changes_version()))  # before the list, so no change is missed
+            self.send_cached(*await services.fetch_all_products_response())
+            return
+
+        query, error_message = parse_product_query(args)
+        if error_message:
+            self.send_error_message(error_message, 400)
+            return
+
+        page, next_entry = await services.query_products(**query)
+        headers = {}
+        if next_entry is not None:
+            headers["X-Next-Cursor"] = encode_cursor(args.get("sort", "id"), next_entry)
+        self.send_json(page, 200, headers)
+
+    async def head(self):
+        await self.get()
+
+    async def post(self):
+        item_details = self.read_json()
+        if item_details is None:
+            return
+
+        error_message = NEW_PRODUCT.validate(item_details)
+        if error_message:
+            self.send_error_message(error_message, 400)
+            return
+
+        try:
+            new_item = await services.add_product(item_details)
+        except ValueError as error:
+            self.send_error_message(str(error), 400)
+            return
+        self.send_json(new_item, 201)
+
+
+class ProductHandler(JSONHandler):
+    route = "/api/products/<int:item_id>"
+
+    async def get(self, item_id):
+        cached = await services.find_product_response(int(item_id))
+        if cached:
+            self.send_cached(*cached)
+            return
+        self.send_error_message("Item not found", 404)
+
+    async def head(self, item_id):
+        await self.get(item_id)
+
+    async def put(self, item_id):
+        updated_data = self.read_json()
+        if updated_data is None:
+            return
+        error_message = PRODUCT_CHANGES.validate(updated_data)
+        if error_message:
+            self.send_error_message(error_message, 400)
+            return
+
+        if_match = parse_if_match(self.request.headers.get("If-Match"))
+        try:
+            updated_item = await services.update_product(int(item_id), updated_data, if_match)
+        except ValueError as error:
+            self.send_error_message(str(error), 400)
+            return
+        except PreconditionFailed as error:
+            self.send_error_message(str(error), 412)
+            return
+        if updated_item:
+            self.send_json(updated_item)
+            return
+        self.send_error_message("Item not found", 404)
+
+    async def delete(self, item_id):
+        if not await services.delete_product(int(item_id)):
+            self.send_error_message("Item not found", 404)
+            return
+        self.send_json({"message": "Item deleted successfully"})
+
+
+class ProductAdjustHandler(JSONHandler):
+    route = "/api/products/<int:item_id>/adjust"
+
+    async def post(self, item_id):
+        data = self.read_json()
+        if data is None:
+            return
+        adjustment, error_message = parse_adjustment(data)
+        if error_message:
+            self.send_error_message(error_message, 400)
+            return
+
+        if_match = parse_if_match(self.request.headers.get("If-Match"))
+        try:
+            updated_item = await services.adjust_product_quantity(int(item_id), *adjustment, if_match)
+        except ValueError as error:
+            self.send_error_message(str(error), 400)
+            return
+        except InsufficientStock as error:
+            self.send_error_message(str(error), 409)
+            return
+        except PreconditionFailed as error:
+            self.send_error_message(str(error), 412)
+            return
+        if updated_item:
+            self.send_json(updated_item)
+            return
+        self.send_error_message("Item not found", 404)
+
+
+class ProductExportHandler(JSONHandler):
+    route = "/api/products/export"
+
+    async def get(self):
+        args = self.query_args()
+        query, error_message = parse_product_query(args)
+        if error_message:
+            self.send_error_message(error_message, 400)
+            return
+
+        self.set_header("X-Changes-Version", str(changes_version()))  # before the snapshot
+        if args:
+            snapshot = (await services.query_products(**query))[0]
+        else:
+            snapshot = await services.fetch_all_products()
+        compress = accepts_gzip(self.request.headers.get("Accept-Encoding"))
+
+        self.set_header("Content-Type", "application/x-ndjson")
+        self.set_header("Vary", "Accept-Encoding")
+        if compress:
+            self.set_header("Content-Encoding", "gzip")
+        for chunk in generate_ndjson(snapshot, compress=compress):
+            self.write(chunk)
+            # Waits until the chunk is handed to the socket, so a slow client
+            # doesn't make the whole export pile up in memory
+            await self.flush()
+        self.finish()
+
+
+class ProductChangesStreamHandler(JSONHandler):
+    """
+    Server-sent events with the product changes, as they are made.
+
+    Each "changes" event has the same {"version", "changes"} data as
+    GET /api/products/changes and the version as its id, so a browser's
+    EventSource resumes where it left off after a reconnect (it sends the
+    id back in Last-Event-ID). A "reset" event means the changes since the
+    client's version are no longer kept: reload the products and reconnect.
+    While nothing changes, a "heartbeat" event with the current version is
+    sent every `heartbeat` seconds (15 by default), which tells read replicas
+    they are up to date.
+    """
+
+    route = "/api/products/changes/stream"
+    HEARTBEAT_SECONDS = 15  # also keeps proxies from closing an idle stream
+    MIN_HEARTBEAT_SECONDS = 0.1
+    RETRY_MILLISECONDS = 2000
+    streams = set()  # the open streams, closed by close_all at shutdown
+
+    @classmethod
+    def close_all(cls):
+        """
+        End every open stream, so the server can shut down without waiting for them.
+        """
+        for stream in list(cls.streams):
+            stream._stop()
+
+    def _stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def on_connection_close(self):
+        super().on_connection_close()
+        if hasattr(self, "_wake"):
+            self._stop()
+
+    def send_event(self, event, data, event_id=None):
+        if event_id is not None:
+            self.write(f"id: {event_id}\n")
+        self.write(f"event: {event}\ndata: ".encode() + serialize_json(data) + b"\n\n")
+
+    async def get(self):
+        since = self.request.headers.get("Last-Event-ID") or self.get_query_argument("since", None)
+        heartbeat = self.get_query_argument("heartbeat", None)
+        try:
+            since = changes_version() if since is None else int(since)
+        except ValueError:
+            self.send_error_message("since must be an integer.", 400)
+            return
+        try:
+            heartbeat = self.HEARTBEAT_SECONDS if heartbeat is None else float(heartbeat)
+        except ValueError:
+            heartbeat = float("nan")
+        if not self.MIN_HEARTBEAT_SECONDS <= heartbeat <= self.HEARTBEAT_SECONDS:
+            self.send_error_message(
+                f"heartbeat must be between {self.MIN_HEARTBEAT_SECONDS} and {self.HEARTBEAT_SECONDS} seconds.", 400
+            )
+            return
+
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        self._stopped = False
+        self._wake = asyncio.Event()
+        loop = IOLoop.current()
+
+        def notify(version):
+            # Called from whichever thread made the write
+            loop.add_callback(self._wake.set)
+
+        change_log.subscribe(notify)
+        self.streams.add(self)
+        try:
+            self.write(f"retry: {self.RETRY_MILLISECONDS}\n\n")
+            await self.flush()
+            while not self._stopped:
+                self._wake.clear()  # before reading the changes, so a write made meanwhile wakes us again
+                result = await services.fetch_changes(since)
+                if result is None:
+                    self.send_event("reset", {"version": changes_version()})
+                    break
+                changes, version = result
+                if changes:
+                    self.send_event("changes", {"version": version, "changes": changes}, version)
+                    await self.flush()
+                since = version
+                try:
+                    await asyncio.wait_for(self._wake.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    self.send_event("heartbeat", {"version": changes_version()})
+                    await self.flush()
+        except StreamClosedError:
+            return  # the client went away
+        finally:
+            change_log.unsubscribe(notify)
+            self.streams.discard(self)
+        if not self.request.connection.stream.closed():
+            self.finish()
+
+
+class ReplicationStatusHandler(JSONHandler):
+    route = "/api/replication"
+
+    def initialize(self, follower=None):
+        self.follower = follower
+
+    def get(self):
+        if self.follower is None:
+            self.send_json({"role": "primary", "version": changes_version()})
+            return
+        self.send_json(self.follower.status())
+
+
+class ReplicaHandler(JSONHandler):
+    """
+    On a read replica, handles the requests it doesn't serve from its own
+    copy of the catalog (see app/replication.py): writes and image downloads
+    are forwarded to the primary (or writes rejected with 405, if forwarding
+    is off), and API reads get 503 while the replica is too far behind.
+    """
+
+    route = "(forwarded to the primary)"
+
+    def initialize(self, follower):
+        self.follower = follower
+
+    async def handle(self, *args):
+        request = self.request
+        is_write = request.method not in READ_METHODS
+        if not is_write and not IMAGE_PATH.match(request.path):
+            self.set_header("Retry-After", "1")
+            self.send_error_message("This read replica is too far behind the primary.", 503)
+            return
+        if is_write and not self.follower.forward_writes:
+            self.set_header("Allow", "GET, HEAD")
+            self.send_error_message(f"This server is a read replica, send writes to {self.follower.primary}.", 405)
+            return
+
+        try:
+            response = await self.follower.forward(request)
+        except (HTTPClientError, OSError):
+            self.send_error_message("The primary server is unavailable.", 502)
+            return
+        self.set_status(response.code, response.reason)
+        headers = [(name, value) for name, value in response.headers.get_all() if name.lower() not in HOP_BY_HOP]
+        for name in {name for name, _ in headers}:
+            self.clear_header(name)
+        for name, value in headers:
+            self.add_header(name, value)
+        self.finish(response.body or None)
+
+    get = head = post = put = patch = delete = options = handle
+
+
+class AdmittedFallbackHandler(FallbackHandler):
+    """
+    Passes requests through to the WSGI app like FallbackHandler, but only
+    once admission control lets them in, and holds their slot until the
+    WSGI response has been written.
+    """
+
+    async def prepare(self):
+        slot = await self.settings["admission"].admit(self)
+        if slot is None:
+            return  # rejected, the response is sent
+        try:
+            await self.fallback.handle_request(self.request)
+        finally:
+            slot.release()
+        self._finished = True
+        self.on_finish()
+
+
+def make_tornado_app(flask_app, executor=None, native_crud=True, admission=None, follower=None):
+    """
+    Build the Tornado application: the streaming export and change feed,
+    optionally the native product endpoints, and everything else (static files, docs,
+    images, search, bulk) through the Flask app.
+
+    Args:
+        flask_app (Flask): The app returned by `initialize_app`.
+        executor (Executor): Optional thread pool for the Flask fallback.
+        native_crud (bool): Serve the product CRUD endpoints from asyncio
+            handlers instead of Flask.
+        admission (AdmissionController): Optional admission control for
+            every request (see app/admission.py).
+        follower (Follower): Set on a read replica, to forward writes to
+            its primary (see app/replication.py).
+
+    Returns:
+        tornado.web.Application: The application to pass to an HTTPServer.
+    """
+    wsgi_fallback = WSGIContainer(flask_app, executor=executor)
+    handlers = []
+    if follower is not None:
+        handlers.append(Rule(ReplicaMatcher(follower), ReplicaHandler, {"follower": follower}))
+    handlers += [
+        (r"/api/products/export", ProductExportHandler),
+        (r"/api/products/changes/stream", ProductChangesStreamHandler),
+        (r"/api/replication", ReplicationStatusHandler, {"follower": follower}),
+    ]
+    if native_crud:
+        handlers += [
+            (r"/api/products", ProductListHandler),
+            (r"/api/products/(\d+)", ProductHandler),
+            (r"/api/products/(\d+)/adjust", ProductAdjustHandler),
+        ]
+    fallback_handler = FallbackHandler if admission is None else AdmittedFallbackHandler
+    handlers.append((r".*", fallback_handler, {"fallback": wsgi_fallback}))
+    return Application(handlers, admission=admission)
@@ -0,0 +1,57 @@
+"""
+Coroutine versions of the functions in app/services.py, for the asyncio API.
+
+Each call runs the regular service function on a small thread pool. Store
+operations take the store's reader/writer lock, and a write held by a WSGI
+worker thread must not stall the event loop while a coroutine waits for it.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from . import services
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="store")
+
+
+async def _run(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def fetch_all_products():
+    return await _run(services.fetch_all_products)
+
+
+async def fetch_all_products_response():
+    return await _run(services.fetch_all_products_response)
+
+
+async def fetch_changes(since):
+    return await _run(services.fetch_changes, since)
+
+
+async def query_products(**query):
+    return await _run(lambda: services.query_products(**query))
+
+
+async def find_product_by_id(item_id):
+    return await _run(services.find_product_by_id, item_id)
+
+
+async def find_product_response(item_id):
+    return await _run(services.find_product_response, item_id)
+
+
+async def add_product(new_product):
+    return await _run(services.add_product, new_product)
+
+
+async def update_product(item_id, updated_data, if_match=None):
+    return await _run(services.update_product, item_id, updated_data, if_match)
+
+
+async def adjust_product_quantity(item_id, delta, floor=0, if_match=None):
+    return await _run(services.adjust_product_quantity, item_id, delta, floor, if_match)
+
+
+async def delete_product(item_id):
+    return await _run(services.delete_product, item_id)
@@ -0,0 +1,118 @@
+"""
+Content-addressed storage for product images on local disk.
+
+Each blob is stored once under the SHA-256 of its bytes, so identical images
+uploaded for different products share a single file. A blob key looks like
+"<sha256>.<ext>". The extension records the content type, so a key is all
+that is needed to serve the file.
+
+Blobs are served from the API's own origin, so only raster image types are
+accepted. Anything a browser would run (HTML, SVG with scripts, ...) could
+otherwise be uploaded as a product image and served as a page.
+"""
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from urllib.parse import unquote_to_bytes
+
+DATA_URL_PATTERN = re.compile(r"^data:(?P<mimetype>[\w.+-]+/[\w.+-]+)?(?P<params>(;[^,;]*)*?)(?P<base64>;base64)?,", re.I)
+BLOB_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]+)?$")
+# Content types accepted for uploaded images. No image/svg+xml: SVG can carry scripts.
+IMAGE_TYPES = frozenset(["image/avif", "image/bmp", "image/gif", "image/jpeg", "image/png", "image/webp"])
+
+
+def decode_data_url(url):
+    """
+    Decode a `data:` URL.
+
+    Args:
+        url (str): A URL such as "data:image/jpeg;base64,/9j/4AAQ...".
+
+    Returns:
+        tuple: (bytes, mimetype), or None if `url` is not a data URL.
+
+    Raises:
+        ValueError: If the URL claims to be base64 but isn't.
+    """
+    if not isinstance(url, str):
+        return None
+    match = DATA_URL_PATTERN.match(url)
+    if not match:
+        return None
+
+    payload = url[match.end():]
+    mimetype = (match.group("mimetype") or "text/plain").lower()
+    if not match.group("base64"):
+        return unquote_to_bytes(payload), mimetype
+    try:
+        return base64.b64decode(payload, validate=True), mimetype
+    except binascii.Error as error:
+        raise ValueError("Invalid base64 image data.") from error
+
+
+class BlobStore:
+    """
+    Stores blobs as files named after their hash, sharded by the first two hex digits.
+
+    Args:
+        root (str): Directory to keep the blobs in. Created on first write.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, key):
+        """
+        Returns:
+            str: The file path for `key`, or None if `key` isn't a valid blob key.
+        """
+        if not isinstance(key, str) or not BLOB_KEY_PATTERN.match(key):
+            return None
+        return os.path.join(self.root, key[:2], key)
+
+    def exists(self, key):
+        path = self.path(key)
+        return path is not None and os.path.exists(path)
+
+    def mimetype(self, key):
+        """
+        Returns:
+            str: The image type of `key`, or "application/octet-stream" if it
+                isn't one of IMAGE_TYPES (e.g. a blob stored before they were checked).
+        """
+        mimetype = mimetypes.guess_type(key)[0]
+        return mimetype if mimetype in IMAGE_TYPES else "application/octet-stream"
+
+    def put(self, data, mimetype):
+        """
+        Store `data` unless an identical blob is already there.
+
+        Returns:
+            str: The blob key.
+
+        Raises:
+            ValueError: If `mimetype` isn't one of IMAGE_TYPES.
+        """
+        if mimetype not in IMAGE_TYPES:
+            raise ValueError(f"Unsupported image type '{mimetype}', use one of: {', '.join(sorted(IMAGE_TYPES))}.")
+        extension = mimetypes.guess_extension(mimetype) or ""
+        key = hashlib.sha256(data).hexdigest() + extension
+        path = self.path(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename, so readers never see a partial blob
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return key
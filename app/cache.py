@@ -0,0 +1,83 @@
+"""
+Cache of serialized JSON responses.
+
+Entries are tagged with the store version they were built from (see
+`ProductStore.version` and `ProductStore.item_version`). A lookup passes the
+current version, so any write to the store makes the old entry a miss without
+the write path having to know which responses exist.
+"""
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+
+def make_etag(body):
+    """
+    Build a strong ETag from the response body, e.g. '"3f2a..."'.
+
+    The tag depends only on the bytes, so it stays valid across restarts and
+    matches between the Flask and Tornado handlers.
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class ResponseCache:
+    """
+    LRU cache of (body, etag) pairs, bounded by the total size of the bodies.
+
+    Args:
+        max_bytes (int): Memory budget for cached bodies. Least recently used
+            entries are evicted past it, and a body bigger than the whole
+            budget is never cached.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (version, body, etag)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        """
+        Returns:
+            tuple: (body, etag) cached for `key` at `version`, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key, version, body):
+        """
+        Cache a serialized body for `key` as of `version`.
+
+        Returns:
+            tuple: (body, etag), whether or not the body fit in the cache.
+        """
+        etag = make_etag(body)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            if len(body) > self.max_bytes:
+                return body, etag
+            self._entries[key] = (version, body, etag)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return body, etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -0,0 +1,108 @@
+"""
+A bounded, versioned log of the changes made to the catalog.
+
+The log listens to the product store (see `ProductStore.add_listener`) and
+keeps the operations of its latest writes, numbered with the version each
+write produced. A client that has seen every change up to some version asks
+for the ones after it (`since`) instead of downloading the whole catalog
+again. Once the log has grown past `max_changes`, its oldest versions are
+dropped, and clients still behind them get None back (410 Gone over HTTP):
+they must reload the catalog and start again from its version.
+
+Versions are offset by `base`, which the server sets from the clock at
+startup. A restarted server therefore starts above every version the
+previous one handed out, so a client holding one of those gets a 410 rather
+than a wrong set of changes.
+
+Subscribers registered with `subscribe` are called with the new version
+after every write, from the writing thread; the server's event stream uses
+this to wake up its connections.
+"""
+from collections import deque
+from threading import Lock
+
+
+def _compact(entries):
+    # Keep only the last change of each product, in the order of those last changes
+    latest = {}
+    for version, operations in entries:
+        for op, value in operations:
+            item_id = value["id"] if op == "put" else value
+            latest.pop(item_id, None)
+            latest[item_id] = (version, op, value)
+    return [
+        {"version": version, "op": "put", "product": value} if op == "put"
+        else {"version": version, "op": "delete", "id": value}
+        for version, op, value in latest.values()
+    ]
+
+
+class ChangeLog:
+    """
+    Args:
+        max_changes (int): Operations to keep. The oldest versions are
+            dropped past this, but the latest version is always kept.
+        base (int): The version of the catalog before the first change.
+    """
+
+    def __init__(self, max_changes=10000, base=0):
+        self.max_changes = max_changes
+        self.base = base
+        self.version = base
+        self._trimmed = base  # changes up to this version are no longer in the log
+        self._entries = deque()  # (version, operations), oldest first
+        self._size = 0
+        self._lock = Lock()
+        self._subscribers = []
+
+    def record(self, store_version, operations):
+        """
+        Add the operations of one write. Registered as a store listener.
+        """
+        version = self.base + store_version
+        with self._lock:
+            self._entries.append((version, operations))
+            self._size += len(operations)
+            while self._size > self.max_changes and len(self._entries) > 1:
+                trimmed_version, trimmed = self._entries.popleft()
+                self._size -= len(trimmed)
+                self._trimmed = trimmed_version
+            self.version = version
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(version)
+
+    def since(self, version):
+        """
+        The changes made after `version`, with only the last change of each product.
+
+        Args:
+            version (int): The last version the client has seen.
+
+        Returns:
+            tuple: (changes, the current version), or None if the changes
+                after `version` are no longer in the log or `version` was
+                never handed out.
+        """
+        with self._lock:
+            if version < self._trimmed or version > self.version:
+                return None
+            entries = []
+            for entry in reversed(self._entries):
+                if entry[0] <= version:
+                    break
+                entries.append(entry)
+            current = self.version
+        entries.reverse()
+        return _compact(entries), current
+
+    def subscribe(self, callback):
+        """
+        Call `callback(version)` after every write, from the writing thread.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.remove(callback)
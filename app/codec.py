@@ -0,0 +1,79 @@
+"""
+JSON encoding and decoding for the whole app.
+
+Uses orjson when it is installed, which encodes several times faster than
+the standard library, and falls back to the `json` module otherwise. Either
+way the output is compact with sorted keys, so a body is the same whether
+the Flask app, the asyncio handlers or the response cache produced it.
+
+Product records (see app/records.py) are turned into plain objects as
+they are encoded.
+"""
+import json
+
+from flask.json.provider import JSONProvider
+
+from .records import json_default
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _dumps_stdlib(data):
+    return json.dumps(data, default=json_default, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode()
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data):
+        """
+        Returns:
+            bytes: `data` as compact JSON with sorted keys.
+        """
+        try:
+            return orjson.dumps(data, default=json_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which orjson refuses
+            return _dumps_stdlib(data)
+
+    def loads(data):
+        """
+        Returns:
+            The decoded JSON document.
+
+        Raises:
+            ValueError: If `data` isn't valid JSON.
+        """
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson refuses integers wider than 64 bits, which the standard
+            # library reads, so both backends reject them the same way: in validation
+            return json.loads(data)
+else:
+    dumps = _dumps_stdlib
+    loads = json.loads
+
+
+class CodecJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by `dumps` and `loads`, so `jsonify` and
+    `request.get_json` use the fast codec too.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj) + b"\n", mimetype=self.mimetype)
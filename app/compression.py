@@ -0,0 +1,164 @@
+"""
+Response compression, negotiated with the client's Accept-Encoding.
+
+Brotli is used when the `brotli` package is installed and the client accepts
+it, gzip otherwise. Bodies under MIN_SIZE bytes are sent as they are: they
+gain little, and compressing them would cost more CPU than it saves.
+
+Compressing the same body again on every request would waste CPU on exactly
+the responses that are requested the most (the full catalog is several MB),
+so the compressed variants of cached responses are kept in their own LRU
+cache, under the body's ETag. The ETag is a hash of the body, so a write that
+changes the body also changes the key. A compressed variant gets its own
+ETag, with the encoding appended ("<tag>-br"), as a strong ETag must differ
+between representations.
+"""
+import gzip
+import os
+
+from flask import request
+
+from .cache import ResponseCache
+from .metrics import Counter, Gauge
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+# Supported encodings, most preferred first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+MIN_SIZE = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+# Per-request settings: brotli's default quality (11) is far too slow for
+# responses built on the fly. On the full catalog, 5 takes about 1.5x as long
+# as gzip -6 and is a fifth smaller, and each body is only compressed once.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Only JSON is compressed on the fly. Static files are precompressed (app/assets.py),
+# images are compressed already.
+COMPRESSIBLE_TYPES = frozenset(["application/json"])
+
+COMPRESSED_CACHE_BYTES = int(os.environ.get("COMPRESSED_CACHE_BYTES", 32 * 1024 * 1024))
+compressed_cache = ResponseCache(COMPRESSED_CACHE_BYTES)
+
+Gauge("compressed_cache_bytes", "Size of the cached compressed bodies.", function=lambda: compressed_cache.size)
+Counter("compressed_cache_hits_total", "Compressed body cache hits.", function=lambda: compressed_cache.hits)
+Counter("compressed_cache_misses_total", "Compressed body cache misses.", function=lambda: compressed_cache.misses)
+
+
+def negotiate(accept_encoding, available=ENCODINGS):
+    """
+    Pick the encoding to send from an Accept-Encoding header value.
+
+    Args:
+        accept_encoding (str): The header value, or None.
+        available (iterable): Encodings that can be sent, most preferred first.
+
+    Returns:
+        str: The encoding with the highest q-value (ties go to the more
+            preferred one), or None to send the body as it is.
+    """
+    weights = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body, encoding, level=None):
+    """
+    Args:
+        body (bytes): The data to compress.
+        encoding (str): "br" or "gzip".
+        level (int): Brotli quality or gzip level, instead of the per-request default.
+
+    Returns:
+        bytes: The compressed data.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    # mtime=0 so the same body always compresses to the same bytes
+    return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def variant_etag(etag, encoding):
+    """
+    The ETag of the `encoding` variant of a body, e.g. '"3f2a...-br"'.
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_variants(etag):
+    """
+    The ETags of a body and of all its compressed variants, so that a
+    condition on any of them can be checked against the body's ETag.
+    """
+    return {etag, *(variant_etag(etag, encoding) for encoding in ENCODINGS)}
+
+
+def encode_body(body, accept_encoding, etag=None):
+    """
+    Compress a JSON body for a client, if it is big enough and the client accepts an encoding.
+
+    Args:
+        body (bytes): The response body.
+        accept_encoding (str): The request's Accept-Encoding header.
+        etag (str): The body's ETag, if it has one. Compressed variants of
+            bodies with an ETag are cached, so each is only compressed once.
+
+    Returns:
+        tuple:
+            - bytes: The body to send.
+            - str: Its Content-Encoding, or None.
+            - str: Its ETag (None if `etag` was None).
+            - bool: Whether the response varies with Accept-Encoding.
+    """
+    if len(body) < MIN_SIZE:
+        return body, None, etag, False
+    encoding = negotiate(accept_encoding)
+    if encoding is None:
+        return body, None, etag, True
+    if etag is None:
+        return compress(body, encoding), encoding, None, True
+    cached = compressed_cache.get((etag, encoding), None)
+    if cached is None:
+        cached = compressed_cache.put((etag, encoding), None, compress(body, encoding))
+    return cached[0], encoding, variant_etag(etag, encoding), True
+
+
+def compress_response(response):
+    """
+    Flask `after_request` hook compressing JSON responses that weren't
+    compressed already. Streamed responses (like the NDJSON export) are left
+    alone, and so are responses with an ETag, which `generate_cached_response`
+    compresses itself.
+    """
+    if (
+        response.direct_passthrough or response.is_streamed or response.status_code != 200
+        or "Content-Encoding" in response.headers or "ETag" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+    body, encoding, _, vary = encode_body(response.get_data(), request.headers.get("Accept-Encoding"))
+    if vary:
+        response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+    return response
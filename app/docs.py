@@ -0,0 +1,121 @@
+"""
+Swagger API docs, set up lazily so they cost nothing at startup.
+
+Flasgger, and the YAML, JSON Schema and Markdown libraries it brings in, is
+only imported when the docs are first requested. It then runs in a separate
+Flask app holding the same API blueprint, so it documents the same routes
+without being registered on the app that serves them.
+
+The OpenAPI spec it builds from the route docstrings is saved in
+SPEC_CACHE_DIR, under a hash of the docstrings and the schemas. Later
+processes serve it straight from that file, without Flasgger, until a
+docstring changes. To build it ahead of time, e.g. when deploying, run:
+
+    python -m app.docs
+"""
+import hashlib
+import os
+from threading import RLock
+
+from flask import Flask
+
+from .codec import dumps
+from .schemas import swagger_definitions
+
+SWAGGER_CONFIG = {"title": "Product Management API", "uiversion": 3}
+SPEC_PATH = "/apispec_1.json"
+# Served by the Flasgger app
+DOCS_PREFIXES = ("/apidocs", "/flasgger_static")
+SPEC_CACHE_DIR = os.environ.get(
+    "SPEC_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "apispec")
+)
+
+
+def spec_key(app):
+    """
+    A hash of everything the spec is built from: the routes, their
+    docstrings, the schema definitions and the Swagger settings.
+    """
+    digest = hashlib.sha256(dumps([SWAGGER_CONFIG, swagger_definitions()]))
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: (rule.rule, rule.endpoint)):
+        view = app.view_functions[rule.endpoint]
+        digest.update(dumps([rule.rule, sorted(rule.methods), view.__doc__ or ""]))
+    return digest.hexdigest()[:16]
+
+
+def build_docs_app(blueprint, url_prefix):
+    """
+    Build the Flask app that serves the Swagger UI and spec for `blueprint`.
+    """
+    from flasgger import Swagger  # only needed for the docs, and slow to import
+
+    docs_app = Flask(__name__)
+    docs_app.config["SWAGGER"] = dict(SWAGGER_CONFIG)
+    Swagger(docs_app, template={"definitions": swagger_definitions()})
+    docs_app.register_blueprint(blueprint, url_prefix=url_prefix)
+    return docs_app
+
+
+class LazyDocs:
+    """
+    WSGI middleware in front of the app that serves the API docs: the spec
+    from the cache file (built on the first request if there is none yet),
+    the Swagger UI from a Flasgger app built on its first request.
+
+    Args:
+        wsgi_app (callable): The app's WSGI callable, for every other request.
+        app (Flask): The app, whose routes are documented.
+        blueprint (Blueprint): The API blueprint.
+        url_prefix (str): Where the blueprint is mounted.
+    """
+
+    def __init__(self, wsgi_app, app, blueprint, url_prefix):
+        self.wsgi_app = wsgi_app
+        self.app = app
+        self.blueprint = blueprint
+        self.url_prefix = url_prefix
+        self._docs_app = None
+        self._spec = None
+        self._lock = RLock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path == SPEC_PATH:
+            body = self.spec()
+            start_response("200 OK", [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+            return [b"" if environ.get("REQUEST_METHOD") == "HEAD" else body]
+        if path.startswith(DOCS_PREFIXES):
+            return self.docs_app()(environ, start_response)
+        return self.wsgi_app(environ, start_response)
+
+    def docs_app(self):
+        with self._lock:
+            if self._docs_app is None:
+                self._docs_app = build_docs_app(self.blueprint, self.url_prefix)
+            return self._docs_app
+
+    def spec(self):
+        """
+        Returns:
+            bytes: The OpenAPI spec as JSON.
+        """
+        with self._lock:
+            if self._spec is None:
+                path = os.path.join(SPEC_CACHE_DIR, f"{spec_key(self.app)}.json")
+                try:
+                    with open(path, "rb") as cached:
+                        self._spec = cached.read()
+                except FileNotFoundError:
+                    self._spec = self.docs_app().test_client().get(SPEC_PATH).get_data()
+                    os.makedirs(SPEC_CACHE_DIR, exist_ok=True)
+                    partial = f"{path}.{os.getpid()}.tmp"
+                    with open(partial, "wb") as output:
+                        output.write(self._spec)
+                    os.replace(partial, path)  # atomic, for processes starting side by side
+            return self._spec
+
+
+if __name__ == "__main__":
+    from . import initialize_app
+
+    print(f"{len(initialize_app().wsgi_app.spec())} bytes, in {SPEC_CACHE_DIR}")
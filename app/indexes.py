@@ -0,0 +1,353 @@
+"""
+Secondary indexes kept up to date by the product store.
+
+Every index has the same small interface: `add(record)`, `remove(record)` and
+`build(records)`. The store calls `add` and `remove` inside its write lock
+whenever a product is inserted, updated (remove old, add new) or deleted, and
+`build` once when the index is registered, so a large catalog is indexed with
+one sort instead of one insert per product.
+"""
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import repeat
+
+NAN = float("nan")
+# Larger integers don't survive the round trip through a double
+MAX_EXACT_INT = 2**53
+
+
+def numeric_key(value):
+    """
+    Sort key for number fields. Anything that isn't a number sorts after every
+    number instead of breaking comparisons.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value))
+
+
+def text_key(value):
+    """
+    Sort key for string fields such as ISO dates. Non-strings sort last.
+    """
+    if isinstance(value, str):
+        return (0, value)
+    return (1, str(value))
+
+
+class SortedList:
+    """
+    A sorted sequence stored as a list of short sorted chunks.
+
+    A single flat list would make every insert and removal shift up to n
+    items. With chunks only one short list is shifted, so writes stay cheap
+    even with millions of entries. Lookups bisect the chunk maxima first,
+    then the chunk.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, items=()):
+        self._chunks = []
+        self._maxes = []
+        self._len = 0
+        self.build(items)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __getitem__(self, position):
+        """
+        The item at `position` in sorted order (negative counts from the end).
+        Skips whole chunks by their length, so it reads one chunk and the
+        lengths of the chunks before it.
+        """
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("SortedList index out of range")
+        for chunk in self._chunks:
+            if position < len(chunk):
+                return chunk[position]
+            position -= len(chunk)
+
+    def build(self, items):
+        items = sorted(items)
+        size = self.CHUNK_SIZE
+        self._chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(items)
+
+    def add(self, value):
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([value])
+            self._maxes.append(value)
+            return
+
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            position -= 1
+            self._chunks[position].append(value)
+            self._maxes[position] = value
+        else:
+            insort(self._chunks[position], value)
+
+        chunk = self._chunks[position]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            # Split an oversized chunk in half to keep inserts cheap
+            half = len(chunk) // 2
+            self._chunks[position:position + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[position:position + 1] = [chunk[half - 1], chunk[-1]]
+
+    def remove(self, value):
+        """
+        Returns:
+            bool: True if the value was found and removed.
+        """
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            return False
+        chunk = self._chunks[position]
+        offset = bisect_left(chunk, value)
+        if chunk[offset] != value:
+            return False
+
+        del chunk[offset]
+        self._len -= 1
+        if chunk:
+            self._maxes[position] = chunk[-1]
+        else:
+            del self._chunks[position]
+            del self._maxes[position]
+        return True
+
+    def _locate(self, value, right):
+        # (chunk, offset) of the first item >= value (or > value when right=True)
+        search = bisect_right if right else bisect_left
+        position = search(self._maxes, value)
+        if position == len(self._maxes):
+            return position, 0
+        return position, search(self._chunks[position], value)
+
+    def iter_from(self, value=None, right=False):
+        """
+        Yield items in ascending order, starting at the first item >= value
+        (or > value when `right` is True). With no value, start at the beginning.
+        """
+        position, offset = (0, 0) if value is None else self._locate(value, right)
+        for index in range(position, len(self._chunks)):
+            chunk = self._chunks[index]
+            for item_index in range(offset, len(chunk)):
+                yield chunk[item_index]
+            offset = 0
+
+    def iter_before(self, value=None, right=False):
+        """
+        Yield items in descending order, starting just before the first item
+        >= value (or > value when `right` is True). With no value, start at the end.
+        """
+        if value is None:
+            position, offset = len(self._chunks), 0
+        else:
+            position, offset = self._locate(value, right)
+        if offset:
+            for item_index in range(offset - 1, -1, -1):
+                yield self._chunks[position][item_index]
+        for index in range(position - 1, -1, -1):
+            yield from reversed(self._chunks[index])
+
+
+def _column_value(value):
+    # The value as stored in a numeric column. NaN stands for "not a plain number".
+    if type(value) is float or (type(value) is int and -MAX_EXACT_INT <= value <= MAX_EXACT_INT):
+        return value
+    return NAN
+
+
+class SortedIndex:
+    """
+    Keeps (key, id) pairs for one field in sorted order.
+
+    Range scans cost O(log n) to find the start, then O(1) for each matching id.
+
+    With `column=True` (for number fields), the index also keeps every
+    product's value in a typed array indexed by id. A scan sorted by another
+    field can then check a range on this one by reading a machine double,
+    without looking the value up in the record or building its sort key.
+
+    Args:
+        field (str): The product field to index.
+        key (callable): Turns a field value into a comparable sort key.
+        column (bool): Also keep the values in a column of doubles.
+    """
+
+    def __init__(self, field, key=numeric_key, column=False):
+        self.field = field
+        self.key = key
+        self._entries = SortedList()
+        self._column = array("d") if column else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entry(self, record):
+        return (self.key(record.get(self.field)), record["id"])
+
+    def _set_column(self, item_id, value):
+        column = self._column
+        if item_id >= len(column):
+            # Grow geometrically, new ids arrive one at a time
+            column.extend(repeat(NAN, max(item_id + 1, 2 * len(column)) - len(column)))
+        column[item_id] = value
+
+    def build(self, records):
+        if self._column is None:
+            self._entries.build(self.entry(record) for record in records)
+            return
+        self._column = array("d")
+        entries = []
+        for record in records:
+            entries.append(self.entry(record))
+            self._set_column(record["id"], _column_value(record.get(self.field)))
+        self._entries.build(entries)
+
+    def add(self, record):
+        self._entries.add(self.entry(record))
+        if self._column is not None:
+            self._set_column(record["id"], _column_value(record.get(self.field)))
+
+    def remove(self, record):
+        self._entries.remove(self.entry(record))
+        if self._column is not None:
+            self._column[record["id"]] = NAN
+
+    def range_check(self, rows, low=None, high=None):
+        """
+        Build a test for whether a product's value lies between `low` and
+        `high` (both inclusive, either may be None), with the same ordering
+        as the index. With a column, the record is only looked up for values
+        that aren't plain numbers.
+
+        Args:
+            rows (dict): The store's records by id.
+
+        Returns:
+            callable: check(item_id) -> bool
+        """
+        key, field = self.key, self.field
+        first = None if low is None else key(low)
+        last = None if high is None else key(high)
+
+        def check_record(item_id):
+            value = key(rows[item_id].get(field))
+            return (first is None or value >= first) and (last is None or value <= last)
+
+        column = self._column
+        if column is None or (low is not None and _column_value(low) != low) or (
+            high is not None and _column_value(high) != high
+        ):
+            return check_record
+
+        low = float("-inf") if low is None else low
+        high = float("inf") if high is None else high
+
+        def check_column(item_id):
+            value = column[item_id]
+            if value != value:
+                return check_record(item_id)  # not a plain number, compare sort keys
+            return low <= value <= high
+
+        return check_column
+
+    def scan(self, low=None, high=None, after=None, descending=False):
+        """
+        Yield (key, id) entries whose value lies between `low` and `high` (both
+        inclusive), in sorted order.
+
+        Args:
+            low: Smallest value to include, or None for no lower bound.
+            high: Largest value to include, or None for no upper bound.
+            after (tuple): A (key, id) entry to resume after, as used by cursors.
+            descending (bool): Walk the index from the largest key down.
+        """
+        # (key,) sorts before every entry with that key, (key, inf) after all of them
+        first = None if low is None else (self.key(low),)
+        last = None if high is None else (self.key(high), float("inf"))
+
+        if not descending:
+            if after is not None and (first is None or after >= first):
+                entries = self._entries.iter_from(after, right=True)
+            else:
+                entries = self._entries.iter_from(first)
+            for entry in entries:
+                if last is not None and entry > last:
+                    return
+                yield entry
+        else:
+            if after is not None and (last is None or after <= last):
+                entries = self._entries.iter_before(after)
+            else:
+                entries = self._entries.iter_before(last)
+            for entry in entries:
+                if first is not None and entry < first:
+                    return
+                yield entry
+
+
+class HashIndex:
+    """
+    Maps each distinct value of a field to the ids that have it. The ids in a
+    bucket are kept sorted, so a bucket can also be paged through by id.
+
+    Args:
+        field (str): The product field to index.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._buckets = {}
+
+    def build(self, records):
+        grouped = {}
+        for record in records:
+            grouped.setdefault(record.get(self.field), []).append(record["id"])
+        self._buckets = {value: SortedList(ids) for value, ids in grouped.items()}
+
+    def add(self, record):
+        value = record.get(self.field)
+        if value not in self._buckets:
+            self._buckets[value] = SortedList()
+        self._buckets[value].add(record["id"])
+
+    def remove(self, record):
+        value = record.get(self.field)
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket.remove(record["id"])
+        if not bucket:
+            del self._buckets[value]
+
+    def values(self):
+        return list(self._buckets)
+
+    def scan(self, value, after=None, descending=False):
+        """
+        Yield the ids that have `value`, in id order.
+
+        Args:
+            value: The field value to look up.
+            after (int): An id to resume after, as used by cursors.
+            descending (bool): Walk the bucket from the largest id down.
+        """
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return iter(())
+        if not descending:
+            return bucket.iter_from(after, right=True)
+        return bucket.iter_before(after)
@@ -0,0 +1,291 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A small, dependency-free take on counters, gauges and histograms. Every
+metric registers itself with `REGISTRY`, and `REGISTRY.render()` produces the
+text served at /metrics. Updates take a per-metric lock and cost about a
+microsecond, so they're fine on hot paths.
+
+`instrument_app` adds request metrics to the Flask app, and `InstrumentedLock`
+wraps the store's reader/writer lock to report how long callers wait for it
+and how long they hold it.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import g, request
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOCK_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """
+    The set of metrics to expose.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Returns:
+            str: Every metric in the Prometheus text format.
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    """
+    A value that only goes up, optionally split by labels. With `function`,
+    the (unlabelled) value is read from it at render time instead, for
+    counts that are already kept somewhere else.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=(), function=None, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.function = function
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def samples(self):
+        if self.function is not None:
+            return [f"{self.name} {_format_value(self.function())}"]
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    """
+    A value that can go up and down.
+    """
+
+    kind = "gauge"
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram:
+    """
+    Counts observations in cumulative buckets, plus their sum and count.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def observe(self, value, *label_values):
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[position] += 1
+            series[-1] += value
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = []
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labels, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+http_requests = Counter(
+    "http_requests_total", "Requests handled, by route and status.", ["method", "route", "status"]
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time to handle a request, by route.", ["method", "route"]
+)
+http_response_size = Histogram(
+    "http_response_size_bytes", "Response body sizes, by route.", ["method", "route"], SIZE_BUCKETS
+)
+http_in_flight = Gauge("http_requests_in_flight", "Requests being handled right now.")
+lock_wait = Histogram(
+    "lock_wait_seconds", "Time spent waiting to acquire a lock.", ["lock", "mode"], LOCK_BUCKETS
+)
+lock_hold = Histogram(
+    "lock_hold_seconds", "Time a lock was held once acquired.", ["lock", "mode"], LOCK_BUCKETS
+)
+
+
+def record_request(method, route, status, duration, size):
+    """
+    Record one finished request. `size` may be None when it isn't known (e.g. streamed).
+    """
+    http_requests.inc(method, route, str(status))
+    http_request_duration.observe(duration, method, route)
+    if size is not None:
+        http_response_size.observe(size, method, route)
+
+
+class InstrumentedLock:
+    """
+    Wraps a ReadWriteLock (see app/store.py) and records, for reads and writes
+    separately, how long each caller waited for it and how long it held it.
+
+    Args:
+        lock (ReadWriteLock): The lock to wrap.
+        name (str): The value of the "lock" label.
+    """
+
+    def __init__(self, lock, name):
+        self._lock = lock
+        self.name = name
+        # Acquisition times per thread, innermost last
+        self._held = threading.local()
+
+    def _acquired(self, mode, requested):
+        now = time.perf_counter()
+        lock_wait.observe(now - requested, self.name, mode)
+        stack = getattr(self._held, "stack", None)
+        if stack is None:
+            stack = self._held.stack = []
+        stack.append(now)
+
+    def _released(self, mode):
+        lock_hold.observe(time.perf_counter() - self._held.stack.pop(), self.name, mode)
+
+    def acquire_read(self):
+        requested = time.perf_counter()
+        self._lock.acquire_read()
+        self._acquired("read", requested)
+
+    def release_read(self):
+        self._released("read")
+        self._lock.release_read()
+
+    def acquire_write(self):
+        requested = time.perf_counter()
+        self._lock.acquire_write()
+        self._acquired("write", requested)
+
+    def release_write(self):
+        self._released("write")
+        self._lock.release_write()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def instrument_app(app, profiler=None):
+    """
+    Record latency, status, size and in-flight metrics for every request the
+    Flask app handles, labelled by its URL rule (e.g. /api/products/<int:item_id>).
+
+    Args:
+        app (Flask): The application.
+        profiler (SamplingProfiler): Optional. Samples the stacks of requests
+            and reports the slow ones (see app/profiler.py).
+    """
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+        http_in_flight.inc()
+        if profiler is not None:
+            profiler.begin()
+
+    @app.after_request
+    def remember_response(response):
+        g.metrics_status = response.status_code
+        g.metrics_size = None if response.is_streamed else response.calculate_content_length()
+        return response
+
+    @app.teardown_request
+    def record(error=None):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        http_in_flight.dec()
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        status = g.pop("metrics_status", 500)
+        record_request(request.method, route, status, duration, g.pop("metrics_size", None))
+        if profiler is not None:
+            profiler.end(f"{request.method} {request.full_path.rstrip('?')}", route, duration)
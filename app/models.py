@@ -1,40 +1,28 @@
 '''
 NOTE
-Storing data in an in-memory structure for testing purposes
-This in-memory data structure can be replaced with a JSON file or
-database in the future, requiring minimal changes to the existing logic
-due to the modular design.
+These are the seed products. The store in app/services.py starts from them,
+and with a persistence backend (PRODUCT_STORE_BACKEND=wal or sqlite) they
+are only used the first time, when nothing has been saved yet.
+
+They live in seed_products.json rather than in a Python literal, so importing
+the app doesn't compile their inline images. With the default in-memory
+backend the file is still read when app/services.py is imported (a few
+products, well under a millisecond); with a backend that already holds a
+catalog it is never opened.
 '''
+import os
+
+from .codec import loads
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_products.json")
+
+
+def load_products():
+    """
+    Read the seed products.
 
-products = [
-    {
-        "id": 1,
-        "name": "Dishwasher Safe Cutting Board",
-        "price": 19.99,
-        "quantity": 10,
-        "description": "A high-quality cutting board made from durable, food-safe materials. Dishwasher safe for easy cleaning.",
-        "category": "Home & Kitchen",
-        "date_added": "2024-12-01",
-        "image_url": "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wCEAAkGBxMTEhUTEhMVFRUWGBcWGBcWGBUVGBgWFxcYFhYXGBgZHSggGB4lHRUYITEhJSkrLi4uFx8zODMtNygtLisBCgoKDg0OGhAQGC0dHR0tLS0tLS0tLS0tLS0tLS0tKy0tLS0tLS0tLS0tLS0rLSstLS03LS0tLS0tLTctLSs3Lf/AABEIAOEA4QMBIgACEQEDEQH/xAAcAAABBAMBAAAAAAAAAAAAAAAAAwQFBgECBwj/xABGEAABAwIDBAcFBQQIBgMAAAABAAIRAyEEEjEFQVFhBiJxgZGhsRMywdHwByMzUnIUQoLhQ1NikqKywvEWJCVjc+IVNNL/xAAZAQADAQEBAAAAAAAAAAAAAAAAAQIDBAX/xAAgEQEBAAIDAQADAQEAAAAAAAAAAQIRAyExEgRBURMy/9oADAMBAAIRAxEAPwDo7sHmfkmL5geRupXCUCaQB1+f8imz3AOY/tb8k8wFaQQZBki/1yXJh66M9o11YioRGpMcmtt6jyUxhCZuPoJnVaGvL985Y4ZQXHxsnWFfJzA9UifrzW09ZUtfPyj4phUP3v8AEE8fUgtbvcZPYmP9L/EFSUyEICFZBCEIAQhCAEIQgBCEIAQhCAEIQgBCEIBPEOhpPAE+S5htjaOd0D3RoOJ4q3dNdpZKYptPWfr+kfM+hVM2RQD3Go73Kfmdyz5KvGHmz8GWQSM1R3ut1iVcdkbDDOvV69Q3vcN7OJSXRrZ/9O8dd3u/2W8u30VgRjj+6Msv0EIQtEBCEICrYx59iCNxE9hsU+w7yWtBmRrygx4lR4rRSbzdB7IKlaX4YEa7+eq5sJvTbkurWtWrmf7O0i4/VBJHYRPgnWz6YDABpA+J+KisVUh9N0GZk6Rlbc/XMKT2W+W9uYjsLiR9clrPWTNdv3rDyTUfi/xJ9VPXb2/BMWH73+JP9hMoQhWQQhCAEIQgBCEIAQhCAEIQgBCEIAWCsqt9NOktLCUsrnZalQENsTA0LjGg5oCn9KNoe1rvcNJyt7Bb67VJ7MwYilR4w9/19aqvYTDmtWYJILiCSIMzvvIOuqumx6X3szMuIBiOq3T65LC91r5FsaIWywsraMghCEwEIQgKVXfFIc3jusbrfB7Zl7S0zTMNPcS2e2RPeo7bVSMNb8wHiCofo9Vlhbva638Q+bfNT+PhLhtH5fJZyai/VcOC4jmHjyLh3geSzsGrJeT/ALC8DyW2Cq5mNedwPzPosbDBFSq3c0iOwyQedoTznY47uHL3ffAcp+vBNqP438SXcfv+5IYf8b+IqJ60qbQhC0IIQhACEIQAhCEAIQhACEIQAhCEBglefen+2f2vGvcy7WkU2DiGmLdpk967nt/EZMPUMwS0tH6nCB6z3LgeztkVWVRUqAQ1wIvOYg9XTdIm/BK3UORf+jeHyNn+opCmD/a93/M4+Cs+xGfeMHAfz+Khtl0MtBjd9R8nsZ/7O8lPbDvVJ5FZT1dWBZWAsrZmEIQgBCEICj47A+1wtRrfeAzAc23jwlU3ZFWHHnC6HsWoCFQ9tYT2GJqM3Zszf0uuPrkp/Fy60j8/DuZLzsPFTYaEac9fX1UzgaUPLhoWt8RmHpCqHRyvcdquOAN4G6VrnGPDSJ/+x3JDB/jfxO9Clgf+YP1uSOB/GHa74rCeuqpxCELQghCEAIQhACEIQAhCEAIQhACELBQFK6d7QlzaLTpc/qOngL96ptJueo1vf8vgpnpJgK7HufVaYJJzi7bm993C6Q6KYfNWznQGT2NuVlnvbTFY3th+XdTYG98SfN3kpXo8Os48lD03EguOr3E/E+oU50cFnHsSx9GSZCysBZWsZhCEJgIQhAUHYmKghJdPsJPsqw/8bv8AM34qN2bWhWqpTFfDPp74lv6m3HmFx/jZ6ydf5fF9YVA9G2mR9aK3bDq5iTz+AVW2UcrCe7xU70Sq5mzx63iXfJehyePJ4P8ArSQb+OUjgPxe93xSjPx3JrQBzmNZcueOyrGhVosxA/eK2FXFDfPcj/SH8rGhV+licUXQI7xop2kCAMxk7zorl2Vmm6EITIIQhACEIQAhCEAIQhAI4ulmYW8bJjhth0WizACQQcstmdxgqTIWUtBDVthA+47KOET5ynmzMEaTSCZkp6hHzD2wFlCEyCEIQAhCEByXD2KsuyMTBCrFBS2DfC8zG6r1cpuFNvRS9pGhGYfxfR8FL9Ch1Y4Bn+WfiVDdLGF9Gm4fmyHsOnn6qZ2DiqVKRnmY1i1o4r0rybwjxseK48uSSpfju70jgGTUj9SVw7gaheCC0rTAvDakuIGuqzmm1lSpw/NYNA8Uy2j0goUmyXSdwbee/QKm4/pjVqEhpyN3Buve5K44KxmVXypjKVM5XPa0niRP8kji9tUWtcRVplwaSBmFzFguVY3F5pJN+M3UeH1nUatfK406RyueIierAiZnrN3b0TO+SNP8p7avtfpHimgE5YOhhpB4wQYWR0srjXJ/dPwK57gOmhY3LJHIjWOREFWM1jUDXZQ2wmAG8dwsNymZVV456so6X1PyMP8AeHxS7elron2bT2OPyVU9nYLanz+gVUyrO4RaW9MrwaP+L/1TlvS1m+m7uIKp8a8ksDaU/ql8xbW9KqW9lQdzfml2dJKJ/OO0D5qlRcLcVOPf8FX0n5i7t29RP7xH8Lk4p7UpHR48D8lRQ+VKbGbNVg5z3C59ETIXGLdUrNb7xAnitRimfnb4hQ2260vy/lHr9BRjjeUfRTFcBUB0IPetlVGG2isuDqZmNPIT2705dlZoshCFRBCEIAQhCA5BhnqSwzlDYVyk6D15j1qmqwzUKg1IGYdrbj0VQZiVbNm1xMG4Nu5U/amFNGs+nuBlvNpu0+HoujC7mnNljq7OP2gc+4pRuPcLZn+JCjBVIWTWVaLZ1i3OOhlRWJxGT3gROh3eKVdi4lM6+LzgtOnqg4idpbWJsEvsLG1S12HDjkqEPc3iW6T5HuUfXw8OgXUx0XoxVuLRrzVXxHe+z/C7EaCHvAJGg1E81ZGJlXpC0FO2KIdKl2qTc5KObaU2w+08KyoaeIc4TYEaA8zB9IVIOp+R+C3pO1CzjMgJ9nmyxYuiZ10gR3hJ4XEtNOQQTnM8YFh8T3pfeP8AT+Mv43xeIbTYXvMNbv8ANbUKjHNa9jswNjG4/RUb0zw4bQBzAuJlrYMnjbeBxUZ0b6UZ3lmILmUyIDjLhIIIaABY8ErlZZrxFWsKw9F6cvc7g2PE29Cq7Ve0zkJDYtmEOvy3EKc6LUalHCVH1ape5xc4EgAARlDQBzlawr4MVWzPc7cSfDd6JL4JJrwVu0oBwxym9hVSaZB/dcR3aj1UCwKU2FU6zhxAPgY+KePqcvE4hCFogIQhACEIQHEcK9SFKoomg5Ow61l5tj1ZUxhK91bNl06VWPaMY4gQC5odbhdUDB14Vl2NjYIuqwuqz5cdxbRsnD/1NL+435JKv0cwrxeiwfpGX0TzDVg4SnLCu2argu4pO2vs/puaTh3Fr9wddp5TEjzXOdsdH8RRP3lJzecEjuIsV35N8ZXDGye4cUXCHOSx5zfRdAtv+CmNk2eAPyT4kK7dMMVhqbC+rTa5591o6pJHEtgwFR9h1s5c+ANwAm1xx7VllNRtjntMPPp8E8pn67kxqNkEaiN9+CXaIMDRSo5qutZROPwwfPG8HeDGoOqeVqwDesY+iFDYnHOJhgN/E8gmmxJ9H6Lq9Jxq4gtcC5jjkvIMg5gbjTcmmD2U+hP3j5cTdjjvOjSD2WUE3CV3VmhtTLm0BcG34CTqeamtj4chxLq/s3tlwBcJltvdNjYm3qomOr0dzyt7ZxADXubd2vvmTPOd6ZUsZkIOVsNOg6uu9TJ2rQzF76RquIbLnWm2sRANomOF9UwxG1cJnJ/Zn5C22YkOmNzhaOwK8SqQrbdZ1SGExcg2IsdI11V46TY9uGwtOmSJIFtJyxm8yFSdh0aT69Bv7O8Co8FrnOkZR1huEgQbkXUx07rUa9Z1F2fPTYILYLZcQYc2J0IvZXL0iztE7O6U08wFSo3XeYPYrXSqtddpBHIz3KgbJ2E+m9tV9IOpgTmDqZyj87bmSNRY8hZWzA7RwrR7KmMgEkuk5SbalxmbblhhrDLX1va/88rNyeJ2mQsvxLqYc9nvNG+4jeq/sfb7a1WqxplrL5oMCDFzzjyKnaXWBGuYEeIstsMvqbLPD5uq0o9Lqg95jD4j4qRw3S6kffa5vMdYfNcto7dMkOpOkWOWHJ5R2vSNs2U8HS0+ar6sZ/MdhwmNp1BLHh3ZqO0JwuV4TFOYQ5jiCNCCumYDEe0psf8AmAPfv81eOW0WaOEIQqJwug0p5h26gqKp1IOgUhh6y8+x6WNKNplro1BTzCvLDxCTcdCnGXwKla3bB2iNCbFWaiVzjBvLTIV12Vj2lhLjoL9i6eHP9Vx82H7SWIrBjSSqztbaWUGo89g9AEtjsZnMmzRp9cVz3pJtfO8gHqiQB6nvW1rCRWek+03VqjnOPIcgNAOSd9GmH2U8b+cqA2k/VT+xzFICToOxRn404/U0XAj65/yWlbGgWFzHcOMqMrYqTlBsCZPgISVF8Nk7vmB8FnfGs9OpzuALo0uZ32AEJLGllN4h9QOaDcMLHB1uJBG9SFPZ+ZgrU61I8cw6oPA5hBiYURi6pe8ucZJkk8TKIKfsw7axkVJLokw0gu4kCMtzE33pnU2b7N/3kE5i0NaXzM+8JbBbY3CbYbDNFVpEiILiGzDZg6G404J3tK9ckE5cxLZzCGm4968X/mdSaotnWkrSo0iwEOBIg5SOuDEWA94H6hNKdJhIADGibEh/WB16pzeSTZhHSHOljSAAbkTGa5Em/YtsFtCvTIyjquF5gmwv1jdtoMb5TxLJM7L2tQw9RkNNQiYa09VpcIloFpMkW48kdIaba5e9rZqEFxbMPhwGUxbMBA4jvUBhDTe4va8seT7ump3dhAWP/lXiCBoIO/jv1m58VSdI7BbWq0zl7pM2iwkK2UujrjTNZjml1QONQMcajesQRltNM8t0C4BhR+L+9b7XI1w6oeR78klokb5teZWNmYt9AVm0sj6bm3DnEEE2t7rpjh/NTjjjLvSss8rNbaUqD8O+ILHeE85Go56KWwnSaqwtkNfxkQZnl3+Ck8PtKhiaAp1aRBmKdSmZdmGsMJJ3yRN/CazVolpgjWe5wMeo0KL13CnfrbF4cNq13RALswHDP1481piMQMgBg20IBTvbTvus2hdlB7p+are0KhHgmmlcFtP2ZtMbxPV8N3cuh9Gukj6dNvtMwDicuYTTPJrhbnYzyXHva2K7n9l7W1dmtD2hwLnAhwBB03FaSItSn/E7eDf7x/8AyhOP+FsJ/UM/xfNCrWX9TuOQvwjmtbmGqKRgq443ZQe0gHmO3d9c1TqlODfUarDlx7dHDl1r+JFj5CeYd8iFDYerBun+FqXXPY6ZUpQcpXZdUZg1/ukiexQkwZT6i/fvRLospuL0MBTc0jKC0iOZB5rnPSb7P6wJdhj7VszkMB4HImzvI9quzekeGpU2GtWYw5RYnhafJMq/T7Aj3cQ0keB5Lulljz7LK4VtrBVKbi2qx9NxMQ9padeamGVcrTA0sO3d8F0rbPTnB1sPVYDmeabw0ENcMxaQDc8TwXMnvinz6o8wpyXhtnBUi+WtLQQ1zus4NkAXidTyTZrzEF0tBJDSdCYkgbvC8LStTh14E3vaOOqcUnFpkOGkEgtPVIh0wNLqFlGAQb2nTn2IqGDfgkm741m4vpZYe5xIEbvjCWlbP8NWaJs4VAQWu6rmGPzNI4aHjyKQoVpPWu25gHLEyTlG6L25rRj5BIsYPoii02PJKnIe0arAHTT0IObMZi8iDr/vxWuKxxrvYymxzmNvlcczo/eAI3GAb3B5Ju8ajsncmjGcrj0RjRlEnTxRaC1zBaxa5olpm8bwYkX4LNfGOyNimyWE9Ytklpkw7cRYCeaSrYvM0S0SB7wEE/qjU89bLSpiyaZaSTwGgjhAHJMrEjgMaxlVlZ7i0uLQ4U2dUjfI0vA0GsKwbTr4GvTcaXs218wLTDWucc2hBeGgknXtVOwlRzQ2pTqQ4E9SD1eBE2O7wCVDHO+8LZaTJcGwJJ4iwRstHeztq1KbnZAwF1s0BrmOu0PDgOr73fAUrtTC1G1D7Uy5/XDmmWudAJyui/8AIqsupda7gASBLsxBEgbhfWT2KyYXbFR1N9PI19NkD2gAEXs4aG54i173hH6PXZltyfYs5OA9T9dyq+0quque16BNG2hAeDybc/5AJ5qhY11z2qsUZGjzZd3+x8/9Ob/5H/BcGqbl3b7HXf8ATwP+470atIxq8zyQsoVkpbHKtdJ8Dld7QCzteTv5qxgor0GvaWuuCFnlNxWGXzXPAnFKpCxtPCupPLHdoPEbiE3Y9cuUd2N2nsPVkJ3RdChcLVT9tcKFE+k+HY6iXOaCWgiSBIBBIv2/BUnZLWkukA9U81bdo1vaMew/vNIHbq3zAVN2Xq7dYrfjvTn5ZqlqkbhqR6p3iGFzZ7uw7vRReJrhrmkm0hSmH2nR0ziCIV1GJUYlz6X3rQXMy9e4OXQiZvYi+4BM8QQQDInSMobYAwAZ56BOBiqThGcCDuICxUYxo6rhBcRqDumD5+ClbRuHBE7yZThtNxMNEwJsDYAXJ5c1htRoaJJ5RHfPctqdUZiZPDq6xoYvwlI9Ea1QuBJAkNiWgNBAMXj1SlJwg2iwhYIGU6xYec6dy0awEkDSQlTjekySXfUpAi/CLdid0W2NuKRc4G7jfnfmlKqwnMaz3aFYaI1I9Al89MjdPOySqOygjIL+6SdNServBCqVNhOmWwRJJJtFxF5+CeU2VGNABe1rxxMObJ14iR5JlTeM0j67tyl8Ps2o5uYFrZuAQSTwm9kFCOcEODs2oLQD1Qf3rTAkb/7IWtKiMwvE74PbeLrWlUcS0Fpm8xGu9PiyYEEG3alTiZ2TRL8rXGwpubFzqC2/bmnwUK37Nse/VjGDi+oyO/KXQpno57x4FoPfN/h4LpmyseyowAOBe0AOaCMwMbxuWvHGXK5rsv7ISSHYnECPy0QSf77h/pXQ+jWx6WGpup0Q4MzSA4kwYDTc3Puz38FJ+0DrAkHsv4FN9kgZDlAAk6BwFydzrj4ablrphs+Qtcv1dCYUd9Zo3z2JvWxpALgLAePALbIm2PAs3dqe/wDlZZWqkQ+23CpTdUqGHC4P+ns3dyrLavNLbbx3tHQJyg2581D068GNynLHbbDPXSeo1U7bUUNQrKRpPlYZR1Y1tjSTBG4qIr4bJVeRo9uYd56w8fgpxwskMRQz0yI6zZLeehLe+PIJ4ZaqOXHcU/alIvgNiQZUWcHU/L4EfNS9Z11qHro25dSon9mfPuu8Ct/ZvA0d4FS4qKQwldGz+VT/AGl0xPdNwtm4140JHeV0HA4/MBRqkup3y5iYYTcwL2JAntPEzU3YY18cKbA0ZnsEGGtAtM8OHaUTsdo4bTq/mMJaltqo3elsTtWn7ao5uHpezcerTMw3LoQQQeMjQytnbaolsHA4aYjMDXEHjAqgJ6g7as6QVACJ8llvSF29oKjsEzM+7Za0F7hOXqMGZwBvEgQDe5CRa9uUggl1oIIA5yCPil8w/rJMt24Py+f8ks7bzSIcDu4JritihlChWzz7YgBsacTO+Eseizv6xveHD/ZK44j7yOMDtekHj2k5Zk8Tw81ZWdJsKf6SO1pVNd0aq7nMM83fJIv6P1xuaexw+KNQvqra/a1FtZzmVAWug8pi9u31SuJ2ix0Frh4+SpLNi4iYFJzjBs3rGAJNhfQE9ybezcBo49xSuG/KqcjrHR7aDS7VvC1t8+ihel9YsxIrU3uY4tHWaSDLTxHKFQW4h4/MPEJ+7EuNNocSYk35x8gnjjqllluOsdEPtHq2p4ge1EWeLP3aga9q6H0ex7azHFjcoDiNQZJ60yOMz3rzHgsUWuzNMEaLu32RY41sPVe7X2g/yN+Mq+2V0viEIVpUUKP21galWkRS9+IvaRvE7lNsoAc0sGrJpHGsbRfTJY9rmuG4iFFOffxXdMZgadVuWqxrxwcAY7DuVX2j9nWHfek+pSPC1Rvg6/mmWnMNm4/rZD3c1YMNWS2K+yzFNM0q1J8cc1M+jglKfRjHMHXoExvYWvnmADPks88W/Hn+qd0XAhbht00bTqUzD6b2/qa5vqE9aZWFmnTvandIsPkq2914zD4juM+SjWuVy6T4L2lAvAuzrd3748IPcqSw8V04Xccec1SwcneGemEpzQeq0W0phcSWPa8QS0yARI7CEpg8OyptKrVLCKdNntwxokloa3I2N9yO8Jky+nzUn0k2fiMLei69Sm2i8tnNlBc4wdwMtnelOhFHcDrED5yRfuPgtCneJqVMoY5uUDIIiJLA4A/4ymZVLOsJjPZsqtABNVuSbgtAc1xI7YLSOCZlPdoFuWiGgAikMxG9znOdfnBATJBLNtfDx+w1GkFj6VNog2DmEZ2xxkye1TwcmezRTOEoUHNiqGvxLXWMtdVaAOIPVd4c0sXbj3qMklytZSeda5lJlMPXY2qPaOIYWva4jWCwi0cTA71XCnu0nXTBxsriSTzZa40oGoSeOKoqbMfZd3+wwf8AJ1D/AN3/AEt+a4LuXoH7HG+z2a0xd9SofCG/6U6h0JCZe3d9BCexpBhZWVlQuALIQAtoQYCyxhWQEo1LRUrm3SSOd03q7PpO96mw9rRPilkI0UukZW6N4ZwIyEBwIMOMEG2hsqnifsmoH8PEVW/qDHjyDVf3E6gSsftB3ADuuiSQW2uV4j7KK4/DxFJ/6mup+mZRdf7PsfT/AKNr/wBD2nyMLtL8QS2Dfnv71imD+Y+JTKVxOlsXGUSZw1UFwyzkLoki4LexLbabGXMMpLGkTMnXjddszcz6rD2hwhwB7QD6paVtwlj7OFiMw8syTOCpPPWY251gLtlbYWFf72HpH+Fo9EwrdC8E7SkW/pe8fFLVP6ccq7Fw5PuW5Fw+KQd0eomwzg/q49oK65W+z7Dn3alVv91w9ExrfZ0ZlmIFvzM+Tkuz+lBwOym0qr3U85DaeXrQY90EaWvPeis/M5zuJJ8TKuf/AAPjKbXhj6Lg+AbuaTBkajioit0Kxrf6LN+l7T6kIpbQBWFJV+j2Lb72Hq9zSfSUxrYWo33qb29rXD1CBtE403TSpol8W66bVXDirgJs1SOKN06w2He8wxjnH+y0u9FNbP6BbQxBGXDuY0/vVfux538k9lVTK9SdB9mHD4HDUnCHNptLhwc7rOHiSqj0M+y6lhXNr4lwrVW3a0CKbDuMG7iOJ8FfTVKNoP0KO9seKEfQRKyFlCTRkLZCEBs1bhCEJrcIQhBHOD93vKa70IQCSWahCA3C2QhAYWwQhAbhCEIACChCAytauhQhKnFc2lvUZg9VlChS4bK0UgVlCvFLR+iaFYQmUCEIQH//2Q=="
-    },
-    {
-        "id": 2,
-        "name": "Wireless Bluetooth Headphones",
-        "price": 29.99,
-        "quantity": 5,
-        "description": "Premium wireless headphones with noise-cancellation and 20 hours of battery life.",
-        "category": "Electronics",
-        "date_added": "2024-12-02",
-        "image_url": "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wCEAAkGBxITEhUSEhIWFRUWGBcaFxUYFRgVFxoXFxUZGBgYFRcYHSgiGB0lGxUVITEiJSkrLi4uFyAzODMsNygtLisBCgoKDQ0NDw0NDisZFRkrKys3KysrKysrKystLSsrKysrKysrKysrKystKysrKysrKysrKysrKysrKysrKysrK//AABEIAOEA4QMBIgACEQEDEQH/xAAcAAEAAQUBAQAAAAAAAAAAAAAABwMEBQYIAQL/xABHEAABAwIBCQMIBwQJBQAAAAABAAIDBBEhBQYHEjFBUWFxEyKBFDJCgpGhsfAjUmJyksHRJKKy4SUzQ0RTk8LS8RVjc4Oj/8QAFQEBAQAAAAAAAAAAAAAAAAAAAAH/xAAVEQEBAAAAAAAAAAAAAAAAAAAAAf/aAAwDAQACEQMRAD8AnFERAREQEREBERAREQEReOcALk2HEoPUWLqM5KJhs+rgaeBlZf2XurR2edAP7yw9A53wCDPotfbnpQH+8t8WvHxarmHOihcbNrILnd2rAfYTdBl0XxHI1wu0gjiDce0L7QEREBERAREQEREBERAREQEREBERAREQERYfOTOOCjZrSm7nX1I24veRtsNwFxdxwFxxFwy7nAC5wA3rTstaRaWK7YQah43tIbEDzlOB9UOUd5yZ01FYT2rtSLdC09wc3nbIeuGFwAtekrQPN9pwHhbE+7qg3LKWfddKe7IIW/ViaL25vfc+LdVazW1euQZpDId3avMjvDXJPsWIlqydrif3R7vgSVb+VW2YDgMEGZ8raOP4XAe2wC8NaPquPiz83LCGpXyakoM6K77Lvaw/6l9Csb9r8JPwusAKhfQqUGwU1S1rrxv1H8WOMb/a0hy2PJ2eldDYCbtGj0Zh2n7+D79XFaAKq+3H3qtFVW2Ej3j8Jw9iCasjaSYH2bUsMB+uD2kXi4AOb4tsOK3WCZr2h7HBzXC7XNIc0g7wRgQubI63iPEf7dvsuszkHL89K7Xp5LNJu5h70T+N23wP2m2OG/Ygn5Fruamd0NaNUfRzAXdCTc23uYcNdt9+0XFwLhbEgIiICIiAiIgIiICIiAiIgIisMuZWjpYHzynusGwbXOODWt5kkAdUGOzxzojoYgcHzPuIo77SNrncGNuLnmBtKhLKeUXyyOmmeZJH7TyGxrRsa0X2bBfiTf3LeV5J5X1E2Mj8A0HBrRfVjb9luPUknaVr9RUHHHHj+nAIK9RVX2+zcP16/BWck5Kouct0zW0a1lWA947CI+nIDrEcWR4E9TYcCUGmayu6DJc85tDDJL9xjn266owU95C0bZPpwCYu3f8AWls8eDPNHsJ5rbo4w0BrQABsAFgOgCDnik0a5Tf/AHfUHF8jG+7Wv7lk49EGUDtfTt6yP/KMqdkQQU/Q/lAbH056SP8AzjCx1XoxymzZAHjiyRh9ziD7l0MiDljKORKmD+ugljHF7HNb4OIsfAqxDl1oRfArWMuZgZPqbl0AjefTi+jdc7yB3XHqCg51ZMVdwVWN72PtB6jf8VuGdGiqqp7vpz5RGMbNFpQObPT9XE8AtAJINjgR8Qg2KkqzrNexxZIw6zXNPeaeLT426GxGNlM2YmeArG9lLZtSwXcBgJG7O0YPEXG4ngQuf4J+azWT657XNljdqSxnWa4bjx5g4gjeCQg6URYXNHOBlbTtlADXjuysvfUkAxHMG4IPAjfcLNICIiAiIgIiICIiAiIgKGNJ+cIqKkwNd9DTEg8HTWIefUBLOuvyUlZ65b8ko5Jm27S2pEDvkfg3DeBi4jg0rnmrksLXJ3kk3JO4knab4/8AKC3q57n5wHD9f5K3pad8r2xxtL3vNmtAuSTuCpPdcqe9FuZIo4hUTN/aZBsP9kw+iODj6Xs3YhTzD0bRUobNUgS1GBDTjHGfsj0nfaOzdxMgoiAiIgIiICIiAiIgLTs98wIK4F7QIqi2EgGDuAlA87720cxgdxRByllbJk1LK6GZhY9pxB9xad4PFKaf27vn59y6D0gZoMr4DYATsBMT9nqOP1T7jjxB50lidG9zHgtc0lrmnAgg2IPMEWQb3mNnF5HUtkJtDLZkwOwC/dkP3HE3+yXclPS5ao5BsOx2Hjb8x8BxU66L8tmooxG83kpz2TiTcloF43cTdtgSdpY5BuCIiAiIgIiICIiAiISgiLTBlXXqYqYHuwt7R/DtJLht+bWAnpKosq5L+OPz4WHgs3l7KXlE09Rt7aRxH/jvZg/y2tHgtdndcoN50QZtipq+2kF4qezrHY6Qn6MeFi71RxU/LUdFeSRT5Oiw7030rvXtqfuBnvW3ICIiAiIgIiICIiAiIgIiIChjTbm2GSMrYxhIdSW3+IB3XeLQQfujipnWHzvySKqjngtcuYdT77e8z94BBzNSSbvm+73rf9F+V+xrmAmzKlvZu5PF3RE87hzP/Yo6jNisrTzObZzMHsc2RnJzSHNP4m3QdRIrbJta2aGOZnmyMa9vR7Q4e4q5QEREBERAREQFgc/Modhk+pkBsezLWng+S0bCPWeFnlgM+42OoZmvaHNOoCCLj+sbj1G2+6yDnaR9+6wF2qMdUXAO652NwB2qrm3kGSsqWQgiPWNi442Frk2G3AcQsvl2uga1scWrZt+7GBqg4YXHdBw4rJaH5Q7KDQWnzZHA3GBDbYjhYnftsqJ2giDGtY0WDQAByAsFURFAREQEREBERAREQEREBERAREQc3aQ83HUlZIGkOY9xey2BDXuJDSDhhsvyWHhkLba7XNBwuR3SdoAdsv5ykTTk8Nnhs03Mdyb4YPNrDecT7lqWb+UYsWyWaHNsdcd3aNpxb7VRL+iSv7XJzG3uYXyRHoHa7B4RvYtzWo6M4Y2Ur2xMa1vauPdAAN2MN8NvDoANy25QEREBERAREQFpel539HPG50kQI4jX1vi0LdFpel1v9HPPCSL+O35oIGqti3LQqW/9RxvcxSBothe7DrE3+qHC1vS5LTKlw2b+G1bToflAynEDcawkA2beycceVmnZvsqjoVERRRERAREQEREBERAREQEREBERBDWnkt7WmtfWEcl8MCC5urjfAgh+7HW5KNaRb/p0qGmriaDcthGsLiw1nvIHW1jY7iFH9K4b8Ov5cVUTRoRP7PUNGAEoNuZjbf8AhCkhRvoRb+z1B/7oHsjb+qkhRRERAREQEREBahpZbfJc/Iw8R/bxjd1W3rVNKcgbkupJ4MA6mVgHvIQc8yuAFhh8/wA1nNGc9sqUoG97h/8AN9/ddaxM/iqUMrxrFpLdYFptgS0kXF9wIFjxFwcCQqjo/Lmkmhp3Fgc6Z4wIisWg83kgHwurjIWfdNUC5DoubrW8SDh4rm1l+KzGSMpujNjsKiuowb4heqLNGud+q9tFM67Xm0DifNd/hk8D6PA4bwBKaAiIgIiICIiAiIgIi0HSTnb2I8khdaRwvI4bWMOxo4Od7h1BAZ7Led1PTtLrmTVNiGWtcbRcm3sWJyTpPoZXary+Ene8DU/E0m3U2ChfLWVi8CJp7rcFgnF3FBvmmidhyh3cbxRG4tYtOtYgjb/wtMgeCLHZw+eqsZZXlrQXFwaTqgm9gbEhvAXubbLkneV9wv4KonnQey1FMbbah28nAQxcfFSIo/0IyA5PcBtE8gd11WH4EKQFFEREBERAREQFHOnOt1KGOIf2szb/AHWNc/8AiDFIyhPTtXB9TBAMeyjc49ZXAAHmBED6yCKXC7uQsP1Vy2NUacd483e5Xrhiqj4har0U9wrdjd6ydMoqwEjhhchwxaQbG44Hip+0a52CvpRrkdvFZso4/Vk9ax8QeSgjKEFu8FcZp5wPoKtlQ25YcJGD0mEjXb12OHMDddB06ipUtQyRjZI3BzHtDmuGwtcLgjwKqoCIiAiIgIi8JQYTPLOJlDSvndYu82Nh9KQ7B0FiTyBXOlVlCSQuke4uklJcXHab7/nks5pIzn8vrCGO/Z4btZwcL95/rkC3IDmsFQQl7tYoPGU1hirSZtlnKkACyxEgufn5+SgtTGrd7S1w649CFfBuKtK4bbclUTFoDrsKuA7jHIPWDmO/gZ7VLi5+0OV4iykwG4E0ckdt18JG3/yyPWXQKiiIiAiIgIiIC5/0j0rhlKpL8buYQeLTEy1ulrequgFFmmbJdnQ1QGBBif1F3s+MmPIIIXrI9SQHd8/zVy111XyhDrNvvCs6N18FUXrQrimdY2+bKjq2Xt9/D4b/AJ/VBknt1mrCTRWJadh2ddyy1PKrfKUNxcKKknQnnOSHZPlOLbuhvvG18fh5w5F3BSyuUqOtfFIyoiOrJE4EHmDhfiNxG8dV0zmzlplZTR1Eex4xbva8YOaehB64HegyiIiAiIgKPNMWdPk1P5LGfpqgEG21sWxx9bFo5a3Bb3lCtZDE+aQ6rI2lzjyAvhxPJcy5eyy+rqZauT0j3G7dUDBrR0Fupx3oMeyK1mDacXdeHh+qz9JCGNWNyVBc6xWQqZbBBa1klzbeVaOavu98fn5/TmmrdWItHlWsbC+S275/mq9WbYK4yXDYax3oMzm5RudV0wjwd28ViN1pGknwAJ8F0ooa0R5L7WrdOR3YG4H7cgLW9e72nuUyqKIiICIiAiIgLF5z5IFXSywHAvb3Sdzxiw+DgPC6yiIOYZoXNJa4Wc0kOadoINnA+NwsJOzUfy2hSxpYyD2U4qWDuT4O4CUD/U0X6tco1yrFdl942fp88Sqi8pwHs6/FWxwPML3IBdjcYK5ynD6Y6H8j+XsQW0T7H4fPzuV2X3CxhcqscyireYarr7t/Rb9oezk8mqTSSO+iqCNQnYJdjfxCzeoatFqcQrWJ52XIc3FpBsfA7iNqDrhFreYGcfl1GyUn6VvclH22gd63BwId423LZEBEWMzlyyyjppKh+OoO636zzg1viSOgudyCM9NmcusW5PiP1XzW47WMPTB59VRWBrODR5rffxK9yjXPke+WQ60krnEnqcSOHAcl7SCyDLxENarSeW5sqUs6pByCtdXhj1W3PUqnk2K51jsHxXuXNbVwGG9VGHDTI+3E+5ZkgAcgrLJEeBdvOHQfP5redHeQfKqtpcLxQ2e/gTf6Nni4X6NI3oJP0fZE8lo2NcLSSfSScQ5wFmn7rQ1vUHitkRFFEREBERAREQEREFhl3JMdVA+CTY8YHe1wxa4cwbFc55WoJIpHQzN1XMcWuF74jZjYd0jEdRxXTajvSvmz2rPK4x3mC0oG0sGx/Vp933UEVsqAGiwtZfD6gEEHYVbdmSSN42/kehVBzSFUUJRY2VPWVaVpPVUS1B9a6ozsPnDaFWbGV9Biitz0T5xCnqm3Nop7RyDc19/o3/iJHIPPBT+uQ45DG/kcCF0/mPljyuihmJu4t1Xni9hLXHxtfxQZ1Qxpmy8JJRTA/RQYvt6UrhgPVabes7gpbyxXiCCWZ2yNjnW42FwPE2HiuV8s17qiYkm93Fzjxc43c49SUFCEFxLz4dOCq66qFuFgqfZlB5rXX2zE2XwGqvGwjaMVUZOGUNAA3K4ZUixvisQ0Eq6MRaBxOAHEoPaeIl2rG3WLiAGjbrONmhvMkroXM7IDaOmbFYdoe9K4Y3eRjY8BgByHMrRdE+bF3eWSDusJEV/Sfsc/o3zRzv8AVUrKKIiICIiAiIgIiICIiAvHNBFiLg7QV6iCFM+c0zSTCSIXicTqct5icfe0n/ctYrIWuAe39OoI3EcF0VX0Uc0bopGhzHDEfAjgRxWjR6LoTKXvmeWX81oDS7h2hxFxgLtAJ5WCCG5aVp2gG2y6+RR8BhwU+1+j6gkZqtiMZGx7Hu1vHWJDvFaFlvR1VwXfDadg+qLPtzZv9UlVGjtoyBe3Ucl66lwWYaQMCC0jAtOBB4EK3jjLnhkbXPLtjWguN+QGJHw6bCtfqaO6nvRHQOiybHrXHaOe8A/VJs09CG38Vrma+jV73CWtGowY9iDdzvvkYNbyGPRSoxoAAAAAwAGAAGwAKDCZ80TpqCojZcuMZIA2nVIdYddW3iubYaKxXV6jfPDR1rvdPR2BOLoSdUE7zGTgL/VNhzGxBFMVEhpLi+7dz5rJ1tO+J/ZTRujI2hwLSRyvtB4jw5VHObb59gQa+6jxx2L6jpQDgLdFvGRcwqypIc5vYRn0pAQbfZZtPjYHit/yTo7oom2ewzOO1zyR+FrSAPeeaqIYooGi7nWAHH4lZ7NTNp9bPvawYuNvMYf9brYcPA33iv0XwGQPhkcxtx9G7vtbzbsJPJxPFblkfJcVNGIohYDEk+c529zjvKirilp2RsbGxoaxoAa0bABgAqqIgIiICIiAiIgIiICIiAiIgIiICIiDFZazepqoWmiDjueO68dHDG3LYqmR8iU9K3Vgiazidrj95xxKyKICIiAiIgtMp5MhqGak8bZG8HDZzadrTzCsMi5rUlKbxRDW+u4l7h0LvN8LLNIgIiICIiAiIgIiICIiAiIgIiICIiAiIgIiICIiAiIgIiICIiAiIgIiICIiAiIgIiICIiAiIg//2Q=="
-    },
-    {
-        "id": 3,
-        "name": "Ergonomic Office Chair",
-        "price": 15.99,
-        "quantity": 20,
-        "description": "An affordable and reliable ergonomic office chair with adjustable height and lumbar support.",
-        "category": "Office Supplies",
-        "date_added": "2024-12-03",
-        "image_url": "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wCEAAkGBxISEhUSExAVFRUVFxUQFxUVFRUVFRUVFRUWFhUVFRUZHSggGBolGxUVITEhJSorLi4uGB8zODMtNygtLisBCgoKDg0OGhAQGy0lHR0tLS0tLS0tLS0tLS0tLS0tLS0tLS0tLS0tLS0tLS0tLS0rLS0tLS0tLS0tLS0tLS0tLf/AABEIAOEA4QMBIgACEQEDEQH/xAAbAAABBQEBAAAAAAAAAAAAAAAFAAECAwQGB//EAEkQAAIBAgMDCgMFBQYEBQUAAAECAAMRBBIhBTFBBhMiUWFxgZGxwTJyoRQjQlLRM4KS4fAHFUNissIWU3OiY5Oz0tMkJVRVg//EABgBAQEBAQEAAAAAAAAAAAAAAAEAAgME/8QAIhEBAQACAwEBAAIDAQAAAAAAAAECERIhMQNBEzJRYYEE/9oADAMBAAIRAxEAPwD2+qND3H0mTYtQNQQjcR3HedCOBlY2xRZC4Y5bb8pA+sHbNqpRoEUgXqEFlDs+UkkkAOQQqd3bvMNp0UU47kvt/EVHZKxpFaZcPUU5mNQsSEUL8IGo1H4d86cbRpfn+h/SGOXKbQRtUfet4egla75PaLhnJBuDb0Eiu+JE9kfi8PeEYK2bXVc2Y2vb3m4Yyn+cRC+Z0/aN8o9TJDFJ+YSpay84TmFsoF79sk1xSArL+YeYj84Oseckpf4j3D3lNcS1jr4CV15JFOHd7Sk7/OXpw7vaUNv84EC2j7wV+M+HpCu0feCfxnw9JzrcPS3VPmX/AHTLWmml8NT5l/3THXaX4WWs1pSKkM8nKQdqjEAhbKL66nU+g85Dae2GFStQRUyqoQmxzXZbtuNtFIjrra33pn5GUqf264+PmnJGa5sQNcvAT0BPhX5V9J5/yIoqMXmsC5Wpd7dInLrrPQE+FflX0mPhd4/9a/8ARNZTf+DyQjR53cEpbTlUtpiSWRRRRTl8Ls5w7U8K5pD7w1UcNVohjdF5saWJHTtm3FdIS5K7KNJA7uWc3QlWYIVUkLal8K2Hed+utpbsjbNF8qA5WcCogY5WqhhmLKp1tcka/lPATdsz9mO9vUznjJ7BNMexdgU8M9aooBerUd81rEKxDZO0A3PjC1h1R4psgW1V+8Ph6SkCatqjpnuEzgQTfskfFcfl94Q5sdQ8pg2Vvbw94QY2ikebX8o8hKRTHOHQfCDu7ZE49eoyv7aubNY7rfW8Nps5pfyjyEXNr+UeQmb+8V6j9JbRxSNoDr1GO1pFlAOnUPWV1pbU3+HvKq0kZOHd7Sht/nLk4d3tKW3wIHtH3gf/ABD4ekMbR94HP7Q+HoJzrcJPhqfMv+6C8XVsDCV7LV7195zm08RwHHSRdhyWpZcOGO92L/XKPoBOefZ9cJiK70mBd6lTXLog3Hf+QCdjg+bRETOtkVV+IfhFpDaGMTI5zZtCLL0mJOmgGp3zV1pib24vkBjGOOyXUrkqa8fgOk9Op/Cvyr6Tzb+z7YWJp4x61WkVWo3OAnQ6UaqG44G7Cek0/hX5V9Jn5YzHHUb+2dyy3pMR5ESYnVySEtSVCWpJJxR4opg2PsfD4NWFPoq7F+k19cutidwspPhNey3DUwym4N2B6wdQfIwFtrYrtVwpBbmkqBWp6OoQqTqGuMuZQOsB+wW6HCbj8xmYIviiiiQnaY6fgPeUWmvaK9Lw/WUZZJp2ZvbuE3st9DMOzt57pvkgXFrlqW6xeUsZftU/eDuv/XlMxMxW4ixlZe0djKmMzsjOBxOca7wLd4vL60DbPezjt084YrTcu4xZ2gvDu9pS2+XLw/rhM7nWKBdo+8Dn9oe4eghfaPvAzH709w9JzrcSCZlrD5feYVw9uI8oSwv+L+77yD05m4S+t45WMPS4FfI/rItVqDcy/wAJ/WbGpytqUz/Hi1zohyb2pWeuqOVy2bcOpDbWdVT+FflHpOU5NYc8+rcOmP8AsM6qkeivcPSdsJqOOd3T1KqqLswA6ybCUDatD/nU/wCITPhAKlaszC/NstFAdQo5tHYgdZL2J6lEICkv5R5CO7fBqT1Sm1KB0FZD2BgT5TcXANriUPh0IsVHkJdTQRmxdfi28UeKaDDjNpNSxKUzmKVVAU82xVKitqC4Fukt7a6ZO2EsPx+YzNXYEE5RexFwOlbfYGC9hYqugFKu6M2UlDrztUIQHqMu5bZkFhfU79ZnwOiimRsURvtwHHeTYfUx/tJ7PIxKGNHS8P1lBWW1XvvkDJLcDvPdNhMG06pU6TDtRzmDE7xaFujGnaFC7lhUTcBYsAdIKxeLWmbNc/KC/wDpvEaZMY4a851uKqe0EbdfxUr6iXKQfxAeP6SH2OP9kh2W3Cc2Ddqi6agC+/t0hAVlYdEgiA/shl+zGyuVPEfUf0ZqVmwWTh/XCZ6m+Xofh/rhM9Q9KaZBdobj3wKx+98BDG0Doe+BXP3vgJzrpGvA76v7stZZVs74qv7s1FZqeBmKRubmgrGKyTbydXpjvb/SYZT4V+UekE7AHTHe3oYWX4V+UTcYvrDsn4q566x+lOmPaExBmx91U9dar9Gt7QkIY+HL1YJYkqEtSaZTvFKPtdP86+cUUFYza1JVJZwABmNgxOUakDTju85gqueeFZKlO9jTy1AxIVipbIfwjog20uROZxeLTmvtJeysgK3JXosNBbcCQx1PtN+zrc1TyGyZFygWIsQLa2175w523TWoyPtavXtSrXRXrVFFiVYBGLZguXUrlBC5mBF+Im6ryjGEqE1a61jUW+S2Rg4JClAeiFe1zqMpHGTZSbEm5Go3aGxFx1aEjxldfCq/xgNpl6QB0ve3dfWZ45Ty9q4j2z9tB6atVQ03O9Oi1u4qxBH9WEvO1Kf5j/D/ADnPkH8x84sp/MfMzrLVxg//AHnT62/h/nIV8UtRSBe69LUW03H1gPJ2nzM0YHRxqdejv/NpLdOnQYGxXdNGQdQg/Z7W0hKUFV5B1Rio6pYYxEUgBMmMWxDDhrNkrrrcQqLn7WmapV6Uy1alh3afWZ6tfee71ltaU459D3/rBFQ/ffuibsU9x4j3g6ofvh8o95itwQ2Z8dX92brTBsv46v7vtCU1GartIkS20iRENewviHe3oYTX4V7hBuxPiHefSEk+Fe6agrBsQ9B/+tiP/Wce0JiAtlYrLTPwj7yu12a1/wD6iqLL1nT6iC9p8pMRTqZFCW3aqT7wx/rB9MpMq7USraGINOk7gXIU5QOLHRfqRKdl12emrNa56tBKtp4gF0ohhnINS1+lb4M1uoXY94E0owZ8J/zPWKS/4bwv/K/7m/WPLs9OUobFQ4ZKFRc1kykneCR0iNTY/wBboSo0lRQqgBRoANwHUJKPOMkjWiiijxJR40eaRRxpGjyAzRbpX4GzDuIhSmdIFwzdFD3ofDd9LQth3kqtMYyUYxCsxmkjK2MEE7UWwJgx36J7veGtopmUiAGPRbu95mtRVVbo+I95jqn74fKPUzTUPR8RMdY/fL8g9TM1oX2RSYvVIUkdEXANr2BteE+ab8p8oGwmNqU+eyORbI3Ai5ygnXsk15Q4gb3B71X2tNyyMWDLYV+ry1t32vBh2ph7259ARoQSQQeogiUvyrrDelNvBh7wBtzlfTpFS2y6VUNmzMtgVOm/7s778TwjuDVdfs3a+GVhfE0t5PxgcO2bnxXOU1OHdXKnKxUhgOidCe8rPMX5dYIC77Lde5afvlmvZXL7AjoUsPXpFzuWmVzG3/hPrpK+aUursQxGH2nRFRkq2TO5WkoUsAxZi1mSx1O4EnWaMapZwxUi6qTcbiQCfrHp8saRAtUxKX60rMevUOjWllXaqVAD9vdLcWpoDrbgaY7JnGTH9P139PYIYPlDVR1pfY3ZASoqKygFQWAYXNuFzcj4hacRyq2hWqbVzJzlPJUp0EqBGIVVNs2nxKWZz1EHqnU80HFv72OvC2HHqsccnSd20Khvr8VLj+5Nxix0f95p1/T+cec9/wALP/8Am1v4qf8A7IpraWx40U5Oh4rxopJKKRjxSUUa8eSb9nm6sOIs49D7QjRY8Jl2ThSDnJFrG442I48BwMmdsoDkVuwBQAPMxZE6ZPEHyk2g446r1P50j7xhj34jzA9QZLTY1QStmg2ttYZ8nUL9Y17ZOlicxFjv0haZFuKgDEr8Xbr+v1vD1cTldtYQu51sBqT7TNajRTpIVs721vYC58eqTNDC5gxNUkDLwt5Ze2DBTIUWNlGnb5xEm+/h8IO/t64bOhmiMKCxzP0gAQ1iNLdnZNSYOiwuuQ96iBMI65mzAkW0A4HviasA3QRlPfcEfrNSs6FauBUb0UagfCtrXH6zmq+0CGrB6NIJTaoCct7ohIuRbfYaiPyz2xWpYbokqzPTTMCQRrmNiPlt4ziF2pXewatkFTom4uHuSru5I3kg6aDXxnTHTnnv8HNu3qbMNenfmi70grgh1AVrZWucy9QOo6zuHEchKhGPofFZqmR1AuWTRmW3EHKPKepbeoNU2JSVbOb2GUNZsvODogi+ttBPP/7LsA9TaNJlW60i1RzwUZSBc8CSdJaUu49lXAqwK08GlO++pVWmbX/EtMElm7Gy+NrQhh9hYZVVFoqAoCjgbAW1ImtZastEPqbAw5/w9fmYi/aLwZjsFl6VfDJUW+vNkA9h1CevGdLePUphhYiXni9cl9owP/6sf+XQ/wDkihv+5qX5fqY0N5HUBYpGPMNHvFGjXkkrx7yEeSSvHBkLx7yTc2LZ1FMdgsPxHhI7L2elVemliSdxItrG2Yt6g7Lt5C/raF9mi5v16yqDMTsNEayFuvt8xE+EUUyKgLG9rMSbbtezfv7IfxVHMOo9cEYrD65S28XNuA4mPlANs7AqDmvfiP59cOYSgSQeA3THsej0bE3tx8TD1JbCGuztVXWwnK4575z2GdFtWuAp13zlar3DnsMzfTFLHoeImTEH75Pk92mgnoeImTEn75Pk92gW6mxzP2ZT9B+s37OTN0rbr798GIbNUPyj/tENbNFl8pvH0Xw2OwNOqmWpTVwGzAMAQDYWI7dZ5ptuirVqtFKRXma1TKyjoBLLamRv+JSdxteeqncf63ZZ5LyuxbLiK6BrWrONNDqSfrpOuOnHL/Tv9luG2XhiAB033AKLh6wJAGg1m/k2PvT8h/1LB3J9f/tOE+aof++rC3J1fvG+Q/6lmL63PHQCSEjJLNBKWpKTLacglaKPFFOKivGinJ0PeNeNeNeRSvHvIXivJJ3j3ld495ATwXRpu542pj1b2hDBV2A0pMe2xA+sq5PuMrFtcpGUHgTqSIUOMlpM1XEVbaUTftIgmnSrLzj1barYWN9+h4Q8cZB+2cTdQL77nyjJ2NsOzw5ByG2pvpfiZqalVO+qfAW95zx2i9N8iNa4JNvm/nD2FxBy3d2J75nq1ruRU+yy293Pl+kj/cS2I6WotvH6SyjtHOxG62k1c5KaXYeeTgtbM3X+H9JRV5LAuHztoMttO39YY57tkTVl0Owivyevuqka3OgN9AOvshLC4cItt/bu7PaOasrarLei0AqdNfWV/YqRN7Lc9gv4yOEa7eE22nSdxise3qGSlTUcGPoT7zJsEdNvl9xNvKD9nT7z6TLsT4m7vcQvpngzJLICSE0ykZbTlUtpySV40UUQ4ei+ZVPWAfMXk5Xhl6C/KvoJaROTqgY0kVjZTJGvFePzZ6o4onqloI3ivJ/Zm6o/2c9Y8xLS2lhsWUvbjv8ADdFU2xlNjUUG17FgDa5F7HhofKMMP/mEF7T2ZVqHKjpTBZWNUEs5UWuvNtTKXIBF79R1taXHa2xbV/tFw1JxT5xqra35kBwvzNcC/dfttLtmcucLXBGco4W1qwFMlb5jlubG3Gx6pqx2xaTU2ApUmfKcpqUkZc1tMw0uL755hWx5NfmE2Zg2qtZRTWmrFGAAfnHQ5bXzHQ6DfaMitdljOVuCStZq4JA/ArVALnddARfSbBy9wTCwxAHelRfVZThOS2HCJzuFw/Om1zSV0QE7svSJ06/SAdqf2fM1R2WpkDG6rlLW0F+kWudfWYshltdPhOVmDVr/AGqnr/mt6zZif7QcCmgrFz/4aMw/itl+s4nZ/I7mgy1KVOtdgwZrgjQArbq0vv4w5szkTh6g6QyHMTZApFtej94rad1pTibyWYj+02l+DD1T8xpr6MZhqcvcbU0o4IKeBbO/sonc4Pk1haYGWimnWAfXSEctKmN6r5Ca6Z7eXNieUFa2W1If9NF/1hpWvJjbNWoq1sTUKnUnOBRHYwSoCf4TPVKeMptcIytbQ2INvKWqTfdFMXJzD4qmhXE1UqEWClNNAW39EW0KjwhpTKlcdUtW3X5zTLNt/wDZ0+8+ky7F+Ju73mnb/wAFL972mbYu9u4esL6fwXBk1lYk1mmUpakqlqSR48aKIcyKIHA+f8o+QdXrIHaFL84Pdc+glD7Tp8Ln90+857jeqvbuH9d8iW/qwmKptReCOfIe8pO0z/y/Nv5Q5Q8aIlj1nzlZg98bU4IvmTKGxlb/ACjuB9zC5wzGjFhFA32iqfx28F/SM3OHfUbwNvSZ5w8KNXjEwCaLcWY97E+pkOYXiPpL+RcBHa5D0nprVRWYWuWtpcZhcG4uLi4gXk1sWhhM75qWd7D7u5Coo0UE66m5Ph1XmrmBEaXV9ZfyLgtxe1UUgjMbEHRTwPdIYrlThnpugdlYqRZkddSD+K1vrKGXsl32BHBGUHok2Ivu13GEztpuMkBG2wUpKqszOaKlbdLpbrnqiocpKy02tTc1LHKSq2vwuerwnUbYwFNMIuVFS7D4VC36L9U52mnRPHTxhndZHCbjInKPFupFQVAdDdXVdQRYaKNDB+LqV3rJVyKCq5bFib79c1u2G1QEWkalEZhM861xgtyV2iUDc4liTfonMB52nW4faFJtzjuPRPkZxOBUgnSEsv8AW+dMc7pjLCOwEkDOSosy/CxX5SR9N020NpVRvIb5hY+Y0+k3zjNwo3t74KX73+2Z9itYt3D3k9s1M1KgbWupNt9tF4zPsmsoJBYAm1gSBffu64/rP4OB+yWKRKAZYs0ytEtQSmnLy2kUa0eNn7oorTzVsdTG5T9JEbUX8hkV2QfzDyMtXYZP4p4+npR/vFT+GOMevUZMbDtvaX0tkKOuHS0oXFrwlgxC9XkJqGzRwWM2AI/CfCBZiw4SBqdksbCkHjGZesS2lXPdkWYHjLeZHAzTQ2ZUbcht1mwB7ibXjO1Q80zJpgKzC60XYdYVj9QJ0OB2RlOYgMRqFJJW/wDmAGoEM0K1QD7xkJ7AUAHixnTH52+udz144J8FUHxU2X5lYeohHZuEJJIFwFa9gTa40vOoq7UC7rk/5bn66QbU24SWB+7uBlubAm5FuFz0h5TUwkvrNztnjJtzDk4ZABchgSN5tZuHjOaTAvu5tvAGegUKKIjUnxBdzmsajIKlrW0ygcddBpfulRqsPxfQewjn8+V2sM9TTjKWxqxH7I+OnrJtsRri9l7zOvbGN2eR/WDqzVHJDOrIeGSzKeBVgfoRMX5f4an0CsNsgg/tFMJ08AvEnwEv2a5o3PMiqTuswBHYA2k5ravK3afPFVwJpJmsL1KY6N7Zh0TfTthMdTdNy3enSLspDuDHwP6SQ2MeCt4zlqm2Me3Ej/8AoR/plJqY599fw6bf6jHeK1k7XbtLLSog6ZVIN+5YIwyU3uGqU13fGdDvnOV9j4g2L4twDwCUx9SDLaHJ7PvxNY/vn0W0bnKJjXUU6NNPhxir2ISw/h+H6TQu26FP9pi1Yf8ATKHxN7fScoOSVPixb5izepmzC8n6SbqNE/ugHzjy14LiNf8AG+BU/tr9q5Wt22DEnwEPUcfSqWyVFbjYHXy3zmcPh0X/AAR4W9JuZ0bfTv3iamdFxjoIoCzJ+QxR5Dih9iS3RfwMaicuhpg9xlQrAyDBt408Z5du2hehiaTaFQO+WVGUbl+kDsX7PeOlaqNzadRjsaExiB+WQqYkDeJiNQnf9JU6ky2tNTV6Z3gjwmavhlO7KR9ZWaB7Jz3KHlMuDOjU1OnSq5yue2YKqU1LNYZSdwAYa6iMlyulbp1lLDU6Ava9Tfr0snUAD+Lt4TJi9s1RcimPG5J8Zy3IvlDiMTWrU8SKRCqlVXpBsrCpezBmJuCB1AggjhadZUp+ImsrceozjJe64ccu8e2NfCKtNSquoOQ3zIhIqm7WFNmA06mGt50lHH1WRedqA1Moz5dBmt0soPC95Ri9nrmJygg7xv7vrFSwi2HQA8BDL67OPz0tNVj/AIhPYTNmzqeeoiMoIJF+5el7TAcKv5R4geohHYNILVBtayvx0+G3vDHuw5dRo5SVTmAsLEZr213kWJ6uyBMxGoPlpCfKtSTSKtY5W069ROeNaqu9L9sfp/arD+rXiMTVKkLVZWIsG1OU9djechS27j6mIr02qGgvTCVCoC08p+7KsRapmAFxrcMSLW06M7RXibQdV2hTDNqDvtp5SxzsWWMrp8NtRTuqg+IhXC7SR7U6uVlOl+rqP8xOLo4jN8KBe0b4B2nt1lc06lWrTBLKopqhbIrFOcY1OBKtZRvAvcXE18+VZz1HpO0cEaLld43qesfrKFqdYtOd2PtTEkOuIrtXCFVp1CqoGQoGDKAo0IZTrcg3F9ISGMvDLHV6Mu4KYxrqNbzPhFFzMuMrXUSjC1mvvhZ21PBwd8kr2g3nzJrVvxmmRNavaJcKggi8tRzwMYBTP2xQbzrRopZTqhTYzdTrrwMFlPOUsSJ5506+i71lO7+UiXPfMFKt1zSvfEGesYwrZuNpGokr5vtl2ulj3HGcby52EuJCG5DKScw0vmCg5tDfRF8p1vOWkKiK0ZbPBZL6A8nKFShSWkgp2UAX1zHU6s3HUnzh1K9T/L5GPSwIB00/rqk/s565d/q6RNcnflB7j6xzfrHgD+sl9kJ/FJLhSOMdBkqB+DfQTidr8rWR+bNepRJvY06aOUXMQGqZmG8C+VeBGtzaegtQU75xXKLk9RrVxUdbkWB+IBgN2axF+PVNYaxvYy3Z01bBxWKqLUXFVmqNTqGkrdEKQoFyllF1J3GEGo99uq5Mqp0apJ+9BsfyAek0LTe3xj+H+cxld3bWM1NB2Pwy8BaYKWFBO4Hwhqrhb728hFToBe2GyzU8Ov5APOCNq4Sm9RTUoioFOgJZbDjqpBI7DpOnQAyD4YE7ozKzxWSsi1SxPhvAG8XAFt3dHUeE380BwjBAZrkNKajnLa30iwhm1qWkhRoAmW+wsURwknzBEcCaCIBliv1iTVZYKcQq5wf0f5x5PmYo7S2r+HulDRRTi3ETvMsSNFM1pppSk8e+KKaYVvK1iikW9JJ4opplFZa0eKaDLV4wLi958feKKZyaiWH4ybxRTDStpSvGKKFMKaafDuiijAavKF3+cUUjG5d0jR3xRRjNEeAlbxopsGSaViiiCiiikH//2Q=="
-    }
-]
+    Returns:
+        list: The seed products, as dicts.
+    """
+    with open(SEED_PATH, "rb") as source:
+        return loads(source.read())
@@ -0,0 +1,347 @@
+"""
+Persistence backends for the product store.
+
+The store hands every committed change to its backend as a list of operations,
+while it still holds its write lock so the backend sees changes in commit order:
+
+    ("put", record)    the product was inserted or replaced
+    ("delete", id)     the product was removed
+
+`append` only buffers the operations and returns a ticket. After releasing
+its lock the store calls `sync(ticket)`, which returns once the change is
+durable. Writers that arrive while a flush is in progress are flushed together
+by the next one (group commit), so many concurrent writes share one fsync.
+
+Backends:
+    MemoryBackend  keeps nothing; the catalog is lost on restart (the default).
+    WALBackend     append-only JSON-lines log plus periodic compacted snapshots.
+    SQLiteBackend  one row per product in SQLite, in WAL journal mode.
+"""
+import glob
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+from .codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """
+    No persistence. Every method is a no-op.
+    """
+
+    def load(self):
+        """
+        Returns:
+            tuple: (records, last_id), or None when there is nothing stored yet.
+        """
+        return None
+
+    def append(self, operations, last_id):
+        return None
+
+    def sync(self, ticket):
+        pass
+
+    def needs_snapshot(self):
+        return False
+
+    def snapshot(self, records, last_id):
+        pass
+
+    def close(self):
+        pass
+
+
+class GroupCommitBackend(MemoryBackend):
+    """
+    Base class for group commit. `append` only queues operations in memory.
+    `sync` makes one waiting writer the leader, which hands every queued batch
+    to `_persist` in one go, outside the lock. Writers that queue up while the
+    leader is persisting are covered by the next leader.
+    """
+
+    def __init__(self):
+        self._commit = threading.Condition()
+        self._pending = []  # (operations, last_id) batches not yet persisted
+        self._written = 0  # ticket of the last queued append
+        self._synced = 0  # ticket of the last durable append
+        self._flushing = False
+
+    def append(self, operations, last_id):
+        with self._commit:
+            self._pending.append((operations, last_id))
+            self._written += 1
+            return self._written
+
+    def sync(self, ticket):
+        if ticket is None:
+            return
+        with self._commit:
+            while self._synced < ticket:
+                if self._flushing:
+                    self._commit.wait()
+                    continue
+                self._flush_pending()
+
+    def _flush_pending(self):
+        # Called with the lock held; releases it while persisting
+        self._flushing = True
+        batches, self._pending = self._pending, []
+        target = self._written
+        self._commit.release()
+        try:
+            if batches:
+                self._persist(batches)
+        except BaseException:
+            self._commit.acquire()
+            self._pending[:0] = batches  # let the next leader retry them
+            self._flushing = False
+            self._commit.notify_all()
+            raise
+        self._commit.acquire()
+        self._synced = max(self._synced, target)
+        self._flushing = False
+        self._commit.notify_all()
+
+    def _persist(self, batches):
+        """
+        Durably store a list of (operations, last_id) batches, in order.
+        """
+        raise NotImplementedError
+
+
+class WALBackend(GroupCommitBackend):
+    """
+    Write-ahead log in `directory`.
+
+    Changes are appended to `wal-<n>.log` segments as JSON lines. Once
+    `snapshot_every` operations have been logged, the store passes a
+    snapshot of all products. A new segment is started right away, and
+    the snapshot is written to `snapshot.jsonl` on a background thread.
+    Older segments are deleted once it's safely on disk. Startup loads the
+    snapshot and replays the segments after it.
+
+    Args:
+        directory (str): Where to keep the log and snapshot files.
+        fsync (bool): fsync on every group commit. Without it a crash can lose
+            the last few writes, but the log stays consistent.
+        snapshot_every (int): Operations to log between snapshots.
+    """
+
+    def __init__(self, directory, fsync=True, snapshot_every=100000):
+        super().__init__()
+        self.directory = directory
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        self._operations_since_snapshot = 0
+        self._snapshot_thread = None
+        segments = self._segments()
+        self._segment_number = self._number(segments[-1]) + 1 if segments else 1
+        self._file = None
+
+    @property
+    def _snapshot_path(self):
+        return os.path.join(self.directory, "snapshot.jsonl")
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, "wal-*.log")), key=self._number)
+
+    @staticmethod
+    def _number(path):
+        return int(os.path.basename(path)[4:-4])
+
+    def _open_segment(self):
+        path = os.path.join(self.directory, f"wal-{self._segment_number:08d}.log")
+        self._segment_number += 1
+        self._file = open(path, "ab")
+
+    def load(self):
+        rows = {}
+        last_id = 0
+        found = False
+
+        if os.path.exists(self._snapshot_path):
+            found = True
+            with open(self._snapshot_path, "rb") as snapshot:
+                header = loads(snapshot.readline())
+                last_id = header["last_id"]
+                rows = {record["id"]: record for record in map(loads, snapshot)}
+
+        for path in self._segments():
+            found = True
+            with open(path, "rb") as segment:
+                for line_number, line in enumerate(segment, 1):
+                    try:
+                        entry = loads(line)
+                    except ValueError:
+                        # A torn write at the end of the log from a crash; the
+                        # client never got an acknowledgement for it
+                        logger.warning("Ignoring a partial entry at %s:%s", path, line_number)
+                        break
+                    last_id = max(last_id, entry["last_id"])
+                    for op, value in entry["ops"]:
+                        if op == "put":
+                            rows[value["id"]] = value
+                        else:
+                            rows.pop(value, None)
+                    self._operations_since_snapshot += len(entry["ops"])
+
+        return (list(rows.values()), last_id) if found else None
+
+    def append(self, operations, last_id):
+        self._operations_since_snapshot += len(operations)
+        return super().append(operations, last_id)
+
+    def _persist(self, batches):
+        if self._file is None:
+            self._open_segment()
+        self._file.write(b"".join(
+            dumps({"last_id": last_id, "ops": operations}) + b"\n"
+            for operations, last_id in batches
+        ))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def needs_snapshot(self):
+        running = self._snapshot_thread is not None and self._snapshot_thread.is_alive()
+        return self._operations_since_snapshot >= self.snapshot_every and not running
+
+    def snapshot(self, records, last_id):
+        """
+        Start a new log segment and write `records` as the new snapshot in the background.
+
+        Args:
+            records (list): Every product, as of the last append.
+            last_id (int): The store's id sequence, as of the last append.
+        """
+        with self._commit:
+            # Everything appended so far is in `records`, so it belongs in the
+            # old segments. Persist it there before switching to a new one.
+            while self._flushing:
+                self._commit.wait()
+            self._flush_pending()
+            if self._file is not None:
+                self._file.close()
+            old_segments = self._segments()
+            self._open_segment()
+            self._operations_since_snapshot = 0
+
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot, args=(records, last_id, old_segments), name="wal-snapshot"
+        )
+        self._snapshot_thread.start()
+
+    def _write_snapshot(self, records, last_id, old_segments):
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as snapshot:
+                snapshot.write(dumps({"last_id": last_id}) + b"\n")
+                for record in records:
+                    snapshot.write(dumps(record) + b"\n")
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temp_path, self._snapshot_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        # The snapshot covers everything in the old segments now
+        for path in old_segments:
+            os.unlink(path)
+
+    def close(self):
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._commit:
+            while self._flushing:
+                self._commit.wait()
+            self._flush_pending()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class SQLiteBackend(GroupCommitBackend):
+    """
+    Stores each product as a JSON row in SQLite, using WAL journal mode.
+
+    Each group commit writes all queued changes with the same prepared
+    statements (sqlite3 caches them) in a single transaction.
+
+    Args:
+        path (str): The database file.
+        synchronous (str): SQLite's synchronous setting. "FULL" syncs every
+            commit; "NORMAL" can lose the last commits on power loss, but
+            never corrupts the database.
+    """
+
+    def __init__(self, path, synchronous="FULL"):
+        super().__init__()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level="DEFERRED")
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._connection.commit()
+
+    def load(self):
+        with self._commit:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'last_id'").fetchone()
+            if row is None:
+                return None
+            records = [loads(data) for (data,) in self._connection.execute("SELECT data FROM products ORDER BY id")]
+            return records, row[0]
+
+    def _persist(self, batches):
+        connection = self._connection
+        try:
+            for operations, _ in batches:
+                for op, value in operations:
+                    if op == "put":
+                        connection.execute(
+                            "INSERT OR REPLACE INTO products (id, data) VALUES (?, ?)",
+                            (value["id"], dumps(value).decode()),
+                        )
+                    else:
+                        connection.execute("DELETE FROM products WHERE id = ?", (value,))
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_id', ?)", (batches[-1][1],))
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+
+    def close(self):
+        with self._commit:
+            while self._flushing:
+                self._commit.wait()
+            self._flush_pending()
+            self._connection.close()
+
+
+def create_backend(kind, path):
+    """
+    Build a backend from configuration.
+
+    Args:
+        kind (str): "memory", "wal" or "sqlite".
+        path (str): Directory for "wal", database file for "sqlite".
+
+    Returns:
+        A backend instance.
+    """
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "wal":
+        return WALBackend(path, fsync=os.environ.get("WAL_FSYNC", "1") != "0")
+    if kind == "sqlite":
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown persistence backend '{kind}'.")
@@ -0,0 +1,120 @@
+"""
+Sampling profiler for slow requests.
+
+A background thread wakes every `interval` seconds and records the current
+stack of each thread that is handling a request. When a request finishes
+slower than `threshold`, its most frequent stacks are logged, which shows
+where the time went without tracing every call. The cost is one
+`sys._current_frames()` call per interval no matter how busy the server is,
+so it can stay on under load.
+
+Stacks are attributed per thread, so this covers the Flask views (which run
+one request per thread), not the asyncio handlers that share the IOLoop thread.
+
+Enable it by setting PROFILE_SLOW_REQUEST_MS (see app/__init__.py).
+"""
+import logging
+import sys
+import threading
+from collections import Counter as StackCounter
+
+from .metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+slow_requests = Counter("slow_requests_total", "Requests slower than the profiling threshold.", ["route"])
+
+
+class SamplingProfiler:
+    """
+    Args:
+        threshold (float): Requests slower than this many seconds get their stacks logged.
+        interval (float): Seconds between samples.
+        top (int): How many of the most frequent stacks to log.
+        depth (int): Innermost frames kept per stack.
+    """
+
+    def __init__(self, threshold, interval=0.01, top=5, depth=25):
+        self.threshold = threshold
+        self.interval = interval
+        self.top = top
+        self.depth = depth
+        self._active = {}  # thread id -> Counter of stacks sampled during its request
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def begin(self):
+        """
+        Start collecting samples for the request running on the current thread.
+        """
+        with self._lock:
+            self._active[threading.get_ident()] = StackCounter()
+
+    def end(self, description, route, duration):
+        """
+        Stop sampling the current thread's request, and log its hottest stacks if it was slow.
+
+        Args:
+            description (str): What to call the request in the log, e.g. "GET /api/products".
+            route (str): The route label for the slow request counter.
+            duration (float): How long the request took, in seconds.
+        """
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if samples is None or duration < self.threshold:
+            return
+        slow_requests.inc(route)
+
+        total = sum(samples.values())
+        lines = [f"Slow request: {description} took {duration * 1000:.1f} ms, {total} samples"]
+        for stack, count in samples.most_common(self.top):
+            lines.append(f"  {count}/{total} samples:")
+            lines.extend(f"    {filename}:{line_number} in {function}" for filename, line_number, function in stack)
+        logger.warning("\n".join(lines))
+
+    def _stack(self, frame):
+        stack = []
+        while frame is not None and len(stack) < self.depth:
+            code = frame.f_code
+            stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()  # outermost first, like a traceback
+        return tuple(stack)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[self._stack(frame)] += 1
+            del frames  # don't keep other threads' frames alive until the next sample
+
+
+def create_profiler(threshold_ms, interval_ms=10):
+    """
+    Build and start a profiler from configuration.
+
+    Args:
+        threshold_ms (float): Slow request threshold in milliseconds.
+        interval_ms (float): Sampling interval in milliseconds.
+
+    Returns:
+        SamplingProfiler: The running profiler.
+    """
+    profiler = SamplingProfiler(threshold_ms / 1000, interval_ms / 1000)
+    profiler.start()
+    return profiler
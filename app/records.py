@@ -0,0 +1,120 @@
+"""
+Compact in-memory representation of a product.
+
+A product kept as a dict pays for a hash table per record: about 350 bytes
+for the eight or nine fields a product has, before counting the values. A
+`Product` keeps the same fields in `__slots__` instead, about 110 bytes, and
+the strings of low-cardinality fields (category, date_added) are interned, so
+a million products share a few hundred of them instead of holding a million
+copies.
+
+`Product` is a read-only mapping, so code that reads records
+(`record["price"]`, `record.get("category")`, `dict(record)`) works as it
+did with dicts. Fields that aren't in `FIELDS` go in a small overflow dict.
+Records only turn back into plain dicts when they are serialized: pass
+`json_default` as the `default` of `json.dumps` (see app/utils.py).
+"""
+import sys
+from collections.abc import Mapping
+from operator import attrgetter
+
+FIELDS = ("id", "name", "price", "quantity", "description", "category", "date_added", "image_url", "version")
+INTERNED_FIELDS = ("category", "date_added")
+
+_FIELD_SET = frozenset(FIELDS)
+_MISSING = object()  # the value of a slot whose field the product doesn't have
+_values = attrgetter(*FIELDS)
+
+
+class Product(Mapping):
+    """
+    An immutable product record.
+
+    Args:
+        fields (dict): The product's fields.
+        **overrides: Fields to set on top of `fields`.
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, fields, **overrides):
+        if overrides:
+            fields = {**fields, **overrides}
+        get = fields.get
+        self.id = get("id", _MISSING)
+        self.name = get("name", _MISSING)
+        self.price = get("price", _MISSING)
+        self.quantity = get("quantity", _MISSING)
+        self.description = get("description", _MISSING)
+        self.image_url = get("image_url", _MISSING)
+        self.version = get("version", _MISSING)
+        category, date_added = get("category", _MISSING), get("date_added", _MISSING)
+        self.category = sys.intern(category) if type(category) is str else category
+        self.date_added = sys.intern(date_added) if type(date_added) is str else date_added
+        # None when the product has exactly FIELDS, which is the usual case.
+        # Otherwise the fields outside FIELDS, if any.
+        self._extra = None
+        if len(fields) != len(FIELDS) or not _FIELD_SET.issuperset(fields):
+            self._extra = {key: value for key, value in fields.items() if key not in _FIELD_SET}
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return f"Product({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A new plain dict with the product's fields.
+        """
+        item_id, name, price, quantity, description, category, date_added, image_url, version = _values(self)
+        record = {
+            "id": item_id, "name": name, "price": price, "quantity": quantity, "description": description,
+            "category": category, "date_added": date_added, "image_url": image_url, "version": version,
+        }
+        if self._extra is not None:
+            record = {field: value for field, value in record.items() if value is not _MISSING}
+            record.update(self._extra)
+        return record
+
+    def replace(self, changes=(), **fields):
+        """
+        Returns:
+            Product: A copy of this product with `changes` (a dict) and `fields` merged in.
+        """
+        record = self.to_dict()
+        record.update(changes, **fields)
+        return Product(record)
+
+
+def json_default(value):
+    """
+    `default` hook for `json.dumps` that writes a Product as a plain object.
+    """
+    if isinstance(value, Product):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
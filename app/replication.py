@@ -0,0 +1,301 @@
+"""
+Read replicas: followers that keep a copy of a primary server's catalog.
+
+A follower (`python app.py --follow http://primary:5000`) loads a snapshot of
+the primary's catalog from its NDJSON export, then tails the primary's change
+feed (the event stream of app/changes.py) from the snapshot's version and
+applies every batch of changes to its own store with `ProductStore.apply`.
+It serves reads from that copy, so every follower adds read throughput.
+
+Reads from a follower are eventually consistent. The follower knows it is
+up to date whenever it has applied everything up to the version in the
+primary's latest event or heartbeat, and its lag is the time since then.
+Before its first snapshot, or once the lag passes `max_lag`, it answers API
+reads with 503 so that clients or a load balancer go elsewhere. Writes are
+forwarded to the primary, or rejected with 405 when forwarding is off.
+Product images live in the primary's blob store and aren't replicated, so
+image requests are always forwarded.
+
+When the primary no longer has the changes the follower needs (it fell too
+far behind, or the primary restarted), the follower loads a new snapshot,
+serving the old copy in the meantime. A follower's own change feed works as
+on any server, with versions of its own.
+"""
+import asyncio
+import logging
+import re
+import time
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+from tornado.httputil import HTTPHeaders
+from tornado.routing import Matcher
+from tornado.simple_httpclient import HTTPTimeoutError
+
+from .codec import loads
+from .metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+IMAGE_PATH = re.compile(r"^/api/products/\d+/image$")
+STATUS_PATH = "/api/replication"
+# Headers that only describe one connection, so they aren't passed on when forwarding
+HOP_BY_HOP = frozenset([
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+    "transfer-encoding", "upgrade", "host", "content-length",
+])
+
+
+class _Reset(Exception):
+    # The primary no longer has the changes since the follower's version
+    pass
+
+
+class EventStreamParser:
+    """
+    Incremental parser for a text/event-stream body.
+
+    Args:
+        on_event (callable): Called as on_event(event name, data) for every
+            complete event. Comments and ids are skipped.
+    """
+
+    def __init__(self, on_event):
+        self.on_event = on_event
+        self._buffer = bytearray()
+        self._event = "message"
+        self._data = []
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        end = self._buffer.rfind(b"\n")
+        if end < 0:
+            return
+        lines = self._buffer[:end].split(b"\n")
+        del self._buffer[:end + 1]
+        for line in lines:
+            line = line.rstrip(b"\r").decode()
+            if not line:
+                if self._data:
+                    self.on_event(self._event, "\n".join(self._data))
+                self._event, self._data = "message", []
+            elif not line.startswith(":"):
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    self._event = value
+                elif field == "data":
+                    self._data.append(value)
+
+
+class Follower:
+    """
+    Copies a primary's catalog into the local store and keeps it up to date.
+
+    Args:
+        primary (str): The primary's base URL, e.g. "http://127.0.0.1:5000".
+        store (ProductStore): The local store.
+        max_lag (float): Seconds of lag past which API reads get 503, or 0
+            to serve them however far behind the follower is.
+        forward_writes (bool): Forward writes to the primary. If False,
+            they are rejected with 405.
+        heartbeat (float): Seconds between the primary's heartbeats when
+            nothing changes, which bounds how stale the follower can be
+            without knowing it.
+    """
+
+    SNAPSHOT_SECONDS = 600
+    # The stream is reopened this often, so a connection that died silently is noticed
+    STREAM_SECONDS = 60
+    FORWARD_SECONDS = 30
+    RETRY_SECONDS = (0.1, 5.0)  # first and longest wait before reconnecting
+
+    def __init__(self, primary, store, max_lag=10.0, forward_writes=True, heartbeat=1.0):
+        self.primary = primary.rstrip("/")
+        self.store = store
+        self.max_lag = max_lag
+        self.forward_writes = forward_writes
+        self.heartbeat = heartbeat
+        self.version = None  # the primary's version applied here, None until a snapshot is loaded
+        self.primary_version = None  # the latest version the primary reported
+        self.connected = False
+        self._synced_at = None  # when the follower last knew it was up to date
+        self._started_at = time.monotonic()
+        self._needs_snapshot = True
+        self._client = AsyncHTTPClient(force_instance=True, max_clients=64)
+
+        Gauge("replication_lag_seconds", "Seconds since the follower last knew it was up to date.", function=self.lag)
+        Gauge(
+            "replication_lag_versions", "Versions of the primary's change feed not yet applied.",
+            function=self.lag_versions,
+        )
+        self.snapshots = Counter("replication_snapshots_total", "Snapshots of the primary's catalog loaded.")
+        self.reconnects = Counter("replication_reconnects_total", "Times the change feed was reopened.")
+
+    def lag(self):
+        """
+        Returns:
+            float: Seconds since the follower last knew it had every change
+                the primary had made (since startup, before the first snapshot).
+        """
+        return time.monotonic() - (self._started_at if self._synced_at is None else self._synced_at)
+
+    def lag_versions(self):
+        if self.version is None or self.primary_version is None:
+            return 0
+        return max(0, self.primary_version - self.version)
+
+    def stale(self):
+        """
+        Returns:
+            bool: True if API reads should be refused.
+        """
+        return self.version is None or bool(self.max_lag) and self.lag() > self.max_lag
+
+    def status(self):
+        return {
+            "role": "follower",
+            "primary": self.primary,
+            "connected": self.connected,
+            "version": self.version,
+            "primary_version": self.primary_version,
+            "lag_seconds": round(self.lag(), 3),
+            "lag_versions": self.lag_versions(),
+        }
+
+    def intercepts(self, request):
+        """
+        Whether a request must not be served from the local copy: writes,
+        image downloads, and API reads while the follower is stale.
+        """
+        path = request.path
+        if not path.startswith("/api/") or path == STATUS_PATH:
+            return False
+        return request.method not in READ_METHODS or IMAGE_PATH.match(path) is not None or self.stale()
+
+    async def forward(self, request):
+        """
+        Send a request on to the primary.
+
+        Args:
+            request (tornado.httputil.HTTPServerRequest): The request to forward.
+
+        Returns:
+            tornado.httpclient.HTTPResponse: The primary's response, whatever its status.
+
+        Raises:
+            HTTPClientError, OSError: If the primary couldn't be reached.
+        """
+        headers = HTTPHeaders()
+        for name, value in request.headers.get_all():
+            if name.lower() not in HOP_BY_HOP:
+                headers.add(name, value)
+        # Appended to the client's own X-Forwarded-For. The primary only
+        # believes it if this replica is one of its --trusted-proxies.
+        headers.add("X-Forwarded-For", request.remote_ip)
+        return await self._client.fetch(
+            HTTPRequest(
+                self.primary + request.uri, method=request.method, headers=headers, body=request.body or None,
+                allow_nonstandard_methods=True, follow_redirects=False, decompress_response=False,
+                request_timeout=self.FORWARD_SECONDS,
+            ),
+            raise_error=False,
+        )
+
+    async def run(self):
+        """
+        Copy the primary's catalog, then follow its changes until cancelled,
+        reconnecting with exponential backoff when the primary is unreachable.
+        """
+        delay = self.RETRY_SECONDS[0]
+        while True:
+            try:
+                if self._needs_snapshot:
+                    await self._load_snapshot()
+                await self._tail()
+                delay = self.RETRY_SECONDS[0]
+            except _Reset:
+                logger.info("The primary no longer has the changes since version %s, loading a snapshot", self.version)
+                self._needs_snapshot = True
+            except HTTPTimeoutError:
+                pass  # the stream is reopened every STREAM_SECONDS
+            except (HTTPClientError, OSError, ValueError, KeyError) as error:
+                logger.warning("Replication from %s failed (%s), retrying in %.1fs", self.primary, error, delay)
+                await asyncio.sleep(delay)
+                delay = min(2 * delay, self.RETRY_SECONDS[1])
+            self.reconnects.inc()
+
+    def _apply_snapshot(self, body):
+        products = [loads(line) for line in body.splitlines() if line]
+        self.store.apply([("put", product) for product in products], replace=True)
+        return len(products)
+
+    async def _load_snapshot(self):
+        requested_at = time.monotonic()
+        response = await self._client.fetch(
+            f"{self.primary}/api/products/export", request_timeout=self.SNAPSHOT_SECONDS
+        )
+        version = int(response.headers["X-Changes-Version"])
+        count = await asyncio.get_running_loop().run_in_executor(None, self._apply_snapshot, response.body)
+        self.version = self.primary_version = version
+        self._synced_at = requested_at
+        self._needs_snapshot = False
+        self.snapshots.inc()
+        logger.info("Loaded %d products from %s at version %d", count, self.primary, version)
+
+    async def _tail(self):
+        events = asyncio.Queue()
+        parser = EventStreamParser(lambda event, data: events.put_nowait((event, data)))
+        stream = asyncio.ensure_future(self._client.fetch(HTTPRequest(
+            f"{self.primary}/api/products/changes/stream?since={self.version}&heartbeat={self.heartbeat}",
+            headers={"Accept": "text/event-stream"}, streaming_callback=parser.feed,
+            request_timeout=self.STREAM_SECONDS,
+        )))
+
+        def stream_done(future):
+            if not future.cancelled():
+                future.exception()  # retrieved, so an abandoned stream's error isn't logged as unhandled
+            events.put_nowait(None)
+
+        stream.add_done_callback(stream_done)
+        try:
+            while True:
+                item = await events.get()
+                if item is None:
+                    break
+                await self._handle_event(*item)
+        finally:
+            self.connected = False
+        stream.result()  # raises if the stream failed
+
+    async def _handle_event(self, event, data):
+        received_at = time.monotonic()
+        if event == "reset":
+            raise _Reset()
+        if event not in ("changes", "heartbeat"):
+            return
+        data = loads(data)
+        if event == "changes":
+            operations = [
+                ("put", change["product"]) if change["op"] == "put" else ("delete", change["id"])
+                for change in data["changes"]
+            ]
+            await asyncio.get_running_loop().run_in_executor(None, self.store.apply, operations)
+            self.version = data["version"]
+        self.connected = True
+        self.primary_version = max(self.primary_version or 0, data["version"])
+        if self.version >= self.primary_version:
+            self._synced_at = received_at
+
+
+class ReplicaMatcher(Matcher):
+    """
+    Tornado routing rule matching the requests a follower doesn't serve
+    from its own copy of the catalog (see `Follower.intercepts`).
+    """
+
+    def __init__(self, follower):
+        self.follower = follower
+
+    def match(self, request):
+        return {} if self.follower.intercepts(request) else None
@@ -1,54 +1,301 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, redirect, send_file
 from app.services import (
     fetch_all_products,
+    fetch_all_products_response,
+    query_products,
+    search_products,
+    product_stats_response,
+    recompute_product_stats,
+    changes_version,
+    fetch_changes,
     find_product_by_id,
+    find_product_response,
     add_product,
     update_product,
-    delete_product
+    delete_product,
+    find_product_image,
+    add_products,
+    update_products,
+    delete_products,
+    adjust_product_quantity,
+    PreconditionFailed,
+    InsufficientStock
+)
+from app.schemas import NEW_PRODUCT, PRODUCT_CHANGES
+from app.utils import (
+    generate_error_response,
+    parse_product_query,
+    encode_cursor,
+    MAX_PAGE_SIZE,
+    read_bulk_items,
+    generate_batch_error_response,
+    accepts_gzip,
+    generate_ndjson,
+    generate_cached_response,
+    parse_if_match,
+    parse_adjustment
 )
-from app.utils import generate_error_response, validate_required_fields
 
 blueprint = Blueprint('api', __name__)
 
 @blueprint.route('/products', methods=['GET'])
 def list_all_items():
     """
-    Fetch all items from the products.
+    Fetch all items from the products, optionally filtered, sorted and paginated.
+    When a page has more results after it, the cursor for the next page is
+    returned in the X-Next-Cursor header. The unfiltered list is served from a
+    response cache with a strong ETag and honors If-None-Match. It also carries
+    the X-Changes-Version header, to pass as `since` to /products/changes.
     ---
+    parameters:
+      - name: category
+        in: query
+        schema:
+          type: string
+      - name: min_price
+        in: query
+        schema:
+          type: number
+      - name: max_price
+        in: query
+        schema:
+          type: number
+      - name: min_quantity
+        in: query
+        schema:
+          type: integer
+      - name: max_quantity
+        in: query
+        schema:
+          type: integer
+      - name: date_from
+        in: query
+        schema:
+          type: string
+      - name: date_to
+        in: query
+        schema:
+          type: string
+      - name: sort
+        in: query
+        description: id, price, quantity or date_added; prefix with "-" for descending order
+        schema:
+          type: string
+      - name: limit
+        in: query
+        schema:
+          type: integer
+      - name: cursor
+        in: query
+        description: The X-Next-Cursor value from the previous page
+        schema:
+          type: string
     responses:
       200:
         description: A list of all products
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                $ref: '#/definitions/Product'
+        headers:
+          X-Changes-Version:
+            description: The change feed version of the unfiltered list
+            schema:
+              type: integer
+      304:
+        description: Not modified; the If-None-Match header matches the current ETag
+    """
+    if not request.args:
+        version = changes_version()  # before the list, so no change is missed
+        response = generate_cached_response(*fetch_all_products_response())
+        response.headers["X-Changes-Version"] = str(version)
+        return response
+
+    query, error_message = parse_product_query(request.args)
+    if error_message:
+        return generate_error_response(error_message, 400)
+
+    page, next_entry = query_products(**query)
+    headers = {}
+    if next_entry is not None:
+        headers["X-Next-Cursor"] = encode_cursor(request.args.get("sort", "id"), next_entry)
+    return jsonify(page), 200, headers
+
+@blueprint.route('/products/export', methods=['GET'])
+def export_items():
+    """
+    Stream the catalog as NDJSON (one product per line).
+    Takes the same filter and sort parameters as the product listing. The output
+    is serialized from a snapshot taken when the request starts, in chunks, and
+    gzipped on the fly when the client accepts it.
+    The X-Changes-Version header gives the snapshot's version in the change
+    feed, which read replicas tail from.
+    ---
+    parameters:
+      - name: category
+        in: query
+        schema:
+          type: string
+      - name: sort
+        in: query
+        schema:
+          type: string
+    responses:
+      200:
+        description: Products as newline-delimited JSON
+        content:
+          application/x-ndjson:
+            schema:
+              type: string
+      400:
+        description: Invalid parameters
+    """
+    query, error_message = parse_product_query(request.args)
+    if error_message:
+        return generate_error_response(error_message, 400)
+
+    version = changes_version()  # before the snapshot, like the full listing
+    snapshot = query_products(**query)[0] if request.args else fetch_all_products()
+    compress = accepts_gzip(request.headers.get("Accept-Encoding"))
+    response = Response(generate_ndjson(snapshot, compress=compress), mimetype="application/x-ndjson")
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["X-Changes-Version"] = str(version)
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+@blueprint.route('/products/search', methods=['GET'])
+def search_items():
+    """
+    Search items by name, description and category.
+    The last word of the query also matches as a prefix, for type-ahead.
+    ---
+    parameters:
+      - name: q
+        in: query
+        required: true
+        schema:
+          type: string
+      - name: limit
+        in: query
+        schema:
+          type: integer
+    responses:
+      200:
+        description: Matching products, best match first
         content:
           application/json:
             schema:
               type: array
               items:
                 type: object
-                properties:
-                  id:
-                    type: integer
-                  name:
-                    type: string
-                  price:
-                    type: number
-                  quantity:
-                    type: integer
-                  description:
-                    type: string
-                  category:
-                    type: string
-                  date_added:
-                    type: string
-                  image_url:
-                    type: string
-    """
-    all_items = fetch_all_products()
-    return jsonify(all_items), 200
+      400:
+        description: Missing or invalid query
+    """
+    text = request.args.get("q", "").strip()
+    if not text:
+        return generate_error_response("Missing required parameter: q", 400)
+
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return generate_error_response("Invalid value for 'limit'.", 400)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return generate_error_response(f"'limit' must be between 1 and {MAX_PAGE_SIZE}.", 400)
+
+    return jsonify(search_products(text, limit)), 200
+
+@blueprint.route('/products/stats', methods=['GET'])
+def get_item_stats():
+    """
+    Catalog statistics: product count, total quantity, inventory value
+    (price times quantity) and price min/max/mean/percentiles.
+    They are kept up to date on every write, so this doesn't scan the catalog.
+    The response carries a strong ETag and honors If-None-Match.
+    ---
+    parameters:
+      - name: group_by
+        in: query
+        description: Set to "category" to get the statistics of each category
+        schema:
+          type: string
+          enum: [category]
+      - name: recompute
+        in: query
+        description: Set to "true" to recompute the statistics with a full scan instead, to verify them
+        schema:
+          type: boolean
+    responses:
+      200:
+        description: The statistics, or with group_by, {"group_by", "groups"} with the statistics of each group
+        content:
+          application/json:
+            schema:
+              type: object
+      304:
+        description: Not modified; the If-None-Match header matches the current ETag
+      400:
+        description: Invalid group_by
+    """
+    group_by = request.args.get("group_by")
+    try:
+        if request.args.get("recompute") == "true":
+            return jsonify(recompute_product_stats(group_by)), 200
+        body, etag = product_stats_response(group_by)
+    except ValueError as error:
+        return generate_error_response(str(error), 400)
+    return generate_cached_response(body, etag)
+
+@blueprint.route('/products/changes', methods=['GET'])
+def get_item_changes():
+    """
+    The products added, updated and deleted since a version of the catalog.
+    Load the full list once, then pass its X-Changes-Version header as `since`,
+    and each response's `version` as the next `since`. Only the latest change
+    of each product is returned. 410 means the changes are no longer kept and
+    the full list has to be loaded again. The same changes are pushed as
+    server-sent events by /products/changes/stream on the Tornado server.
+    ---
+    parameters:
+      - name: since
+        in: query
+        description: The last version the client has seen; without it only the current version is returned
+        schema:
+          type: integer
+    responses:
+      200:
+        description: >
+          {"version", "changes"}, where each change is {"version", "op": "put", "product"}
+          or {"version", "op": "delete", "id"}
+        content:
+          application/json:
+            schema:
+              type: object
+      400:
+        description: Invalid since
+      410:
+        description: The changes since that version are no longer available; reload the product list
+    """
+    since = request.args.get("since")
+    if since is None:
+        return jsonify({"version": changes_version(), "changes": []}), 200
+    try:
+        since = int(since)
+    except ValueError:
+        return generate_error_response("since must be an integer.", 400)
+    result = fetch_changes(since)
+    if result is None:
+        return generate_error_response("Changes since this version are no longer available, reload the products.", 410)
+    changes, version = result
+    return jsonify({"version": version, "changes": changes}), 200
 
 @blueprint.route('/products/<int:item_id>', methods=['GET'])
 def get_single_item(item_id):
     """
     Fetch a single item by its ID.
+    The response is cached, carries a strong ETag and honors If-None-Match.
     ---
     parameters:
       - name: item_id
@@ -62,30 +309,15 @@ def get_single_item(item_id):
         content:
           application/json:
             schema:
-              type: object
-              properties:
-                id:
-                  type: integer
-                name:
-                  type: string
-                price:
-                  type: number
-                quantity:
-                  type: integer
-                description:
-                  type: string
-                category:
-                  type: string
-                date_added:
-                  type: string
-                image_url:
-                  type: string
+              $ref: '#/definitions/Product'
+      304:
+        description: Not modified; the If-None-Match header matches the current ETag
       404:
         description: Product not found
     """
-    item = find_product_by_id(item_id)
-    if item:
-        return jsonify(item), 200
+    cached = find_product_response(item_id)
+    if cached:
+        return generate_cached_response(*cached)
     return generate_error_response("Item not found", 404)
 
 @blueprint.route('/products', methods=['POST'])
@@ -98,64 +330,248 @@ def create_new_item():
       content:
         application/json:
           schema:
-            type: object
-            properties:
-              name:
-                type: string
-              price:
-                type: number
-              quantity:
-                type: integer
-              description:
-                type: string
-              category:
-                type: string
-              date_added:
-                type: string
-              image_url:
-                type: string
+            $ref: '#/definitions/NewProduct'
     responses:
       201:
         description: Product created successfully
         content:
           application/json:
             schema:
+              $ref: '#/definitions/Product'
+      400:
+        description: Invalid data
+    """
+    item_details = request.get_json(silent=True)
+
+    error_message = NEW_PRODUCT.validate(item_details)
+    if error_message:
+        return generate_error_response(error_message, 400)
+
+    try:
+        new_item = add_product(item_details)
+    except ValueError as error:
+        return generate_error_response(str(error), 400)
+    return jsonify(new_item), 201
+
+@blueprint.route('/products/bulk', methods=['POST'])
+def create_items_in_bulk():
+    """
+    Add many items in one request.
+    Send a JSON array of products, or NDJSON (Content-Type: application/x-ndjson)
+    with one product per line. All items are validated first; if any is invalid
+    nothing is added.
+    ---
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            items:
+              type: object
+    responses:
+      201:
+        description: Per-item results, in request order
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                results:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                      id:
+                        type: integer
+                      status:
+                        type: integer
+      400:
+        description: Invalid batch
+    """
+    items, error_message = read_bulk_items(request)
+    if error_message:
+        return generate_error_response(error_message, 400)
+
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append((index, "Item must be an object."))
+            continue
+        error_message = NEW_PRODUCT.validate(item)
+        if error_message:
+            errors.append((index, error_message))
+    if errors:
+        return generate_batch_error_response(errors)
+
+    try:
+        new_items = add_products(items)
+    except ValueError as error:
+        return generate_error_response(str(error), 400)
+    results = [{"index": index, "id": item["id"], "status": 201} for index, item in enumerate(new_items)]
+    return jsonify({"results": results}), 201
+
+@blueprint.route('/products/bulk', methods=['PATCH'])
+def update_items_in_bulk():
+    """
+    Update many items in one request.
+    Each item is an object with the "id" of the product and the fields to change.
+    All items are validated first; if any is invalid nothing is updated.
+    ---
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            items:
               type: object
               properties:
                 id:
                   type: integer
-                name:
-                  type: string
-                price:
-                  type: number
-                quantity:
-                  type: integer
-                description:
-                  type: string
-                category:
-                  type: string
-                date_added:
-                  type: string
-                image_url:
-                  type: string
+    responses:
+      200:
+        description: Per-item results (200 updated, 404 not found), in request order
       400:
-        description: Invalid data
+        description: Invalid batch
     """
-    item_details = request.json
+    items, error_message = read_bulk_items(request)
+    if error_message:
+        return generate_error_response(error_message, 400)
+
+    errors = []
+    updates = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            errors.append((index, "Item must be an object with an integer 'id'."))
+            continue
+        changes = {key: value for key, value in item.items() if key != "id"}
+        error_message = PRODUCT_CHANGES.validate(changes)
+        if error_message:
+            errors.append((index, error_message))
+            continue
+        updates.append((item["id"], changes))
+    if errors:
+        return generate_batch_error_response(errors)
+
+    try:
+        updated_items = update_products(updates)
+    except ValueError as error:
+        return generate_error_response(str(error), 400)
+    results = [
+        {"index": index, "id": item_id, "status": 200 if updated else 404}
+        for index, ((item_id, _), updated) in enumerate(zip(updates, updated_items))
+    ]
+    return jsonify({"results": results}), 200
 
-    required_keys = ["name", "price", "quantity", "description", "category", "date_added", "image_url"]
-    is_valid, error_message = validate_required_fields(item_details, required_keys)
-    if not is_valid:
+@blueprint.route('/products/bulk', methods=['DELETE'])
+def delete_items_in_bulk():
+    """
+    Delete many items in one request.
+    Send an array of product IDs (or of objects with an "id").
+    ---
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            items:
+              type: integer
+    responses:
+      200:
+        description: Per-item results (200 deleted, 404 not found), in request order
+      400:
+        description: Invalid batch
+    """
+    items, error_message = read_bulk_items(request)
+    if error_message:
         return generate_error_response(error_message, 400)
 
+    errors = []
+    item_ids = []
+    for index, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else item
+        if not isinstance(item_id, int) or isinstance(item_id, bool):
+            errors.append((index, "Item must be an integer ID or an object with an integer 'id'."))
+            continue
+        item_ids.append(item_id)
+    if errors:
+        return generate_batch_error_response(errors)
 
-    new_item = add_product(item_details)
-    return jsonify(new_item), 201
+    deleted = delete_products(item_ids)
+    results = [
+        {"index": index, "id": item_id, "status": 200 if was_deleted else 404}
+        for index, (item_id, was_deleted) in enumerate(zip(item_ids, deleted))
+    ]
+    return jsonify({"results": results}), 200
+
+@blueprint.route('/products/<int:item_id>/image', methods=['GET'])
+def get_item_image(item_id):
+    """
+    Stream the image of an item.
+    Supports conditional requests (ETag / If-None-Match) and byte ranges.
+    ---
+    parameters:
+      - name: item_id
+        in: path
+        required: true
+        schema:
+          type: integer
+      - name: v
+        in: query
+        description: Image version from the product's image_url. Versioned URLs are cached for a year.
+        schema:
+          type: string
+    responses:
+      200:
+        description: The image bytes
+      206:
+        description: Part of the image bytes, for a Range request
+      302:
+        description: The product links to an external image
+      304:
+        description: Not modified
+      404:
+        description: Product or image not found
+    """
+    image = find_product_image(item_id)
+    if image is None:
+        item = find_product_by_id(item_id)
+        if item is None:
+            return generate_error_response("Item not found", 404)
+        if str(item.get("image_url", "")).startswith(("http://", "https://")):
+            return redirect(item["image_url"])
+        return generate_error_response("Image not found", 404)
+
+    path, mimetype, key = image
+    # A versioned URL always points at the same bytes, so it can be cached for good
+    versioned = request.args.get("v") == key
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        # Only images are shown inline, anything else is downloaded
+        as_attachment=mimetype == "application/octet-stream",
+        etag=key,
+        conditional=True,
+        max_age=31536000 if versioned else 60,
+    )
+    # Never let a browser sniff the bytes into something it would run
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    response.headers["Content-Security-Policy"] = "default-src 'none'; sandbox"
+    response.cache_control.public = True
+    if versioned:
+        response.cache_control.immutable = True
+    return response
 
 @blueprint.route('/products/<int:item_id>', methods=['PUT'])
 def update_item(item_id):
     """
     Update an existing item in the inventory.
+    Send If-Match with the ETag from a GET to update only if nobody changed
+    the item in the meantime.
     ---
     parameters:
       - name: item_id
@@ -163,58 +579,97 @@ def update_item(item_id):
         required: true
         schema:
           type: integer
+      - name: If-Match
+        in: header
+        required: false
+        schema:
+          type: string
     requestBody:
       required: true
       content:
         application/json:
           schema:
-            type: object
-            properties:
-              name:
-                type: string
-              price:
-                type: number
-              quantity:
-                type: integer
-              description:
-                type: string
-              category:
-                type: string
-              date_added:
-                type: string
-              image_url:
-                type: string
+            $ref: '#/definitions/ProductChanges'
     responses:
       200:
         description: Product updated successfully
         content:
           application/json:
             schema:
-              type: object
-              properties:
-                name:
-                  type: string
-                price:
-                  type: number
-                quantity:
-                  type: integer
-                description:
-                  type: string
-                category:
-                  type: string
-                date_added:
-                  type: string
-                image_url:
-                  type: string
+              $ref: '#/definitions/Product'
+      400:
+        description: Invalid data
+      404:
+        description: Product not found
+      412:
+        description: The product changed since the If-Match ETag was read
+    """
+    updated_data = request.get_json(silent=True)
+    error_message = PRODUCT_CHANGES.validate(updated_data)
+    if error_message:
+        return generate_error_response(error_message, 400)
+
+    try:
+        updated_item = update_product(item_id, updated_data, parse_if_match(request.headers.get("If-Match")))
+    except ValueError as error:
+        return generate_error_response(str(error), 400)
+    except PreconditionFailed as error:
+        return generate_error_response(str(error), 412)
+    if updated_item:
+        return jsonify(updated_item), 200
+    return generate_error_response("Item not found", 404)
+
+@blueprint.route('/products/<int:item_id>/adjust', methods=['POST'])
+def adjust_item_quantity(item_id):
+    """
+    Atomically add to (or subtract from) an item's quantity.
+    Concurrent adjustments are all applied; none of them is lost.
+    ---
+    parameters:
+      - name: item_id
+        in: path
+        required: true
+        schema:
+          type: integer
+      - name: If-Match
+        in: header
+        required: false
+        schema:
+          type: string
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            $ref: '#/definitions/Adjustment'
+    responses:
+      200:
+        description: The updated product
+        content:
+          application/json:
+            schema:
+              $ref: '#/definitions/Product'
+      400:
+        description: Invalid adjustment, or the quantity would go above 9007199254740991
       404:
         description: Product not found
+      409:
+        description: Not enough stock
+      412:
+        description: The product changed since the If-Match ETag was read
     """
-    updated_data = request.json
-    allowed_keys = ["name", "price", "quantity", "description", "category", "date_added", "image_url"]
-    if any(key not in allowed_keys for key in updated_data.keys()):
-        return generate_error_response("Invalid field(s) in request.", 400)
+    adjustment, error_message = parse_adjustment(request.get_json(silent=True))
+    if error_message:
+        return generate_error_response(error_message, 400)
 
-    updated_item = update_product(item_id, updated_data)
+    try:
+        updated_item = adjust_product_quantity(item_id, *adjustment, parse_if_match(request.headers.get("If-Match")))
+    except ValueError as error:
+        return generate_error_response(str(error), 400)
+    except InsufficientStock as error:
+        return generate_error_response(str(error), 409)
+    except PreconditionFailed as error:
+        return generate_error_response(str(error), 412)
     if updated_item:
         return jsonify(updated_item), 200
     return generate_error_response("Item not found", 404)
@@ -236,5 +691,6 @@ def delete_item(item_id):
       404:
         description: Product not found
     """
-    delete_product(item_id)
+    if not delete_product(item_id):
+        return generate_error_response("Item not found", 404)
     return jsonify({"message": "Item deleted successfully"}), 200
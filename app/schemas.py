@@ -0,0 +1,237 @@
+"""
+Field schemas for request bodies, compiled into validators.
+
+Each schema lists its fields with JSON Schema style constraints (type,
+minimum/maximum, minLength/maxLength, format). When a Schema is created,
+every field is compiled once into a small checking function, so validating a
+request is one dict lookup and one call per field. The same schemas generate
+the Swagger definitions the route docstrings refer to (see
+`swagger_definitions`), so the docs and the validation can't drift apart.
+"""
+import math
+import re
+from datetime import date
+
+# Integers beyond this can't be represented exactly by JavaScript clients
+MAX_SAFE_INTEGER = 2**53 - 1
+# Far above any real price. It also keeps huge ints, which can't be compared
+# with floats or summed without overflowing, out of the store.
+MAX_PRICE = 10**12
+
+# Sent for a body that isn't a JSON object, malformed JSON included
+NOT_AN_OBJECT = "Request body must be a JSON object."
+
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+_PYTHON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+}
+_TYPE_NAMES = {"string": "a string", "integer": "an integer", "number": "a number", "boolean": "true or false"}
+
+
+def _is_date(value):
+    if not _DATE_PATTERN.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+class Field:
+    """
+    One field of a schema.
+
+    Args:
+        type (str): "string", "integer", "number" or "boolean".
+        minimum: Smallest allowed number.
+        maximum: Largest allowed number.
+        min_length (int): Shortest allowed string.
+        max_length (int): Longest allowed string.
+        format (str): "date" for YYYY-MM-DD strings.
+        description (str): Shown in the API docs.
+    """
+
+    def __init__(self, type, minimum=None, maximum=None, min_length=None, max_length=None, format=None,
+                 description=None):
+        self.type = type
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_length = min_length
+        self.max_length = max_length
+        self.format = format
+        self.description = description
+
+    def compile(self, name):
+        """
+        Returns:
+            callable: check(value) -> an error message, or None if the value is valid.
+        """
+        types = _PYTHON_TYPES[self.type]
+        type_error = f"'{name}' must be {_TYPE_NAMES[self.type]}."
+
+        # (test, message) pairs, run in order once the type is right
+        tests = []
+        if self.type == "number":
+            # Only floats can be inf or NaN; isfinite() would overflow on huge ints
+            tests.append((lambda value: type(value) is int or math.isfinite(value), type_error))
+        if self.minimum is not None:
+            minimum = self.minimum
+            tests.append((lambda value: value >= minimum, f"'{name}' must be at least {minimum}."))
+        if self.maximum is not None:
+            maximum = self.maximum
+            tests.append((lambda value: value <= maximum, f"'{name}' must be at most {maximum}."))
+        if self.min_length is not None:
+            min_length = self.min_length
+            tests.append((
+                lambda value: len(value) >= min_length,
+                f"'{name}' can't be empty." if min_length == 1 else f"'{name}' must be at least {min_length} characters.",
+            ))
+        if self.max_length is not None:
+            max_length = self.max_length
+            tests.append((lambda value: len(value) <= max_length, f"'{name}' must be at most {max_length} characters."))
+        if self.format == "date":
+            tests.append((_is_date, f"'{name}' must be a date formatted as YYYY-MM-DD."))
+
+        # `type() in` rather than isinstance, so true/false don't pass as numbers
+        if not tests:
+            def check(value):
+                if type(value) not in types:
+                    return type_error
+                return None
+        elif len(tests) == 1:
+            (test, message), = tests
+
+            def check(value):
+                if type(value) not in types:
+                    return type_error
+                if not test(value):
+                    return message
+                return None
+        else:
+            def check(value):
+                if type(value) not in types:
+                    return type_error
+                for test, message in tests:
+                    if not test(value):
+                        return message
+                return None
+        return check
+
+    def swagger(self):
+        """
+        Returns:
+            dict: The field as a Swagger property.
+        """
+        keywords = {
+            "type": self.type,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "minLength": self.min_length,
+            "maxLength": self.max_length,
+            "format": self.format,
+            "description": self.description,
+        }
+        return {keyword: value for keyword, value in keywords.items() if value is not None}
+
+
+class Schema:
+    """
+    The fields a JSON object may have, compiled into a validator.
+
+    Args:
+        fields (dict): Field name -> Field.
+        required (iterable): Names of the fields that must be present.
+    """
+
+    def __init__(self, fields, required=()):
+        self.fields = dict(fields)
+        self.required = [name for name in self.fields if name in set(required)]
+        self._required = frozenset(self.required)
+        self._checks = {name: field.compile(name) for name, field in self.fields.items()}
+
+    def validate(self, data):
+        """
+        Check a decoded JSON body against the schema. Unknown fields are rejected.
+
+        Args:
+            data: The decoded body.
+
+        Returns:
+            str: An error message, or None if the body is valid.
+        """
+        if type(data) is not dict:
+            return NOT_AN_OBJECT
+        checks = self._checks
+        if not checks.keys() >= data.keys():
+            return "Invalid field(s) in request."
+        if not self._required <= data.keys():
+            missing = [name for name in self.required if name not in data]
+            return f"Missing required fields: {', '.join(missing)}"
+        for name, value in data.items():
+            error = checks[name](value)
+            if error is not None:
+                return error
+        return None
+
+    def swagger(self):
+        """
+        Returns:
+            dict: The schema as a Swagger object definition.
+        """
+        definition = {"type": "object", "properties": {name: field.swagger() for name, field in self.fields.items()}}
+        if self.required:
+            definition["required"] = list(self.required)
+        return definition
+
+
+# Fields a client may send when creating or updating a product
+PRODUCT_FIELDS = {
+    "name": Field("string", min_length=1, max_length=200),
+    "price": Field("number", minimum=0, maximum=MAX_PRICE),
+    "quantity": Field("integer", minimum=0, maximum=MAX_SAFE_INTEGER),
+    "description": Field("string", max_length=10000),
+    "category": Field("string", min_length=1, max_length=100),
+    "date_added": Field("string", format="date"),
+    "image_url": Field("string", description="An image URL, or an inline data: URL to store the image"),
+}
+
+NEW_PRODUCT = Schema(PRODUCT_FIELDS, required=PRODUCT_FIELDS)
+PRODUCT_CHANGES = Schema(PRODUCT_FIELDS)
+# What the API returns. Only used for the docs.
+PRODUCT = Schema(
+    {
+        "id": Field("integer"),
+        **PRODUCT_FIELDS,
+        "version": Field("integer", description="Goes up by one with every update"),
+    },
+    required=["id", *PRODUCT_FIELDS, "version"],
+)
+ADJUSTMENT = Schema(
+    {
+        "delta": Field("integer", minimum=-MAX_SAFE_INTEGER, maximum=MAX_SAFE_INTEGER,
+                       description="How much to add to the quantity; negative to take stock away"),
+        # Never below the quantity's own minimum, so /adjust can't store a quantity PUT would reject
+        "floor": Field("integer", minimum=0, maximum=MAX_SAFE_INTEGER,
+                       description="The lowest quantity allowed afterwards (default 0)"),
+    },
+    required=["delta"],
+)
+
+
+def swagger_definitions():
+    """
+    Returns:
+        dict: Swagger definitions for the schemas, referenced from the route
+            docstrings as '#/definitions/<name>'.
+    """
+    return {
+        "Product": PRODUCT.swagger(),
+        "NewProduct": NEW_PRODUCT.swagger(),
+        "ProductChanges": PRODUCT_CHANGES.swagger(),
+        "Adjustment": ADJUSTMENT.swagger(),
+    }
@@ -0,0 +1,214 @@
+"""
+Full-text search over product names, descriptions and categories.
+
+`SearchIndex` is an inverted index: every normalized token maps to the ids of
+the products that contain it. It follows the same add/remove/build interface
+as the indexes in app/indexes.py, so the store keeps it up to date on every
+write.
+
+Postings are grouped into tiers by weight. A query walks the tiers of its
+most selective token from the highest score down. It stops once no
+remaining tier can beat the current top results, or once it has scored
+MAX_CANDIDATES products. Common words therefore don't force a scan of every
+product that contains them.
+"""
+import heapq
+import math
+import re
+import unicodedata
+
+from .indexes import SortedList
+
+# How much a token counts towards the score depending on where it appears
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+
+# A one or two letter prefix can match a big part of the vocabulary. Only the
+# first this many completions are expanded.
+MAX_PREFIX_EXPANSIONS = 64
+
+# Upper limit on how many products one query scores. Candidates are visited
+# best tier first, so when very common words hit the limit the results are
+# still the best of the highest weighted matches.
+MAX_CANDIDATES = 1000
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Split text into lowercase tokens with accents removed, e.g. "Café Chairs" -> ["cafe", "chairs"].
+    """
+    if not isinstance(text, str):
+        return []
+    if text.isascii():
+        # Nothing to decompose or strip, and casefold() is lower() for ASCII
+        return TOKEN_PATTERN.findall(text.lower())
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return TOKEN_PATTERN.findall(stripped)
+
+
+class SearchIndex:
+    """
+    Inverted index with prefix matching on the last query token (for type-ahead).
+
+    Products are ranked by the sum of idf * field weight over the query
+    tokens, with ties going to the lower id. All tokens before the last one
+    must match exactly.
+    """
+
+    def __init__(self, fields=FIELD_WEIGHTS):
+        self.fields = dict(fields)
+        # token -> {weight: ids with that weight}
+        self._tiers = {}
+        # token -> number of products containing it
+        self._counts = {}
+        # id -> {token: weight}, used for scoring and removal
+        self._documents = {}
+        # Sorted vocabulary, used to find every token that starts with a prefix
+        self._vocabulary = SortedList()
+
+    def _weights(self, record):
+        weights = {}
+        for field, field_weight in self.fields.items():
+            for token in tokenize(record.get(field)):
+                weights[token] = weights.get(token, 0.0) + field_weight
+        return weights
+
+    def build(self, records):
+        grouped = {}
+        self._documents = {}
+        for record in records:
+            weights = self._documents[record["id"]] = self._weights(record)
+            for token, weight in weights.items():
+                grouped.setdefault(token, {}).setdefault(weight, []).append(record["id"])
+
+        self._tiers = {
+            token: {weight: SortedList(ids) for weight, ids in tiers.items()}
+            for token, tiers in grouped.items()
+        }
+        self._counts = {token: sum(map(len, tiers.values())) for token, tiers in grouped.items()}
+        self._vocabulary.build(self._tiers)
+
+    def add(self, record):
+        item_id = record["id"]
+        weights = self._documents[item_id] = self._weights(record)
+        for token, weight in weights.items():
+            tiers = self._tiers.get(token)
+            if tiers is None:
+                tiers = self._tiers[token] = {}
+                self._counts[token] = 0
+                self._vocabulary.add(token)
+            tiers.setdefault(weight, SortedList()).add(item_id)
+            self._counts[token] += 1
+
+    def remove(self, record):
+        weights = self._documents.pop(record["id"], None)
+        if weights is None:
+            return
+        for token, weight in weights.items():
+            tiers = self._tiers[token]
+            tiers[weight].remove(record["id"])
+            if not tiers[weight]:
+                del tiers[weight]
+            self._counts[token] -= 1
+            if not tiers:
+                del self._tiers[token]
+                del self._counts[token]
+                self._vocabulary.remove(token)
+
+    def _idf(self, token):
+        return math.log(1 + len(self._documents) / self._counts[token])
+
+    def _completions(self, prefix):
+        completions = []
+        for token in self._vocabulary.iter_from(prefix):
+            if not token.startswith(prefix) or len(completions) == MAX_PREFIX_EXPANSIONS:
+                break
+            completions.append(token)
+        return completions
+
+    def _groups(self, tokens, idfs):
+        # (best possible score, ids) for every tier of the given tokens, best first
+        groups = [
+            (idfs[token] * weight, ids)
+            for token in tokens
+            for weight, ids in self._tiers[token].items()
+        ]
+        groups.sort(key=lambda group: group[0], reverse=True)
+        return groups
+
+    def search(self, text, limit=20):
+        """
+        Find the products that best match `text`.
+
+        Args:
+            text (str): The search query. Its last token is matched as a prefix.
+            limit (int): Maximum number of ids to return.
+
+        Returns:
+            list: Product ids, best match first.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        *exact_tokens, prefix = tokens
+        exact_tokens = list(dict.fromkeys(exact_tokens))
+        if any(token not in self._tiers for token in exact_tokens):
+            return []
+        completions = self._completions(prefix)
+        if not completions:
+            return []
+
+        idfs = {token: self._idf(token) for token in exact_tokens + completions}
+        best = {token: idfs[token] * max(self._tiers[token]) for token in idfs}
+        best_prefix = max(best[token] for token in completions)
+        prefix_idfs = {token: idfs[token] for token in completions}
+
+        # Drive the search from whichever is most selective: the rarest exact
+        # token or the prefix completions taken together
+        driver = min(exact_tokens, key=self._counts.get, default=None)
+        prefix_count = sum(self._counts[token] for token in completions)
+        if driver is not None and self._counts[driver] < prefix_count:
+            groups = self._groups([driver], idfs)
+            # Everything the other tokens can add on top of the driver's own score
+            headroom = best_prefix + sum(best[token] for token in exact_tokens if token != driver)
+        else:
+            groups = self._groups(completions, idfs)
+            headroom = sum(best[token] for token in exact_tokens)
+
+        top = []  # min-heap of (score, -id)
+        seen = set()
+        for bound, ids in groups:
+            bound += headroom
+            # Compare (score, -id) pairs: a later group can still tie the worst
+            # score with a lower id, and ties go to the lower id. Tiers are
+            # sorted, so ids[0] is the best this group can do on a tie.
+            if len(seen) == MAX_CANDIDATES or (len(top) == limit and top[0] >= (bound, -ids[0])):
+                break
+            for item_id in ids:
+                if len(seen) == MAX_CANDIDATES or (len(top) == limit and top[0] >= (bound, -item_id)):
+                    break
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+
+                weights = self._documents[item_id]
+                score = 0.0
+                for token in exact_tokens:
+                    weight = weights.get(token)
+                    if weight is None:
+                        break
+                    score += idfs[token] * weight
+                else:
+                    matched = weights.keys() & prefix_idfs.keys()
+                    if not matched:
+                        continue
+                    prefix_score = max(prefix_idfs[token] * weights[token] for token in matched)
+                    entry = (score + prefix_score, -item_id)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+
+        return [-negative_id for _, negative_id in sorted(top, reverse=True)]
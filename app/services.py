@@ -1,8 +1,153 @@
-from threading import Lock
-from .models import products
+import os
+import re
+import time
 
-# Initialize a global lock
-lock = Lock()
+from .blobs import BlobStore, decode_data_url
+from .cache import ResponseCache, make_etag
+from .changes import ChangeLog
+from .compression import etag_variants
+from .metrics import Counter, Gauge, InstrumentedLock
+from .indexes import HashIndex, SortedIndex, numeric_key, text_key
+from .models import load_products
+from .persistence import create_backend
+from .schemas import PRODUCT_FIELDS
+from .search import SearchIndex
+from .stats import StatsIndex, compute_stats
+from .store import ProductStore
+from .utils import serialize_json
+
+# Image bytes are kept out of the product records. Inline data: URLs are
+# moved into the blob store and replaced with a link to the image endpoint.
+BLOB_DIR = os.environ.get("BLOB_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "blobs"))
+IMAGE_URL = "/api/products/{item_id}/image?v={key}"
+IMAGE_URL_PATTERN = re.compile(r"^/api/products/\d+/image\?v=(?P<key>[^&]+)$")
+blobs = BlobStore(BLOB_DIR)
+
+def save_image(product):
+    """
+    Move an inline `data:` image out of a product and into the blob store.
+
+    Args:
+        product (dict): Product details, possibly with an "image_url" data URL.
+
+    Returns:
+        str: The blob key, or None if the product has no inline image.
+
+    Raises:
+        ValueError: If the inline image data can't be decoded, or isn't a
+            supported image type.
+    """
+    decoded = decode_data_url(product.get("image_url"))
+    if decoded is None:
+        return None
+    data, mimetype = decoded
+    return blobs.put(data, mimetype)
+
+def _with_blob_image(product):
+    key = save_image(product)
+    if key is None:
+        return product
+    return {**product, "image_url": IMAGE_URL.format(item_id=product["id"], key=key)}
+
+class PreconditionFailed(Exception):
+    """
+    Raised when an If-Match condition doesn't hold: the product changed since
+    the client last read it.
+    """
+
+
+class InsufficientStock(Exception):
+    """
+    Raised when a quantity adjustment would take stock below its floor.
+    """
+
+    def __init__(self, quantity, delta, floor):
+        super().__init__(f"Adjusting the quantity {quantity} by {delta} would leave less than {floor}.")
+        self.quantity = quantity
+        self.delta = delta
+        self.floor = floor
+
+
+def _check_if_match(current, if_match):
+    # ETags are compared strongly against the current serialized product. The
+    # ETag of a compressed response ("<tag>-br") names the same product.
+    if if_match is None or "*" in if_match:
+        return
+    if etag_variants(make_etag(serialize_json(current))).isdisjoint(if_match):
+        raise PreconditionFailed("The product has been modified since it was read.")
+
+# Fields the catalog statistics can be grouped by
+STATS_GROUP_BY = ["category"]
+
+def make_indexes():
+    """
+    Returns:
+        dict: Fresh secondary indexes for the product store, keyed by name.
+    """
+    return {
+        "category": HashIndex("category"),
+        # Columns let range filters on price and quantity be checked quickly
+        # while a scan walks another index
+        "price": SortedIndex("price", numeric_key, column=True),
+        "quantity": SortedIndex("quantity", numeric_key, column=True),
+        "date_added": SortedIndex("date_added", text_key),
+        "search": SearchIndex(),
+        # Running totals and sorted prices for product_stats
+        "stats": StatsIndex(group_by=STATS_GROUP_BY),
+    }
+
+# Where the catalog is persisted: "memory" (lost on restart), "wal" or "sqlite".
+# The seed products (see models.py) are only read when the backend is empty.
+STORE_BACKEND = os.environ.get("PRODUCT_STORE_BACKEND", "memory")
+STORE_PATH = os.environ.get("PRODUCT_STORE_PATH", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data",
+    "products.sqlite3" if STORE_BACKEND == "sqlite" else "wal",
+))
+
+def _seed_products():
+    # A generator, so the seed file is never opened if the backend already has a catalog
+    for product in load_products():
+        yield _with_blob_image(product)
+
+# All products live in an id-indexed store. Its reader/writer lock replaces
+# the old global Lock, so reads no longer block each other.
+# The secondary indexes back the filtered and sorted listing in query_products,
+# and the inverted index backs search_products.
+store = ProductStore(
+    _seed_products(),
+    indexes=make_indexes(),
+    backend=create_backend(STORE_BACKEND, STORE_PATH),
+)
+# Report how long requests wait for the store's lock and how long they hold it
+store.lock = InstrumentedLock(store.lock, "store")
+lock = store.lock
+
+# Serialized GET responses, reused until a write changes the data behind them
+RESPONSE_CACHE_BYTES = int(os.environ.get("RESPONSE_CACHE_BYTES", 64 * 1024 * 1024))
+response_cache = ResponseCache(RESPONSE_CACHE_BYTES)
+
+# Recent writes, so clients can fetch what changed instead of the whole catalog.
+# Versions start from the clock, so they keep going up across restarts.
+CHANGE_LOG_SIZE = int(os.environ.get("CHANGE_LOG_SIZE", 10000))
+change_log = ChangeLog(CHANGE_LOG_SIZE, base=time.time_ns() // 1000)
+store.add_listener(change_log.record)
+
+Gauge("store_products", "Products in the store.", function=lambda: len(store))
+Gauge("store_version", "Writes applied to the store since startup.", function=lambda: store.version)
+Gauge("response_cache_bytes", "Size of the cached response bodies.", function=lambda: response_cache.size)
+Counter("response_cache_hits_total", "Response cache hits.", function=lambda: response_cache.hits)
+Counter("response_cache_misses_total", "Response cache misses.", function=lambda: response_cache.misses)
+
+def _cached_response(key, version, load):
+    # `version` must be read before `load` runs: if a write lands in between,
+    # newer data gets the older version and the next lookup simply misses
+    cached = response_cache.get(key, version)
+    if cached is not None:
+        return cached
+    data = load()
+    if data is None:
+        return None
+    return response_cache.put(key, version, serialize_json(data))
 
 def fetch_all_products():
     """
@@ -11,8 +156,115 @@ def fetch_all_products():
     Returns:
         list: A list containing all products.
     """
-    with lock:
-        return products[:]  # Return a copy of the product list
+    return store.all()  # The store hands back a snapshot copy of the list
+
+def fetch_all_products_response():
+    """
+    The full product list as a serialized JSON response body, from the
+    response cache when nothing has changed since it was built.
+
+    Returns:
+        tuple:
+            - bytes: The JSON body.
+            - str: Its ETag.
+    """
+    return _cached_response("all", store.version, fetch_all_products)
+
+def changes_version():
+    """
+    The version of the change feed. Read it before loading the catalog: a
+    client that then asks for the changes since this version gets every
+    write its copy might have missed.
+
+    Returns:
+        int: The current change feed version.
+    """
+    return change_log.version
+
+def fetch_changes(since):
+    """
+    The product changes made after a change feed version, with only the
+    latest change of each product.
+
+    Args:
+        since (int): The last version the client has seen.
+
+    Returns:
+        tuple: (list of changes, the current version), or None if the
+            changes are no longer kept (or the version is from another run
+            of the server) and the client must reload the catalog.
+    """
+    return change_log.since(since)
+
+def query_products(equals=None, ranges=None, sort="id", descending=False, after=None, limit=None):
+    """
+    Fetch one page of products matching the given filters, using the store's indexes.
+
+    Args:
+        equals (dict): Exact-match filters, e.g. {"category": "Electronics"}.
+        ranges (dict): Inclusive (low, high) filters, e.g. {"price": (10, None)}.
+        sort (str): Field to sort by ("id", "price", "quantity" or "date_added").
+        descending (bool): Sort from the largest value down.
+        after (tuple): Cursor entry returned with the previous page.
+        limit (int): Page size, or None for every match.
+
+    Returns:
+        tuple:
+            - list: The products on this page.
+            - tuple: The cursor entry for the next page, or None if this is the last one.
+    """
+    return store.query(equals, ranges, sort, descending, after, limit)
+
+def search_products(text, limit=20):
+    """
+    Full-text search over product names, descriptions and categories.
+
+    Args:
+        text (str): The search query. The last word also matches as a prefix.
+        limit (int): Maximum number of products to return.
+
+    Returns:
+        list: The matching products, best match first.
+    """
+    return store.search(text, limit)
+
+def product_stats_response(group_by=None):
+    """
+    Catalog statistics (counts, total quantity, inventory value and price
+    min/max/mean/percentiles) as a serialized JSON response body. They are
+    read off the running totals of the stats index, not computed by a scan.
+
+    Args:
+        group_by (str): "category" to get the stats per category, or None
+            for the whole catalog.
+
+    Returns:
+        tuple:
+            - bytes: The JSON body.
+            - str: Its ETag.
+
+    Raises:
+        ValueError: If the stats can't be grouped by that field.
+    """
+    return _cached_response(("stats", group_by), store.version, lambda: store.stats(group_by))
+
+def recompute_product_stats(group_by=None):
+    """
+    Compute the same statistics as `product_stats_response` with a full scan
+    of the catalog, to check the running totals against.
+
+    Args:
+        group_by (str): "category", or None for the whole catalog.
+
+    Returns:
+        dict: The stats.
+
+    Raises:
+        ValueError: If the stats can't be grouped by that field.
+    """
+    if group_by is not None and group_by not in STATS_GROUP_BY:
+        raise ValueError(f"Cannot group by '{group_by}'.")
+    return compute_stats(store.all(), group_by)
 
 def find_product_by_id(item_id):
     """
@@ -22,13 +274,22 @@ def find_product_by_id(item_id):
         item_id (int): The ID of the item.
 
     Returns:
-        dict: The item with the given ID, or None if not found.
+        Product: The item with the given ID, or None if not found.
     """
-    with lock:
-        for item in products:
-            if item["id"] == item_id:
-                return item
-        return None
+    return store.get(item_id)
+
+def find_product_response(item_id):
+    """
+    Like `find_product_by_id`, but returns the product serialized as a JSON
+    response body, from the response cache when it hasn't changed.
+
+    Args:
+        item_id (int): The ID of the item.
+
+    Returns:
+        tuple: (body, etag), or None if the product does not exist.
+    """
+    return _cached_response(("item", item_id), store.item_version(item_id), lambda: store.get(item_id))
 
 def add_product(new_product):
     """
@@ -38,34 +299,167 @@ def add_product(new_product):
         new_product (dict): A dictionary containing the product details.
 
     Returns:
-        dict: The newly added product.
+        Product: The newly added product.
+
+    Raises:
+        ValueError: If an inline image can't be decoded.
     """
-    with lock:
-        # Auto-assign the id based on the last id in the products list
-        existing_ids = [product["id"] for product in products]
-        new_id = max(existing_ids) + 1 if existing_ids else 1
-        new_product["id"] = new_id  # Assign the new id to the product
+    key = save_image(new_product)
+    if key is None:
+        return store.insert(new_product)
+
+    def link_image(record):
+        record["image_url"] = IMAGE_URL.format(item_id=record["id"], key=key)
 
-        products.append(new_product)  # Appending the new product to the list.
-        return new_product
+    return store.insert(new_product, prepare=link_image)
 
-def update_product(item_id, updated_data):
+def update_product(item_id, updated_data, if_match=None):
     """
     Update an existing product.
 
     Args:
         item_id (int): The ID identifier of the product to be updated.
         updated_data (dict): A dictionary containing the updated product details.
+        if_match (list): Optional. ETags from an If-Match header (see
+            utils.parse_if_match). The update only happens if one of them is
+            the product's current ETag.
+
+    Returns:
+        Product: The updated product if found, or None if the product does not exist.
+
+    Raises:
+        ValueError: If an inline image can't be decoded.
+        PreconditionFailed: If the product changed since the client read it.
+    """
+    key = save_image(updated_data)
+    if key is not None:
+        updated_data = {**updated_data, "image_url": IMAGE_URL.format(item_id=item_id, key=key)}
+
+    def build(current):
+        _check_if_match(current, if_match)
+        return updated_data
+
+    return store.modify(item_id, build)
+
+def adjust_product_quantity(item_id, delta, floor=0, if_match=None):
+    """
+    Atomically add `delta` (which may be negative) to a product's quantity.
+
+    Concurrent adjustments of the same product are applied one after the other
+    against its latest quantity, so none of them is lost.
+
+    Args:
+        item_id (int): The ID of the product.
+        delta (int): How much to add to the quantity.
+        floor (int): The lowest quantity the adjustment may leave.
+        if_match (list): Optional ETags the product must currently match.
 
     Returns:
-        dict: The updated product if found, or None if the product does not exist.
+        Product: The updated product, or None if the product does not exist.
+
+    Raises:
+        InsufficientStock: If the new quantity would be below `floor`.
+        PreconditionFailed: If the product changed since the client read it.
+        ValueError: If the product's quantity isn't a number, or the new
+            quantity would be above the largest one a PUT accepts.
     """
-    with lock:
-        product = find_product_by_id(item_id)
-        if product:
-            product.update(updated_data)
-            return product
+    # The same bounds as PUT, so an adjusted product can still be saved as it is
+    minimum, maximum = PRODUCT_FIELDS["quantity"].minimum, PRODUCT_FIELDS["quantity"].maximum
+
+    def build(current):
+        _check_if_match(current, if_match)
+        quantity = current.get("quantity")
+        if isinstance(quantity, bool) or not isinstance(quantity, (int, float)):
+            raise ValueError("The product's quantity is not a number.")
+        if quantity + delta < max(floor, minimum):
+            raise InsufficientStock(quantity, delta, max(floor, minimum))
+        if quantity + delta > maximum:
+            raise ValueError(f"Adjusting the quantity {quantity} by {delta} would leave more than {maximum}.")
+        return {"quantity": quantity + delta}
+
+    return store.modify(item_id, build)
+
+def add_products(new_products):
+    """
+    Add many products at once, in a single critical section.
+
+    Args:
+        new_products (list): Dictionaries containing the product details.
+
+    Returns:
+        list: The newly added products, in the same order.
+
+    Raises:
+        ValueError: If an inline image can't be decoded. Nothing is added.
+    """
+    keys = []
+    for position, product in enumerate(new_products):
+        try:
+            keys.append(save_image(product))
+        except ValueError as error:
+            raise ValueError(f"Item {position}: {error}") from error
+
+    def link_image(record, position):
+        if keys[position] is not None:
+            record["image_url"] = IMAGE_URL.format(item_id=record["id"], key=keys[position])
+
+    return store.bulk_insert(new_products, prepare=link_image if any(keys) else None)
+
+def update_products(updates):
+    """
+    Update many products at once, in a single critical section.
+
+    Args:
+        updates (list): (item_id, updated_data) pairs.
+
+    Returns:
+        list: For each pair, the updated product or None if it does not exist.
+
+    Raises:
+        ValueError: If an inline image can't be decoded. Nothing is updated.
+    """
+    prepared = []
+    for position, (item_id, updated_data) in enumerate(updates):
+        try:
+            key = save_image(updated_data)
+        except ValueError as error:
+            raise ValueError(f"Item {position}: {error}") from error
+        if key is not None:
+            updated_data = {**updated_data, "image_url": IMAGE_URL.format(item_id=item_id, key=key)}
+        prepared.append((item_id, updated_data))
+    return store.bulk_update(prepared)
+
+def delete_products(item_ids):
+    """
+    Remove many products at once, in a single critical section.
+
+    Args:
+        item_ids (list): The IDs of the products to delete.
+
+    Returns:
+        list: For each ID, True if it was deleted, False if it did not exist.
+    """
+    return store.bulk_delete(item_ids)
+
+def find_product_image(item_id):
+    """
+    Find the stored image of a product.
+
+    Args:
+        item_id (int): The ID of the product.
+
+    Returns:
+        tuple: (path, mimetype, key) of the image file, or None if the product
+            doesn't exist or its image isn't in the blob store.
+    """
+    product = store.get(item_id)
+    if product is None:
         return None
+    match = IMAGE_URL_PATTERN.match(str(product.get("image_url")))
+    if not match or not blobs.exists(match.group("key")):
+        return None
+    key = match.group("key")
+    return blobs.path(key), blobs.mimetype(key), key
 
 def delete_product(item_id):
     """
@@ -77,15 +471,4 @@ def delete_product(item_id):
     Returns:
         bool: True if the product was successfully deleted, False otherwise.
     """
-    global products  # Access the global `products` list
-    with lock:
-        updated_products = []  # Initialize an empty list to store the items
-
-        for item in products:
-            if item["id"] != item_id:  # Add items that do not match the given ID
-                updated_products.append(item)
-
-        # Update the global `products` list
-        products = updated_products
-
-    return True
+    return store.delete(item_id)
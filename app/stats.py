@@ -0,0 +1,285 @@
+"""
+Catalog statistics kept up to date as products change.
+
+`StatsIndex` follows the index interface of app/indexes.py (`add`, `remove`,
+`build`), so the store updates it inside its write lock on every insert,
+update and delete. It keeps running sums (count, total quantity, inventory
+value, price total) and a sorted list of prices, for the whole catalog and
+for each value of the fields it groups by. Reading the stats never scans
+the catalog: the sums are read as they are, and min, max and percentiles
+are positions in the sorted prices.
+
+`compute_stats` recomputes the same numbers from scratch with a full scan,
+vectorized with NumPy when it is installed. It is there to check the
+incremental numbers against, not to serve requests.
+
+Only plain numbers count: a price or quantity that is missing, isn't a
+finite number or is larger than NUMBER_LIMIT leaves the product out of the
+sums that need it, but it is still counted. The limit keeps every sum finite:
+one inf would turn the sums into NaN for good, even after the product that
+caused it is deleted.
+"""
+import math
+
+from .indexes import SortedList
+
+try:
+    import numpy
+except ImportError:  # optional, only used by compute_stats
+    numpy = None
+
+# Nearest-rank percentiles: the price at position int(q * (n - 1)) in sorted order
+PERCENTILES = {"p25": 0.25, "p50": 0.50, "p75": 0.75, "p90": 0.90, "p99": 0.99}
+# Largest price or quantity that counts. A price times a quantity stays below
+# 1e300, so even billions of them add up to a finite float.
+NUMBER_LIMIT = 1e150
+
+
+def _number(value):
+    # The value if it's a plain number within NUMBER_LIMIT, otherwise None. bool is not a number here.
+    # The comparison is safe for ints too large to convert to float, and False for NaN.
+    if (type(value) is int or type(value) is float) and -NUMBER_LIMIT <= value <= NUMBER_LIMIT:
+        return value
+    return None
+
+
+def _summary(count, total_quantity, inventory_value, price_count, price_total, price_at):
+    """
+    Lay out one group's numbers as they are returned by the API.
+
+    Args:
+        price_at (callable): price_at(position) -> the price at that position in sorted order.
+    """
+    price = {"count": price_count, "min": None, "max": None, "mean": None, "percentiles": None}
+    if price_count:
+        price["min"] = price_at(0)
+        price["max"] = price_at(price_count - 1)
+        price["mean"] = price_total / price_count
+        price["percentiles"] = {
+            name: price_at(int(quantile * (price_count - 1))) for name, quantile in PERCENTILES.items()
+        }
+    return {"count": count, "total_quantity": total_quantity, "inventory_value": inventory_value, "price": price}
+
+
+class RunningSum:
+    """
+    A sum that values can be added to and taken away from without the
+    rounding errors piling up (Neumaier's compensated summation). Integers
+    stay exact integers.
+    """
+
+    __slots__ = ("_total", "_compensation")
+
+    def __init__(self):
+        self._total = 0
+        self._compensation = 0
+
+    def add(self, value):
+        total = self._total + value
+        # Keep the low-order bits the addition just rounded away
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+    @property
+    def value(self):
+        return self._total + self._compensation
+
+
+class _Group:
+    # Running statistics of one set of products (the catalog, or one category)
+
+    __slots__ = ("count", "quantity", "value", "price_total", "prices")
+
+    def __init__(self):
+        self.count = 0
+        self.quantity = RunningSum()
+        self.value = RunningSum()
+        self.price_total = RunningSum()
+        self.prices = SortedList()
+
+    def update(self, price, quantity, sign):
+        # Add (sign=1) or take away (sign=-1) one product's contribution
+        self.count += sign
+        if quantity is not None:
+            self.quantity.add(sign * quantity)
+        if price is not None:
+            self.price_total.add(sign * price)
+            if sign > 0:
+                self.prices.add(price)
+            else:
+                self.prices.remove(price)
+            if quantity is not None:
+                self.value.add(sign * price * quantity)
+
+    def summary(self):
+        prices = self.prices
+        return _summary(
+            self.count, self.quantity.value, self.value.value, len(prices), self.price_total.value,
+            prices.__getitem__,
+        )
+
+
+class StatsIndex:
+    """
+    Running catalog statistics, overall and grouped by some fields.
+
+    Reading them costs O(groups) plus a few positional lookups in the
+    sorted prices; each write costs O(log n) per group the product is in.
+
+    Args:
+        group_by (iterable): Fields the stats can be grouped by, e.g. ["category"].
+    """
+
+    def __init__(self, group_by=()):
+        self.group_by = tuple(group_by)
+        self._total = _Group()
+        self._groups = {field: {} for field in self.group_by}
+
+    def _update(self, record, sign):
+        price, quantity = _number(record.get("price")), _number(record.get("quantity"))
+        self._total.update(price, quantity, sign)
+        if not self._total.count:
+            self._total = _Group()  # drop any rounding residue left in the sums
+        for field, groups in self._groups.items():
+            value = record.get(field)
+            group = groups.get(value)
+            if group is None:
+                group = groups[value] = _Group()
+            group.update(price, quantity, sign)
+            if not group.count:
+                del groups[value]
+
+    def add(self, record):
+        self._update(record, 1)
+
+    def remove(self, record):
+        self._update(record, -1)
+
+    def build(self, records):
+        # Sum first and sort each price list once at the end, instead of
+        # inserting the prices one at a time
+        groups = {}  # (field, value) -> _Group, or None for the whole catalog
+        prices = {}  # the same keys -> unsorted prices
+        for record in records:
+            price, quantity = _number(record.get("price")), _number(record.get("quantity"))
+            keys = [None] + [(field, record.get(field)) for field in self.group_by]
+            for key in keys:
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _Group()
+                    prices[key] = []
+                group.count += 1
+                if quantity is not None:
+                    group.quantity.add(quantity)
+                if price is not None:
+                    group.price_total.add(price)
+                    prices[key].append(price)
+                    if quantity is not None:
+                        group.value.add(price * quantity)
+
+        for key, group in groups.items():
+            group.prices.build(prices[key])
+        self._total = groups.pop(None, None) or _Group()
+        self._groups = {field: {} for field in self.group_by}
+        for (field, value), group in groups.items():
+            self._groups[field][value] = group
+
+    def summary(self, group_by=None):
+        """
+        Args:
+            group_by (str): A field to group by, or None for the whole catalog.
+
+        Returns:
+            dict: The catalog's stats, or with `group_by`, {"group_by": field,
+                "groups": {value: stats}}.
+
+        Raises:
+            ValueError: If the index doesn't group by that field.
+        """
+        if group_by is None:
+            return self._total.summary()
+        if group_by not in self._groups:
+            raise ValueError(f"Cannot group by '{group_by}'.")
+        return {
+            "group_by": group_by,
+            "groups": {value: group.summary() for value, group in self._groups[group_by].items()},
+        }
+
+
+def _exact_sum(values):
+    # Integers are summed exactly as integers, anything else with fsum
+    if all(type(value) is int for value in values):
+        return sum(values)
+    return math.fsum(values)
+
+
+def _summarize_records(records):
+    # Full-scan statistics of a list of products
+    prices = []
+    quantities = []
+    values = []
+    for record in records:
+        price, quantity = _number(record.get("price")), _number(record.get("quantity"))
+        if price is not None:
+            prices.append(price)
+        if quantity is not None:
+            quantities.append(quantity)
+            if price is not None:
+                values.append(price * quantity)
+
+    if numpy is not None:
+        # float64 throughout, so results can differ from the exact sums in the last bits
+        prices = numpy.sort(numpy.array(prices, dtype=numpy.float64))
+        return _summary(
+            len(records),
+            float(numpy.sum(numpy.array(quantities, dtype=numpy.float64))),
+            float(numpy.sum(numpy.array(values, dtype=numpy.float64))),
+            len(prices),
+            float(numpy.sum(prices)),
+            lambda position: float(prices[position]),
+        )
+    prices.sort()
+    return _summary(
+        len(records), _exact_sum(quantities), _exact_sum(values), len(prices), _exact_sum(prices), prices.__getitem__,
+    )
+
+
+def compute_stats(records, group_by=None):
+    """
+    Compute the same statistics as `StatsIndex.summary` with a full scan.
+
+    Args:
+        records (list): The products.
+        group_by (str): A field to group by, or None for the whole catalog.
+
+    Returns:
+        dict: Stats in the same layout as `StatsIndex.summary`.
+    """
+    if group_by is None:
+        return _summarize_records(records)
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record.get(group_by), []).append(record)
+    return {
+        "group_by": group_by,
+        "groups": {value: _summarize_records(rows) for value, rows in grouped.items()},
+    }
+
+
+def stats_match(first, second, rel_tol=1e-9):
+    """
+    Compare two stats results, allowing for floating point rounding in the sums.
+
+    Returns:
+        bool: True if both have the same layout and the numbers are close.
+    """
+    if isinstance(first, dict) and isinstance(second, dict):
+        return first.keys() == second.keys() and all(
+            stats_match(first[key], second[key], rel_tol) for key in first
+        )
+    if isinstance(first, (int, float)) and isinstance(second, (int, float)):
+        return math.isclose(first, second, rel_tol=rel_tol, abs_tol=1e-6)
+    return first == second
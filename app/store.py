@@ -0,0 +1,620 @@
+"""
+In-memory storage engine for products.
+
+Products live in a dict keyed by id (the primary index), so lookups, updates
+and deletes no longer have to walk the whole catalog. Python dicts keep
+insertion order, which gives `fetch_all_products` the same ordering as the old
+list. Ids come from a monotonic sequence and are never reused.
+
+Stored records are immutable `Product` objects (see app/records.py), a
+compact read-only mapping: an update builds a new record and swaps it in.
+That way a reader holding a record (or a snapshot of all records) never
+sees a half-applied write.
+
+Secondary indexes (see app/indexes.py) can be registered with `add_index`.
+They are updated inside the same write lock as the primary index, which lets
+`query` answer filtered, sorted pages without scanning the catalog.
+
+Every write is also handed to a persistence backend (see app/persistence.py)
+while the write lock is held, then made durable after the lock is released,
+so slow disks don't stall readers and concurrent writers share an fsync.
+
+Listeners registered with `add_listener` are told about every write, with
+the store version it produced, while the write lock is still held, so they
+see the writes in order (app/changes.py keeps the change feed this way).
+
+Each product carries a "version" that starts at 1 and goes up with every
+update. Writes to existing products also take a per-record lock, striped by
+id. A read-modify-write like `modify` holds it while it computes the new
+record, without holding the store's write lock, so it can't lose an update
+to a concurrent writer of the same product. Writes to other products and
+all reads carry on in the meantime.
+"""
+import gc
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+from .indexes import SortedIndex
+from .persistence import MemoryBackend
+from .records import Product
+
+# Number of per-record locks. Products whose ids share a stripe also share a lock.
+LOCK_STRIPES = 64
+
+
+class ReadWriteLock:
+    """
+    A lock that lets many readers in at once but gives writers exclusive access.
+
+    Writers that are waiting block new readers, so a steady stream of reads
+    can't starve the writes.
+    """
+
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+@contextmanager
+def gc_paused():
+    """
+    Turn off the cyclic garbage collector for a bulk load.
+
+    Loading or reindexing a big catalog allocates millions of dicts and lists
+    at once. Each allocation burst would trigger a full collection that walks
+    the whole heap and frees nothing, which roughly doubles the load time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ProductStore:
+    """
+    Id-indexed product storage guarded by a reader/writer lock.
+
+    Args:
+        products (iterable): Initial products. Each one must already have an "id".
+        indexes (dict): Secondary indexes to maintain, keyed by name.
+        backend: Optional persistence backend. If it already holds a catalog,
+            that is loaded instead of `products`; otherwise `products` are
+            written to it as the starting catalog.
+    """
+
+    # Seed products are written to an empty backend in batches of this many
+    SEED_BATCH_SIZE = 10000
+
+    def __init__(self, products=(), indexes=None, backend=None):
+        self.lock = ReadWriteLock()
+        self.backend = backend or MemoryBackend()
+        self._rows = {}
+        self._last_id = 0
+        self._operations = None  # changes made under the current write lock
+        self._undo = None  # how to take them back if the write fails, see _roll_back
+        # Bumped by every write. Caches tag what they build with the version
+        # they read first, so a later write turns them into misses.
+        self.version = 0
+        # id -> version of its last change, for products changed since startup.
+        # Deleted ids are dropped, so it only grows with the catalog.
+        self._item_versions = {}
+        self._listeners = []
+        self._stripes = [Lock() for _ in range(LOCK_STRIPES)]
+        # Ids in sorted order, so the default listing can be paged by cursor
+        self._indexes = {"id": SortedIndex("id")}
+
+        with gc_paused():
+            stored = self.backend.load()
+            if stored is not None:
+                products, self._last_id = stored
+            for product in products:
+                record = Product(product) if "version" in product else Product(product, version=1)
+                self._rows[record["id"]] = record
+                self._last_id = max(self._last_id, record["id"])
+            self._indexes["id"].build(self._rows.values())
+
+            for name, index in (indexes or {}).items():
+                self.add_index(name, index)
+
+        if stored is None and self._rows:
+            records = list(self._rows.values())
+            ticket = None
+            for start in range(0, len(records), self.SEED_BATCH_SIZE):
+                ticket = self.backend.append(
+                    [("put", record) for record in records[start:start + self.SEED_BATCH_SIZE]], self._last_id
+                )
+            self.backend.sync(ticket)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add_index(self, name, index):
+        """
+        Register a secondary index and fill it with the products already stored.
+        """
+        with self.lock.write(), gc_paused():
+            index.build(self._rows.values())
+            self._indexes[name] = index
+
+    def add_listener(self, listener):
+        """
+        Call `listener(version, operations)` after every write, inside the
+        write lock. `operations` is a list of ("put", record) and
+        ("delete", id) pairs, and must not be modified. Keep listeners quick:
+        every reader and writer waits for them.
+        """
+        with self.lock.write():
+            self._listeners.append(listener)
+
+    def _reindex(self, before, after):
+        # Swap `before` for `after` (either may be None) in every index. If an
+        # index raises, the indexes already swapped are swapped back, so they
+        # never hold half a change.
+        done = []
+        try:
+            for index in self._indexes.values():
+                if before is not None:
+                    index.remove(before)
+                if after is not None:
+                    try:
+                        index.add(after)
+                    except BaseException:
+                        if before is not None:
+                            index.add(before)
+                        raise
+                done.append(index)
+        except BaseException:
+            for index in reversed(done):
+                if after is not None:
+                    index.remove(after)
+                if before is not None:
+                    index.add(before)
+            raise
+
+    @contextmanager
+    def _record_locks(self, item_ids):
+        # Lock the stripes of the given records, in stripe order so that two
+        # writers can't deadlock, and always before the store's write lock.
+        # Yields a list for _logged_write to leave its ticket in, so waiting
+        # for durability happens after these locks are released too.
+        stripes = [self._stripes[n] for n in sorted({hash(item_id) % LOCK_STRIPES for item_id in item_ids})]
+        for stripe in stripes:
+            stripe.acquire()
+        tickets = []
+        try:
+            yield tickets
+        finally:
+            for stripe in reversed(stripes):
+                stripe.release()
+        for ticket in tickets:
+            self.backend.sync(ticket)
+
+    @contextmanager
+    def _logged_write(self, tickets=None):
+        # Take the write lock and hand the changes made under it to the backend
+        # before releasing it. Waiting for them to be durable happens afterwards,
+        # here or, when `tickets` is given, in the enclosing _record_locks.
+        with self.lock.write():
+            self._operations = []
+            self._undo = []
+            last_id = self._last_id
+            try:
+                yield
+            except BaseException:
+                self._roll_back(last_id)
+                raise
+            finally:
+                self._undo = None
+                ticket = self._log_operations()
+        if tickets is None:
+            self.backend.sync(ticket)
+        else:
+            tickets.append(ticket)
+
+    def _roll_back(self, last_id):
+        # Put back the records a failed write changed, newest first, and drop
+        # its operations: a write is stored, indexed and logged entirely or not at all
+        restored = False
+        rebuild = False
+        for item_id, before, after, indexed in reversed(self._undo):
+            if before is None:
+                self._rows.pop(item_id, None)
+            else:
+                restored = restored or item_id not in self._rows
+                self._rows[item_id] = before
+            if indexed:
+                self._reindex(after, before)
+            else:
+                rebuild = True
+        if restored:
+            # Deleted records came back at the end, sort them back into place
+            self._rows = dict(sorted(self._rows.items()))
+        if rebuild:
+            self._rebuild_indexes()
+        self._last_id = last_id
+        self._operations = []
+
+    def _log_operations(self):
+        operations, self._operations = self._operations, None
+        if not operations:
+            return None
+        self.version += 1
+        for op, value in operations:
+            if op == "put":
+                self._item_versions[value["id"]] = self.version
+            else:
+                self._item_versions.pop(value, None)
+        for listener in self._listeners:
+            listener(self.version, operations)
+        ticket = self.backend.append(operations, self._last_id)
+        if self.backend.needs_snapshot():
+            self.backend.snapshot(list(self._rows.values()), self._last_id)
+        return ticket
+
+    def close(self):
+        """
+        Flush pending writes and close the persistence backend.
+        """
+        with self.lock.write():
+            self.backend.close()
+
+    def item_version(self, item_id):
+        """
+        Returns:
+            int: A counter that changes whenever the product with this id
+                does, or -1 if there is no such product.
+        """
+        if item_id not in self._rows:
+            # Never a cache tag: a missing product's response isn't cached
+            return -1
+        return self._item_versions.get(item_id, 0)
+
+    def all(self):
+        """
+        Returns:
+            list: A snapshot of all products in insertion order.
+        """
+        with self.lock.read():
+            return list(self._rows.values())
+
+    def get(self, item_id):
+        """
+        Returns:
+            Product: The product with the given id, or None if not found.
+        """
+        with self.lock.read():
+            return self._rows.get(item_id)
+
+    def insert(self, product, prepare=None):
+        """
+        Store a new product under the next id in the sequence.
+
+        Args:
+            product (dict): The product details.
+            prepare (callable): Optional. Called with the new record, after its
+                id is assigned but before it is stored, for fields derived from the id.
+
+        Returns:
+            Product: The stored product, including its new "id".
+        """
+        with self._logged_write():
+            return self._insert(product, prepare)
+
+    def update(self, item_id, changes):
+        """
+        Merge `changes` into an existing product. The id itself never changes.
+
+        Returns:
+            Product: The updated product, or None if the id does not exist.
+        """
+        return self.modify(item_id, lambda current: changes)
+
+    def modify(self, item_id, build):
+        """
+        Atomically update a product with changes computed from its current state.
+
+        `build` runs while the product's record lock is held, so no other write
+        to this product can happen between reading it and storing the result.
+        The store's write lock is only taken to swap the new record in.
+
+        Args:
+            item_id (int): The product to update.
+            build (callable): Called with the current record. Returns the changes
+                to merge in, or raises to leave the product unchanged.
+
+        Returns:
+            Product: The updated product, or None if the id does not exist.
+        """
+        with self._record_locks([item_id]) as tickets:
+            current = self.get(item_id)
+            if current is None:
+                return None
+            changes = build(current)
+            with self._logged_write(tickets):
+                return self._update(item_id, changes)
+
+    def delete(self, item_id):
+        """
+        Returns:
+            bool: True if a product was removed, False if the id did not exist.
+        """
+        with self._record_locks([item_id]) as tickets, self._logged_write(tickets):
+            return self._delete(item_id)
+
+    def bulk_insert(self, products, prepare=None):
+        """
+        Insert many products in one critical section.
+
+        Args:
+            products (list): The product details.
+            prepare (callable): Optional. Called as prepare(record, position)
+                for each new record, like the `prepare` argument of `insert`.
+
+        Returns:
+            list: The stored products, in the same order.
+        """
+        with self._logged_write():
+            reindex = self._is_small_batch(len(products))
+            records = []
+            for position, product in enumerate(products):
+                records.append(self._insert(
+                    product,
+                    prepare and (lambda record, position=position: prepare(record, position)),
+                    reindex=reindex,
+                ))
+            if not reindex:
+                self._rebuild_indexes()
+            return records
+
+    def bulk_update(self, updates):
+        """
+        Apply many (item_id, changes) updates in one critical section.
+
+        Returns:
+            list: For each update, the updated product or None if the id does not exist.
+        """
+        with self._record_locks([item_id for item_id, _ in updates]) as tickets, self._logged_write(tickets):
+            reindex = self._is_small_batch(len(updates))
+            records = [self._update(item_id, changes, reindex=reindex) for item_id, changes in updates]
+            if not reindex:
+                self._rebuild_indexes()
+            return records
+
+    def bulk_delete(self, item_ids):
+        """
+        Delete many products in one critical section.
+
+        Returns:
+            list: For each id, True if it was removed, False if it did not exist.
+        """
+        with self._record_locks(item_ids) as tickets, self._logged_write(tickets):
+            reindex = self._is_small_batch(len(item_ids))
+            results = [self._delete(item_id, reindex=reindex) for item_id in item_ids]
+            if not reindex:
+                self._rebuild_indexes()
+            return results
+
+    def apply(self, operations, replace=False):
+        """
+        Apply writes made by another store, e.g. the primary a read replica
+        follows. Products are stored as given, ids and versions included, so
+        the replica serves the same records and ETags.
+
+        Args:
+            operations (list): ("put", product) and ("delete", id) pairs, in order.
+            replace (bool): Drop every product first, so the store ends up
+                holding exactly the products put (used to load a snapshot).
+                Products that aren't put again are logged as deleted.
+        """
+        with self._logged_write():
+            reindex = self._is_small_batch(len(operations)) and not replace
+            if replace:
+                kept = {value["id"] for op, value in operations if op == "put"}
+                dropped = [item_id for item_id in self._rows if item_id not in kept]
+                self._operations.extend(("delete", item_id) for item_id in dropped)
+                self._undo.extend((item_id, record, None, False) for item_id, record in self._rows.items())
+                self._rows = {}
+            for op, value in operations:
+                if op == "put":
+                    self._put(Product(value), reindex=reindex)
+                else:
+                    self._delete(value, reindex=reindex)
+            if not reindex:
+                self._rebuild_indexes()
+
+    def _is_small_batch(self, size):
+        # Past this point, re-sorting every index once beats updating them row by row
+        return size < max(1000, len(self._rows) // 4)
+
+    def _rebuild_indexes(self):
+        with gc_paused():
+            for index in self._indexes.values():
+                index.build(self._rows.values())
+
+    def _insert(self, product, prepare=None, reindex=True):
+        self._last_id += 1
+        record = dict(product)
+        record["id"] = self._last_id
+        record["version"] = 1
+        if prepare is not None:
+            prepare(record)
+        record = Product(record)
+        self._store(record["id"], None, record, reindex)
+        return record
+
+    def _put(self, record, reindex=True):
+        self._store(record["id"], self._rows.get(record["id"]), record, reindex)
+        self._last_id = max(self._last_id, record["id"])
+
+    def _update(self, item_id, changes, reindex=True):
+        current = self._rows.get(item_id)
+        if current is None:
+            return None
+        record = current.replace(changes, id=item_id, version=current["version"] + 1)
+        self._store(item_id, current, record, reindex)
+        return record
+
+    def _delete(self, item_id, reindex=True):
+        record = self._rows.get(item_id)
+        if record is None:
+            return False
+        self._store(item_id, record, None, reindex)
+        return True
+
+    def _store(self, item_id, before, after, reindex):
+        # Replace a row (None when there is none) and remember how to undo it.
+        # The indexes go first: if they fail, nothing has changed yet.
+        if reindex:
+            self._reindex(before, after)
+        if after is None:
+            del self._rows[item_id]
+            self._operations.append(("delete", item_id))
+        else:
+            self._rows[item_id] = after
+            self._operations.append(("put", after))
+        self._undo.append((item_id, before, after, reindex))
+
+    def search(self, text, limit=20, index="search"):
+        """
+        Run a full-text query against a registered SearchIndex.
+
+        Returns:
+            list: The matching products, best match first.
+        """
+        with self.lock.read():
+            return [self._rows[item_id] for item_id in self._indexes[index].search(text, limit)]
+
+    def stats(self, group_by=None, index="stats"):
+        """
+        Read the running statistics of a registered StatsIndex.
+
+        Returns:
+            dict: The stats, see `StatsIndex.summary`.
+
+        Raises:
+            ValueError: If the index can't group by `group_by`.
+        """
+        with self.lock.read():
+            return self._indexes[index].summary(group_by)
+
+    def query(self, equals=None, ranges=None, sort="id", descending=False, after=None, limit=None):
+        """
+        Return one page of products that match the filters, in sorted order.
+
+        The page is read straight off an index: the sort field's sorted index,
+        narrowed by any range on that same field, or a hash bucket when sorting
+        by id with an equality filter. Other filters are checked per product
+        as the page is collected.
+
+        Args:
+            equals (dict): Field -> value filters. Each field needs a hash index.
+            ranges (dict): Field -> (low, high) inclusive filters. Either bound
+                may be None. Each field needs a sorted index.
+            sort (str): Name of the sorted index that orders the results.
+            descending (bool): Return the largest values first.
+            after (tuple): The (key, id) cursor entry of the last product on the
+                previous page.
+            limit (int): Maximum number of products to return, or None for all.
+
+        Returns:
+            tuple:
+                - list: The matching products.
+                - tuple: The cursor entry for the next page, or None on the last page.
+
+        Raises:
+            ValueError: If a filter or sort field has no suitable index.
+        """
+        equals = dict(equals or {})
+        ranges = dict(ranges or {})
+        sort_index = self._indexes.get(sort)
+        if not isinstance(sort_index, SortedIndex):
+            raise ValueError(f"Cannot sort by '{sort}'.")
+        for field in list(equals) + list(ranges):
+            if field not in self._indexes:
+                raise ValueError(f"Cannot filter by '{field}'.")
+
+        with self.lock.read():
+            if sort == "id" and equals:
+                # Walk the equality bucket in id order instead of the whole id index
+                field, value = next(iter(equals.items()))
+                del equals[field]
+                ids = self._indexes[field].scan(value, after=after[1] if after else None, descending=descending)
+                entries = ((sort_index.key(item_id), item_id) for item_id in ids)
+            else:
+                low, high = ranges.pop(sort, (None, None))
+                entries = sort_index.scan(low, high, after=after, descending=descending)
+
+            rows = self._rows
+            checks = list(equals.items())
+            range_checks = [
+                self._indexes[field].range_check(rows, low, high) for field, (low, high) in ranges.items()
+            ]
+
+            def matches(item_id):
+                # Ranges first: with a column they don't need to look up the record
+                for check in range_checks:
+                    if not check(item_id):
+                        return False
+                if checks:
+                    record = rows[item_id]
+                    for field, value in checks:
+                        if record.get(field) != value:
+                            return False
+                return True
+
+            page = []
+            last_entry = None
+            for entry in entries:
+                if not matches(entry[1]):
+                    continue
+                if limit is not None and len(page) == limit:
+                    return page, last_entry
+                page.append(rows[entry[1]])
+                last_entry = entry
+            return page, None
@@ -1,4 +1,20 @@
-from flask import jsonify
+import base64
+import binascii
+import json
+import math
+import zlib
+
+from flask import Response, jsonify, request
+
+from .codec import dumps, loads
+from .compression import encode_body
+from .schemas import ADJUSTMENT
+
+SORTABLE_FIELDS = ["id", "price", "quantity", "date_added"]
+MAX_PAGE_SIZE = 1000
+MAX_BULK_ITEMS = 100000
+EXPORT_CHUNK_SIZE = 64 * 1024
+NDJSON_MIMETYPES = ["application/x-ndjson", "application/jsonl"]
 
 def generate_error_response(message, status_code):
     """
@@ -14,28 +30,286 @@ def generate_error_response(message, status_code):
     return jsonify({"error": message}), status_code
 
 
-def validate_required_fields(data, required_fields):
+def serialize_json(data):
+    """
+    Serialize data exactly the way `jsonify` does (see app/codec.py): sorted
+    keys, compact separators and a trailing newline.
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    return dumps(data) + b"\n"
+
+
+def generate_cached_response(body, etag):
+    """
+    Build a JSON response from a cached body with a strong ETag. Returns
+    304 Not Modified instead when the request's If-None-Match already has it.
+    Large bodies are compressed as the client's Accept-Encoding allows, once
+    per body (see app/compression.py).
+
+    Args:
+        body (bytes): The serialized JSON.
+        etag (str): The quoted ETag of the body.
+
+    Returns:
+        Flask response: The JSON response, or an empty 304.
+    """
+    body, encoding, etag, vary = encode_body(body, request.headers.get("Accept-Encoding"), etag)
+    response = Response(body, mimetype="application/json")
+    response.headers["ETag"] = etag
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    if vary:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = "no-cache"  # always revalidate, it's cheap
+    return response.make_conditional(request)
+
+
+def parse_if_match(header):
     """
-    Check if all the required fields are present in the given data.
+    Parse an If-Match header into the list of ETags it names.
+
+    Weak tags never match, since If-Match uses strong comparison.
+
+    Args:
+        header (str): The raw header value, or None.
+
+    Returns:
+        list: The quoted ETags (or "*"), or None if there is no header.
+    """
+    if header is None:
+        return None
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag.startswith('"') and tag.endswith('"') and len(tag) > 1):
+            tags.append(tag)
+    return tags
+
+
+def encode_cursor(sort, entry):
+    """
+    Turn the last (key, id) index entry of a page into an opaque cursor string.
+
+    Args:
+        sort (str): The sort parameter the page was requested with, e.g. "-price".
+        entry (tuple): The cursor entry returned by the store.
+
+    Returns:
+        str: A URL-safe cursor for the next page.
+    """
+    key, item_id = entry
+    raw = json.dumps([sort, list(key), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort):
+    """
+    Reverse `encode_cursor`, checking that the cursor belongs to the same sort order.
+
+    Returns:
+        tuple: The (key, id) entry to resume after, or None if the cursor is invalid.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key, item_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if cursor_sort != sort or not isinstance(item_id, int) or not isinstance(key, list) or len(key) != 2:
+        return None
+    # Keys mirror app.indexes: (0, value) for well-typed values, (1, str) otherwise
+    expected_type = str if sort.lstrip("-") == "date_added" else (int, float)
+    if key[0] not in (0, 1) or not isinstance(key[1], expected_type if key[0] == 0 else str):
+        return None
+    if isinstance(key[1], float) and not math.isfinite(key[1]):
+        return None
+    return tuple(key), item_id
+
+
+def _finite_float(value):
+    # float() also accepts "nan" and "inf"; a NaN bound would silently match nothing
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{value!r} is not a finite number")
+    return number
+
+
+def parse_product_query(args):
+    """
+    Read the filter, sort and pagination parameters of a product listing.
+
+    Supported parameters: category, min_price, max_price, min_quantity,
+    max_quantity, date_from, date_to, sort (a field name, prefixed with "-"
+    for descending order), limit and cursor.
 
     Args:
-        data (dict): The input data to check, typically from a request (e.g., request.json).
-        required_fields (list): A list of required field names.
+        args (dict): The query string parameters (e.g. request.args).
 
     Returns:
         tuple:
-            - bool: True if all required fields are present, False otherwise.
-            - str: A message listing missing fields if any are not found.
+            - dict: Keyword arguments for `query_products`, or None if invalid.
+            - str: An error message if the parameters are invalid.
     """
-    missing_fields = []  # List to store any missing fields
+    query = {"equals": {}, "ranges": {}, "sort": "id", "descending": False, "after": None, "limit": None}
 
-    for field in required_fields:
-        if field not in data:
-            missing_fields.append(field)
+    if "category" in args:
+        query["equals"]["category"] = args["category"]
 
-    if missing_fields:
-        return False, f"Missing required fields: {', '.join(missing_fields)}"
-    
-    # If all fields are present, return True with no message
-    return True, None
+    for field, low_param, high_param, convert in (
+        ("price", "min_price", "max_price", _finite_float),
+        ("quantity", "min_quantity", "max_quantity", int),
+        ("date_added", "date_from", "date_to", str),
+    ):
+        bounds = []
+        for param in (low_param, high_param):
+            value = args.get(param)
+            if value is not None:
+                try:
+                    value = convert(value)
+                except ValueError:
+                    return None, f"Invalid value for '{param}'."
+            bounds.append(value)
+        if bounds != [None, None]:
+            query["ranges"][field] = tuple(bounds)
+
+    sort = args.get("sort", "id")
+    if sort.lstrip("-") not in SORTABLE_FIELDS:
+        return None, f"Invalid sort field. Use one of: {', '.join(SORTABLE_FIELDS)}."
+    query["sort"] = sort.lstrip("-")
+    query["descending"] = sort.startswith("-")
+
+    if "limit" in args:
+        try:
+            limit = int(args["limit"])
+        except ValueError:
+            return None, "Invalid value for 'limit'."
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return None, f"'limit' must be between 1 and {MAX_PAGE_SIZE}."
+        query["limit"] = limit
+
+    if "cursor" in args:
+        query["after"] = decode_cursor(args["cursor"], sort)
+        if query["after"] is None:
+            return None, "Invalid cursor."
+
+    return query, None
+
+
+def parse_adjustment(data):
+    """
+    Read the body of a quantity adjustment: {"delta": int, "floor": int}.
+    "floor" is optional and defaults to 0.
+
+    Args:
+        data (dict): The decoded JSON body.
+
+    Returns:
+        tuple:
+            - tuple: (delta, floor), or None if invalid.
+            - str: An error message if the body is invalid.
+    """
+    error_message = ADJUSTMENT.validate(data)
+    if error_message:
+        return None, error_message
+    return (data["delta"], data.get("floor", 0)), None
+
+
+def read_bulk_items(request):
+    """
+    Read the items of a bulk request, sent as a JSON array or as NDJSON
+    (one JSON value per line, with an application/x-ndjson content type).
+
+    Args:
+        request (flask.Request): The incoming request.
+
+    Returns:
+        tuple:
+            - list: The items, or None if the body is invalid.
+            - str: An error message if the body is invalid.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        items = []
+        # Parse the stream line by line instead of buffering the whole body as text
+        for line_number, line in enumerate(request.stream, 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(loads(line))
+            except ValueError:
+                return None, f"Invalid JSON on line {line_number}."
+            if len(items) > MAX_BULK_ITEMS:
+                break
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            return None, "Request body must be a JSON array or NDJSON."
+
+    if not items:
+        return None, "No items in request."
+    if len(items) > MAX_BULK_ITEMS:
+        return None, f"Too many items. The limit is {MAX_BULK_ITEMS} per request."
+    return items, None
+
+
+def generate_batch_error_response(errors):
+    """
+    Reject a whole batch, listing what is wrong with each invalid item.
+
+    Args:
+        errors (list): (index, message) pairs for the invalid items.
+
+    Returns:
+        Flask response: A 400 JSON response.
+    """
+    return jsonify({
+        "error": "Invalid items in batch. Nothing was changed.",
+        "errors": [{"index": index, "error": message} for index, message in errors],
+    }), 400
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Check whether an Accept-Encoding header value allows gzip.
+    """
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() == "gzip":
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def generate_ndjson(products, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Serialize products as NDJSON, one product per line, yielding byte chunks of
+    roughly `chunk_size`. Only one chunk is held in memory at a time.
+
+    Args:
+        products (iterable): The products to serialize.
+        compress (bool): Gzip the output on the fly.
+        chunk_size (int): Approximate size of each chunk before compression.
+
+    Yields:
+        bytes: The next chunk of the response body.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    lines = []
+    size = 0
+    for product in products:
+        line = dumps(product) + b"\n"
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            chunk = b"".join(lines)
+            lines = []
+            size = 0
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
 
+    chunk = b"".join(lines)
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
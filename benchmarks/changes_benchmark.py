@@ -0,0 +1,77 @@
+"""
+Catching up after a few writes: the change feed versus refetching the catalog.
+
+For each number of writes, updates that many random products, then times
+and measures what a client that was up to date before them has to download:
+- full refetch: the whole catalog serialized, as GET /api/products sends it
+  when its cached body is stale
+- changes: the deltas since the client's version, as GET /api/products/changes sends them
+
+Run from the project root:
+    python -m benchmarks.changes_benchmark
+    python -m benchmarks.changes_benchmark --size 100000 --writes 1 10 1000 --output changes.json
+"""
+import argparse
+import random
+import time
+
+from app.changes import ChangeLog
+from app.store import ProductStore
+from app.utils import serialize_json
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import generate_products
+
+
+def time_calls(func, repeat):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20, help="times each download is serialized")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    store = ProductStore(generate_products(args.size, args.seed))
+    change_log = ChangeLog(max(args.writes))
+    store.add_listener(change_log.record)
+    rng = random.Random(args.seed)
+
+    results = {}
+    sizes = {}
+    for writes in args.writes:
+        since = change_log.version
+        for _ in range(writes):
+            store.update(rng.randint(1, args.size), {"price": round(rng.uniform(5, 500), 2)})
+
+        def changes():
+            deltas, version = change_log.since(since)
+            return serialize_json({"version": version, "changes": deltas})
+
+        for name, func in (("full refetch", lambda: serialize_json(store.all())), ("changes", changes)):
+            label = f"{name} after {writes}"
+            results[label], sizes[label] = time_calls(func, args.repeat)
+
+    print(f"{args.size} products")
+    print_results(results)
+    print(f"\n{'download':<28} {'bytes':>12}")
+    for label, size in sizes.items():
+        print(f"{label:<28} {size:>12}")
+
+    if args.output:
+        params = {"size": args.size, "writes": args.writes, "repeat": args.repeat, "seed": args.seed, "bytes": sizes}
+        save(args.output, "changes_benchmark", params, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cost of the JSON codec and request validation (app/codec.py, app/schemas.py).
+
+Each operation is timed twice: once the way the app did it with the standard
+library (json.loads plus a check that the required fields are present,
+json.dumps with sorted keys), and once through the app's codec and the
+compiled schema, which also checks every field's type and range. With
+orjson installed the codec uses it; without it, the "codec" rows show the
+cost of the extra validation alone.
+
+Operations:
+- decode + validate: a POST /api/products body
+- encode product: one product, as GET /api/products/<id> returns it
+- encode page: a 50-product page
+- encode catalog: every product, as GET /api/products returns them
+
+Run from the project root:
+    python -m benchmarks.codec_benchmark
+    python -m benchmarks.codec_benchmark --size 100000 --output codec.json
+"""
+import argparse
+import json
+import time
+
+from app import codec
+from app.records import Product, json_default
+from app.schemas import NEW_PRODUCT
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import generate_products
+
+REQUIRED_FIELDS = list(NEW_PRODUCT.fields)
+
+
+def stdlib_dumps(data):
+    return json.dumps(data, default=json_default, sort_keys=True, separators=(",", ":")).encode()
+
+
+def stdlib_decode_and_check(body):
+    # What the POST handler did before: parse, then only look for missing fields
+    data = json.loads(body)
+    missing = [field for field in REQUIRED_FIELDS if field not in data]
+    return f"Missing required fields: {', '.join(missing)}" if missing else None
+
+
+def codec_decode_and_check(body):
+    return NEW_PRODUCT.validate(codec.loads(body))
+
+
+def time_calls(func, arg, count):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(count):
+        start = time.perf_counter()
+        func(arg)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10_000, help="products in the catalog")
+    parser.add_argument("--ops", type=int, default=20_000, help="calls timed per single-product operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    products = [Product(product, version=1) for product in generate_products(args.size, args.seed)]
+    new_product = {key: value for key, value in products[0].items() if key not in ("id", "version")}
+    body = json.dumps(new_product).encode()
+    page = products[:50]
+    catalog_ops = max(3, 2_000_000 // args.size // 10)
+
+    print(f"codec backend: {codec.BACKEND}, {args.size} products")
+    results = {}
+    for name, func, arg, count in (
+        ("decode + validate", (stdlib_decode_and_check, codec_decode_and_check), body, args.ops),
+        ("encode product", (stdlib_dumps, codec.dumps), products[0], args.ops),
+        ("encode page", (stdlib_dumps, codec.dumps), page, args.ops // 20),
+        ("encode catalog", (stdlib_dumps, codec.dumps), products, catalog_ops),
+    ):
+        baseline, current = func
+        results[f"{name} (json)"] = time_calls(baseline, arg, count)
+        results[f"{name} (codec)"] = time_calls(current, arg, count)
+    print_results(results)
+
+    if args.output:
+        params = {"size": args.size, "ops": args.ops, "seed": args.seed, "backend": codec.BACKEND}
+        save(args.output, "codec_benchmark", params, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare a benchmark results file against a saved baseline and flag regressions.
+
+An operation regresses when its p50, p95 or p99 latency grows, or its
+throughput drops, by more than `--threshold` (10% by default). Latencies below
+`--min-ms` are compared as if they were `--min-ms`, so microsecond-level
+noise doesn't count as a regression. Exits with status 1 if anything regressed.
+
+Run from the project root:
+    python -m benchmarks.service_benchmark --output baseline.json
+    ... make changes ...
+    python -m benchmarks.service_benchmark --output current.json
+    python -m benchmarks.compare baseline.json current.json
+"""
+import argparse
+import sys
+
+from benchmarks.results import load
+
+LATENCIES = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def compare(baseline, current, threshold, min_ms):
+    """
+    Returns:
+        tuple:
+            - list: (operation, metric, baseline value, current value, relative change) rows.
+            - list: The rows that are regressions.
+    """
+    rows, regressions = [], []
+    for operation, before in baseline["results"].items():
+        after = current["results"].get(operation)
+        if after is None:
+            continue
+        for metric in LATENCIES + ("throughput",):
+            old, new = before[metric], after[metric]
+            if metric in LATENCIES:
+                change = max(new, min_ms) / max(old, min_ms) - 1
+                regressed = change > threshold
+            else:
+                change = new / old - 1 if old else 0.0
+                regressed = change < -threshold
+            row = (operation, metric, old, new, change)
+            rows.append(row)
+            if regressed:
+                regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative change (default 0.10)")
+    parser.add_argument("--min-ms", type=float, default=0.05, help="latency noise floor in ms (default 0.05)")
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    if baseline["benchmark"] != current["benchmark"]:
+        sys.exit(f"Can't compare {baseline['benchmark']} results with {current['benchmark']} results.")
+    if baseline["params"] != current["params"]:
+        print(f"warning: parameters differ\n  baseline: {baseline['params']}\n  current:  {current['params']}")
+
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing:
+        print(f"warning: not in the current results: {', '.join(missing)}")
+
+    rows, regressions = compare(baseline, current, args.threshold, args.min_ms)
+    print(f"{'operation':<28} {'metric':<11} {'baseline':>11} {'current':>11} {'change':>8}")
+    for operation, metric, old, new, change in rows:
+        flag = "  REGRESSION" if (operation, metric, old, new, change) in regressions else ""
+        print(f"{operation:<28} {metric:<11} {old:>11.3f} {new:>11.3f} {change:>+7.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Bytes on the wire and CPU per request for the full catalog, GET /api/products,
+with each Accept-Encoding: identity, gzip and br (when `brotli` is installed).
+
+Requests go through the Flask test client, against a store of synthetic
+products swapped in for the service module's store. Each encoding is measured:
+- cached: the same catalog every time, so the body and its compressed
+  variant come from the caches
+- after a write: one product is updated before every request (not timed), so
+  the body is serialized and compressed again each time
+
+CPU is this process's CPU time (`time.process_time`) per request.
+
+Run from the project root:
+    python -m benchmarks.compression_benchmark
+    python -m benchmarks.compression_benchmark --size 100000 --repeat 20 --output compression.json
+"""
+import argparse
+import random
+import time
+
+from app import compression, initialize_app, services
+from app.store import ProductStore
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import make_products
+
+
+def measure(client, encoding, repeat, write=None):
+    """
+    Request the catalog `repeat` times with Accept-Encoding: `encoding`,
+    calling `write` before each request when given.
+
+    Returns:
+        tuple: (latency summary, mean CPU seconds per request, bytes of the last body)
+    """
+    headers = {"Accept-Encoding": encoding}
+    if write is None:
+        client.get("/api/products", headers=headers)  # fill the caches first
+    latencies, cpu = [], 0.0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if write is not None:
+            write()
+        start, start_cpu = time.perf_counter(), time.process_time()
+        response = client.get("/api/products", headers=headers)
+        cpu += time.process_time() - start_cpu
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+        assert response.headers.get("Content-Encoding", "identity") == encoding, response.headers
+    return summarize(latencies, time.perf_counter() - started), cpu / repeat, len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20, help="requests per encoding and case")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    services.store = ProductStore(make_products(args.size, args.seed), indexes=services.make_indexes())
+    services.lock = services.store.lock
+    services.response_cache.clear()
+    client = initialize_app().test_client()
+    rng = random.Random(args.seed)
+
+    def write():
+        services.store.update(rng.randint(1, args.size), {"price": round(rng.uniform(5, 500), 2)})
+
+    results, details = {}, {}
+    for encoding in ("identity", *compression.ENCODINGS):
+        for case, before in (("cached", None), ("after a write", write)):
+            label = f"{encoding}, {case}"
+            results[label], cpu, size = measure(client, encoding, args.repeat, before)
+            details[label] = {"cpu_ms": cpu * 1000, "bytes": size}
+
+    print(f"{args.size} products")
+    print_results(results)
+    print(f"\n{'request':<28} {'CPU ms':>9} {'bytes':>12}")
+    for label, detail in details.items():
+        print(f"{label:<28} {detail['cpu_ms']:>9.3f} {detail['bytes']:>12}")
+
+    if args.output:
+        params = {"size": args.size, "repeat": args.repeat, "seed": args.seed, "requests": details}
+        save(args.output, "compression_benchmark", params, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
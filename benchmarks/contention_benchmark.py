@@ -0,0 +1,114 @@
+"""
+Concurrent stock adjustments on a few hot products.
+
+Many threads add and subtract random amounts to the quantity of a handful of
+products, either with `services.adjust_product_quantity` (atomic) or with the
+read-modify-write a client would do without it: read the product, then write
+back its quantity plus the delta. Both run against the same seeded sequence of
+adjustments, so at the end every product's quantity should equal its starting
+quantity plus the sum of its deltas. Anything else is a lost update.
+
+Run from the project root:
+    python -m benchmarks.contention_benchmark
+    python -m benchmarks.contention_benchmark --threads 16 --hot 4 --ops 20000 --output contention.json
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from app import services
+from app.store import ProductStore
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import make_products
+
+START_QUANTITY = 10**9  # high enough that no adjustment hits the floor
+
+
+def atomic_adjust(item_id, delta):
+    services.adjust_product_quantity(item_id, delta, floor=-START_QUANTITY)
+
+
+def naive_adjust(item_id, delta):
+    current = services.find_product_by_id(item_id)
+    services.update_product(item_id, {"quantity": current["quantity"] + delta})
+
+
+def run(adjust, size, hot, threads, ops, seed):
+    """
+    Apply `ops` adjustments to `hot` products from `threads` threads.
+
+    Returns:
+        tuple:
+            - dict: The latency and throughput summary.
+            - int: How many adjustments were lost.
+    """
+    rng = random.Random(seed)
+    services.store = ProductStore(make_products(size, seed), indexes=services.make_indexes())
+    services.lock = services.store.lock
+    services.response_cache.clear()
+
+    hot_ids = rng.sample(range(1, size + 1), hot)
+    services.update_products([(item_id, {"quantity": START_QUANTITY}) for item_id in hot_ids])
+    work = [[(rng.choice(hot_ids), rng.randint(-5, 5)) for _ in range(ops // threads)] for _ in range(threads)]
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(calls, timings):
+        barrier.wait()
+        for item_id, delta in calls:
+            start = time.perf_counter()
+            adjust(item_id, delta)
+            timings.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=pair) for pair in zip(work, latencies)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    expected = dict.fromkeys(hot_ids, START_QUANTITY)
+    for calls in work:
+        for item_id, delta in calls:
+            expected[item_id] += delta
+    lost = sum(
+        abs(services.find_product_by_id(item_id)["quantity"] - quantity) for item_id, quantity in expected.items()
+    )
+    return summarize([latency for timings in latencies for latency in timings], elapsed), lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10_000, help="products in the catalog")
+    parser.add_argument("--hot", type=int, default=4, help="products being adjusted")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=20_000, help="adjustments in total")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    # Switch threads often, so the naive read-modify-write gets interleaved
+    # the way it would be on a busy server
+    sys.setswitchinterval(1e-5)
+
+    results = {}
+    for name, adjust in (("adjust_product_quantity", atomic_adjust), ("get then update_product", naive_adjust)):
+        results[name], lost = run(adjust, args.size, args.hot, args.threads, args.ops, args.seed)
+        print(f"{name}: quantity off by {lost} in total")
+    print()
+    print_results(results)
+
+    if args.output:
+        params = {
+            "size": args.size, "hot": args.hot, "threads": args.threads, "ops": args.ops, "seed": args.seed,
+        }
+        save(args.output, "contention_benchmark", params, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
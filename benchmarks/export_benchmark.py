@@ -0,0 +1,55 @@
+"""
+Peak memory and time to first byte of a full-catalog listing: one `jsonify`
+style JSON document versus the chunked NDJSON export. Timings are taken with
+tracemalloc running, so compare them with each other rather than with
+production numbers.
+
+Run from the project root:
+    python -m benchmarks.export_benchmark
+    python -m benchmarks.export_benchmark --sizes 10000 100000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from app.utils import generate_ndjson
+from benchmarks.store_benchmark import make_products
+
+
+def measure(serialize):
+    """
+    Run `serialize` and return (peak traced memory in MB, seconds to first chunk, total seconds).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_chunk = None
+    for _ in serialize():
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2**20, first_chunk, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    args = parser.parse_args()
+
+    print(f"{'products':>10} {'mode':>12} {'peak MB':>10} {'TTFB ms':>10} {'total ms':>10}")
+    for size in args.sizes:
+        snapshot = make_products(size)
+        modes = {
+            "json": lambda: [json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode()],
+            "ndjson": lambda: generate_ndjson(snapshot),
+            "ndjson+gzip": lambda: generate_ndjson(snapshot, compress=True),
+        }
+        for mode, serialize in modes.items():
+            peak, first_chunk, total = measure(serialize)
+            print(f"{size:>10} {mode:>12} {peak:>10.1f} {first_chunk * 1000:>10.1f} {total * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Closed-loop HTTP load generator for comparing serving modes at high concurrency.
+
+Opens `--connections` keep-alive connections and has each one send GET
+requests back to back for `--duration` seconds, then reports throughput and
+latency percentiles. Start the server separately, e.g.:
+
+    python app.py --mode threaded --port 5000 &
+    python -m benchmarks.http_benchmark --connections 1000 --path /api/products/1
+"""
+import argparse
+import asyncio
+import time
+
+
+async def worker(host, port, request, deadline, latencies, errors):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        errors.append("connect")
+        return
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if not status_line.startswith(b"HTTP/1.1 2"):
+                errors.append(status_line.strip())
+            latencies.append(time.perf_counter() - start)
+    except (OSError, asyncio.IncompleteReadError):
+        errors.append("connection")
+    finally:
+        writer.close()
+
+
+async def run(args):
+    request = (
+        f"GET {args.path} HTTP/1.1\r\nHost: {args.host}:{args.port}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode()
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        worker(args.host, args.port, request, deadline, latencies, errors)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"connections={args.connections} requests={len(latencies)} errors={len(errors)}")
+    print(f"throughput: {len(latencies) / elapsed:.0f} req/s")
+    if latencies:
+        for label, quantile in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            print(f"{label}: {latencies[int(quantile * (len(latencies) - 1))] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--path", default="/api/products/1")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=20.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
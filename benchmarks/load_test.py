@@ -0,0 +1,155 @@
+"""
+Headless Locust run of one scenario from locust_tests/locustfile.py, saved as
+p50/p95/p99 latency and throughput JSON for `benchmarks.compare`.
+
+The scenario is fixed by --mix, --seed and --users; --saturate drops the wait
+between requests so every user sends requests back to back. With --serve the
+script starts the server itself (in the given mode, on a free port) and stops
+it afterwards, so each run begins from the same seed catalog.
+
+Run from the project root:
+    python -m benchmarks.load_test --serve threaded --mix read-heavy --saturate --output read-heavy.json
+    python -m benchmarks.load_test --host http://127.0.0.1:5000 --mix write-heavy --users 20
+
+--server-args passes extra options to app.py, e.g. to compare a spike with
+and without admission control:
+    python -m benchmarks.load_test --serve threaded --mix overload --users 200 --saturate
+    python -m benchmarks.load_test --serve threaded --mix overload --users 200 --saturate \
+        --server-args "--max-concurrent 0 --queue-timeout 1000"
+"""
+import argparse
+import csv
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.results import print_results, save
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCUSTFILE = os.path.join(ROOT, "locust_tests", "locustfile.py")
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"The server didn't start listening on port {port} within {timeout}s")
+
+
+def start_server(mode, extra_args=()):
+    """
+    Start `app.py` in the given mode on a free port.
+
+    Args:
+        mode (str): The --mode to start it in.
+        extra_args (list): More command line options for app.py.
+
+    Returns:
+        tuple: (process, base URL)
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "app.py", "--mode", mode, "--port", str(port), *extra_args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process, f"http://127.0.0.1:{port}"
+
+
+def read_stats(path, duration):
+    """
+    Turn Locust's `<prefix>_stats.csv` into results, one entry per request
+    type plus "Aggregated".
+    """
+    results = {}
+    with open(path, newline="", encoding="utf-8") as source:
+        for row in csv.DictReader(source):
+            name = row["Name"] if not row["Type"] else f"{row['Type']} {row['Name']}"
+            count = int(row["Request Count"])
+            if not count:
+                continue
+            results[name] = {
+                "count": count,
+                "failures": int(row["Failure Count"]),
+                "p50_ms": float(row["50%"]),
+                "p95_ms": float(row["95%"]),
+                "p99_ms": float(row["99%"]),
+                "throughput": count / duration,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--host", help="base URL of a running server")
+    target.add_argument("--serve", choices=["threaded", "single", "async"], help="start app.py in this mode")
+    parser.add_argument("--server-args", default="", help="extra options for app.py, with --serve")
+    parser.add_argument("--mix", choices=["read-heavy", "mixed", "write-heavy", "overload"], default="mixed")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=int, default=30, help="seconds")
+    parser.add_argument("--saturate", action="store_true", help="no wait time between requests")
+    parser.add_argument("--wait", type=float, default=1.0, help="seconds between a user's requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    server, host = None, args.host
+    if args.serve:
+        server, host = start_server(args.serve, shlex.split(args.server_args))
+
+    environment = dict(
+        os.environ,
+        LOCUST_MIX=args.mix,
+        LOCUST_SEED=str(args.seed),
+        LOCUST_WAIT="0" if args.saturate else str(args.wait),
+    )
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, "locust")
+            locust = subprocess.run([
+                sys.executable, "-m", "locust", "-f", LOCUSTFILE, "--headless",
+                "--host", host, "--users", str(args.users), "--spawn-rate", str(args.users),
+                "--run-time", f"{args.duration}s", "--csv", prefix, "--only-summary",
+                "--loglevel", "WARNING", "--exit-code-on-error", "0",
+            ], env=environment, capture_output=True, text=True)
+            if locust.returncode:
+                sys.exit(f"locust failed:\n{locust.stderr}")
+            results = read_stats(f"{prefix}_stats.csv", args.duration)
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+    print_results(results)
+    if args.output:
+        params = {
+            "mix": args.mix, "users": args.users, "duration": args.duration, "seed": args.seed,
+            "wait": 0.0 if args.saturate else args.wait, "server": args.serve or args.host,
+            "server_args": args.server_args,
+        }
+        save(args.output, "load_test", params, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Memory footprint of the product store, and the speed of scans over it.
+
+For each size, a child process builds a store of synthetic products and reports:
+- the bytes per product taken by the records and the id index alone
+  (tracemalloc, with no secondary indexes),
+- the growth of the process's resident set size (RSS) once the store has
+  every index the server uses,
+- the latency of full-list and filter scans.
+
+Each size runs in its own process so memory freed by one size doesn't hide
+the growth of the next.
+
+Run from the project root:
+    python -m benchmarks.memory_benchmark
+    python -m benchmarks.memory_benchmark --sizes 100000 1000000 --output memory.json
+"""
+import argparse
+import gc
+import multiprocessing
+import random
+import time
+import tracemalloc
+
+from app import services
+from app.store import ProductStore
+from app.utils import serialize_json
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import generate_products
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * 4096
+
+
+def time_calls(func, args_list):
+    latencies = []
+    started = time.perf_counter()
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def measure(size, ops, seed):
+    """
+    Returns:
+        tuple:
+            - dict: "record_bytes" and "rss_bytes", per product.
+            - dict: Scan name -> latency and throughput summary.
+    """
+    # Records only. Products are generated one at a time, so only the store's copies stay alive.
+    tracemalloc.start()
+    store = ProductStore(generate_products(size, seed))
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    store = None
+    gc.collect()
+
+    before = rss_bytes()
+    store = ProductStore(generate_products(size, seed), indexes=services.make_indexes())
+    gc.collect()
+    memory = {"record_bytes": record_bytes / size, "rss_bytes": (rss_bytes() - before) / size}
+
+    rng = random.Random(seed)
+    full_scans = max(3, min(ops, 2_000_000 // size))
+    results = {
+        "all": time_calls(store.all, [()] * full_scans),
+        "serialize all": time_calls(lambda: serialize_json(store.all()), [()] * max(3, full_scans // 10)),
+        # 50-product pages where every candidate is checked against a range on another field
+        "price range by quantity": time_calls(
+            lambda low: store.query(ranges={"price": (low, low + 100)}, sort="quantity", limit=50),
+            [(rng.uniform(5, 400),) for _ in range(ops)],
+        ),
+        "category + price by date": time_calls(
+            lambda low: store.query({"category": "Category 3"}, {"price": (low, low + 50)}, sort="date_added", limit=50),
+            [(rng.uniform(5, 450),) for _ in range(ops)],
+        ),
+        # Walks the whole price index checking quantity on every product
+        "quantity filter scan": time_calls(
+            lambda low: store.query(ranges={"quantity": (low, low + 5)}, sort="price"),
+            [(rng.randint(0, 95),) for _ in range(full_scans)],
+        ),
+    }
+    return memory, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=1_000, help="calls timed per paged query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the scan timings as JSON")
+    args = parser.parse_args()
+
+    combined = {}
+    context = multiprocessing.get_context("fork")
+    for size in args.sizes:
+        with context.Pool(1) as pool:
+            memory, results = pool.apply(measure, (size, args.ops, args.seed))
+        print(f"\n{size} products")
+        print(f"records: {memory['record_bytes']:.0f} bytes/product (tracemalloc)")
+        print(f"store with indexes: {memory['rss_bytes']:.0f} bytes/product RSS, "
+              f"{memory['rss_bytes'] * size / 2**20:.0f} MB")
+        print_results(results)
+        combined.update({f"{name} @{size}": stats for name, stats in results.items()})
+
+    if args.output:
+        save(args.output, "memory_benchmark", {"sizes": args.sizes, "ops": args.ops, "seed": args.seed}, combined)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
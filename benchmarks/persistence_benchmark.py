@@ -0,0 +1,105 @@
+"""
+Write throughput and cold-start time of the persistence backends.
+
+Throughput: `--threads` writers update random products for `--writes` updates
+in total. With fsync on, group commit is what lets concurrent writers go
+faster than one fsync per write.
+
+Cold start: time to open a catalog of `--size` products that is already on
+disk, loading it and building every index, as a restarted server would.
+
+Run from the project root:
+    python -m benchmarks.persistence_benchmark
+    python -m benchmarks.persistence_benchmark --size 1000000 --threads 1 16
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from app.indexes import HashIndex, SortedIndex, numeric_key, text_key
+from app.persistence import MemoryBackend, SQLiteBackend, WALBackend
+from app.search import SearchIndex
+from app.store import ProductStore
+from benchmarks.store_benchmark import make_products
+
+BACKENDS = {
+    "memory": lambda directory: MemoryBackend(),
+    "wal": lambda directory: WALBackend(os.path.join(directory, "wal")),
+    "wal (no fsync)": lambda directory: WALBackend(os.path.join(directory, "wal"), fsync=False),
+    "sqlite": lambda directory: SQLiteBackend(os.path.join(directory, "products.sqlite3")),
+    "sqlite (normal)": lambda directory: SQLiteBackend(os.path.join(directory, "products.sqlite3"), "NORMAL"),
+}
+
+
+def make_indexes():
+    return {
+        "category": HashIndex("category"),
+        "price": SortedIndex("price", numeric_key),
+        "quantity": SortedIndex("quantity", numeric_key),
+        "date_added": SortedIndex("date_added", text_key),
+        "search": SearchIndex(),
+    }
+
+
+def write_throughput(store, size, writes, threads, seed):
+    """
+    Returns:
+        float: Updates per second across all writer threads.
+    """
+    def writer(count, seed):
+        rng = random.Random(seed)
+        for _ in range(count):
+            store.update(rng.randint(1, size), {"quantity": rng.randint(0, 100)})
+
+    workers = [
+        threading.Thread(target=writer, args=(writes // threads, seed + n))
+        for n in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return writes // threads * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    header = " ".join(f"{f'{threads} thr w/s':>12}" for threads in args.threads)
+    print(f"{'backend':>16} {header} {'cold start s':>13}")
+    for name in args.backends:
+        directory = tempfile.mkdtemp(prefix="persistence-benchmark-")
+        try:
+            store = ProductStore(make_products(args.size, args.seed), make_indexes(), BACKENDS[name](directory))
+            rates = [write_throughput(store, args.size, args.writes, threads, args.seed) for threads in args.threads]
+            store.close()
+            store = None  # only one catalog in memory at a time
+
+            start = time.perf_counter()
+            store = ProductStore((), make_indexes(), BACKENDS[name](directory))
+            cold_start = time.perf_counter() - start
+            store.close()
+            reloaded, store = len(store), None
+            if name == "memory":
+                cold_start = float("nan")  # nothing to load
+            elif reloaded != args.size:
+                raise RuntimeError(f"{name} reloaded {reloaded} of {args.size} products")
+
+            print(f"{name:>16} {' '.join(f'{rate:>12.0f}' for rate in rates)} {cold_start:>13.2f}")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Aggregate read throughput of a primary plus read replicas, as followers are added.
+
+For each follower count, starts a primary and that many followers
+(`app.py --follow`) on free local ports, waits until every follower has
+caught up, then runs a closed-loop GET load with `--connections` keep-alive
+connections spread evenly over all the nodes. While it runs, `--write-rate`
+updates per second go to the primary, and each follower's lag is read at
+the end.
+
+Every node is a separate process, so the numbers only scale with followers
+when the machine has a core for each of them (and for this load generator).
+
+Run from the project root:
+    python -m benchmarks.replication_benchmark
+    python -m benchmarks.replication_benchmark --followers 0 1 2 3 --duration 10 --output replication.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import signal
+import time
+import urllib.request
+
+from tornado.httpclient import AsyncHTTPClient
+
+from benchmarks.http_benchmark import worker
+from benchmarks.load_test import start_server
+from benchmarks.results import print_results, save, summarize
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.load(response)
+
+
+def wait_until_synced(primary, followers, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        version = get_json(f"{primary}/api/replication")["version"]
+        if all(get_json(f"{follower}/api/replication")["version"] == version for follower in followers):
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"The followers didn't catch up with the primary within {timeout}s")
+
+
+async def write_load(primary, rate, deadline, seed):
+    # Price updates on the primary, so the followers have changes to apply
+    client = AsyncHTTPClient()
+    rng = random.Random(seed)
+    ids = [product["id"] for product in get_json(f"{primary}/api/products?limit=100")]
+    writes = 0
+    while rate and time.perf_counter() < deadline:
+        body = json.dumps({"price": round(rng.uniform(5, 500), 2)})
+        await client.fetch(f"{primary}/api/products/{rng.choice(ids)}", method="PUT", body=body,
+                           headers={"Content-Type": "application/json"}, raise_error=False)
+        writes += 1
+        await asyncio.sleep(1 / rate)
+    return writes
+
+
+async def read_load(nodes, path, connections, duration, write_rate, seed):
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    workers = []
+    for number in range(connections):
+        host, port = nodes[number % len(nodes)].rsplit("//", 1)[1].split(":")
+        request = f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: keep-alive\r\n\r\n".encode()
+        workers.append(worker(host, int(port), request, deadline, latencies, errors))
+    writes, *_ = await asyncio.gather(write_load(nodes[0], write_rate, deadline, seed), *workers)
+    return summarize(latencies, time.perf_counter() - started), len(errors), writes
+
+
+def measure(followers, args):
+    server_args = ["--max-concurrent", "0"]  # compare raw capacity, not admission control
+    processes = []
+    try:
+        primary_process, primary = start_server(args.mode, server_args)
+        processes.append(primary_process)
+        replicas = []
+        for _ in range(followers):
+            process, url = start_server(args.mode, [*server_args, "--follow", primary])
+            processes.append(process)
+            replicas.append(url)
+        wait_until_synced(primary, replicas)
+
+        result, errors, writes = asyncio.run(
+            read_load([primary, *replicas], args.path, args.connections, args.duration, args.write_rate, args.seed)
+        )
+        lags = [get_json(f"{replica}/api/replication") for replica in replicas]
+        return result, errors, writes, lags
+    finally:
+        for process in processes:
+            process.send_signal(signal.SIGTERM)
+        for process in processes:
+            process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--followers", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--mode", choices=["threaded", "single", "async"], default="async")
+    parser.add_argument("--path", default="/api/products/1")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--write-rate", type=float, default=10.0, help="updates per second sent to the primary")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for followers in args.followers:
+        result, errors, writes, lags = measure(followers, args)
+        results[f"reads, {followers} followers"] = result
+        print(f"\n{followers} followers: {errors} errors, {writes} writes to the primary")
+        for number, lag in enumerate(lags, 1):
+            print(f"  follower {number}: {lag['lag_versions']} versions, {lag['lag_seconds']:.3f}s behind")
+    print()
+    print_results(results)
+
+    if args.output:
+        params = {key: value for key, value in vars(args).items() if key != "output"}
+        save(args.output, "replication_benchmark", params, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
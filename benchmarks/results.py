@@ -0,0 +1,80 @@
+"""
+Saving benchmark results as JSON, in the format `benchmarks.compare` reads.
+
+A results file looks like:
+
+    {
+      "benchmark": "service_benchmark",
+      "params": {"size": 100000, "seed": 42, ...},
+      "results": {
+        "<operation>": {"count": 1000, "p50_ms": 0.01, "p95_ms": 0.02, "p99_ms": 0.03, "throughput": 81234.5},
+        ...
+      }
+    }
+"""
+import json
+import platform
+import sys
+import time
+
+
+def percentile(sorted_values, quantile):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    return sorted_values[int(quantile * (len(sorted_values) - 1))]
+
+
+def summarize(latencies, elapsed):
+    """
+    Summarize per-request latencies.
+
+    Args:
+        latencies (list): Latencies in seconds.
+        elapsed (float): Wall-clock seconds the requests took in total.
+
+    Returns:
+        dict: count, p50_ms, p95_ms, p99_ms and throughput (requests per second).
+    """
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def print_results(results):
+    width = max([28, *map(len, results)])
+    print(f"{'operation':<{width}} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>11}")
+    for name, stats in results.items():
+        print(
+            f"{name:<{width}} {stats['count']:>8} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f}"
+            f" {stats['p99_ms']:>9.3f} {stats['throughput']:>11.1f}"
+        )
+
+
+def save(path, benchmark, params, results):
+    """
+    Write results to `path`, with the parameters and machine they came from.
+    """
+    document = {
+        "benchmark": benchmark,
+        "params": params,
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2, sort_keys=True)
+        output.write("\n")
+
+
+def load(path):
+    with open(path, encoding="utf-8") as source:
+        return json.load(source)
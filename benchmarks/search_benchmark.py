@@ -0,0 +1,80 @@
+"""
+Latency of full-text product search.
+
+Run from the project root:
+    python -m benchmarks.search_benchmark
+    python -m benchmarks.search_benchmark --size 10000 --queries 2000
+"""
+import argparse
+import random
+import string
+import time
+
+from app.search import SearchIndex
+
+
+def make_vocabulary(rng, count):
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(count)]
+
+
+def make_products(rng, vocabulary, count):
+    """
+    Build `count` products whose text fields draw words from `vocabulary`
+    with a skewed (roughly Zipfian) distribution, like real catalog text.
+    """
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    categories = [f"{word} {rng.choice(vocabulary)}" for word in rng.sample(vocabulary, 30)]
+    return [
+        {
+            "id": i,
+            "name": " ".join(rng.choices(vocabulary, weights, k=3)),
+            "description": " ".join(rng.choices(vocabulary, weights, k=15)),
+            "category": rng.choice(categories),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="number of products")
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000, help="number of distinct words")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    products = make_products(rng, vocabulary, args.size)
+
+    start = time.perf_counter()
+    index = SearchIndex()
+    index.build(products)
+    print(f"built index over {args.size} products in {time.perf_counter() - start:.2f}s")
+
+    # Queries are taken from real product names, typed out word by word
+    samples = []
+    for product in rng.choices(products, k=args.queries):
+        words = product["name"].split()
+        typed = " ".join(words[:rng.randint(1, len(words))])
+        samples.append(typed[:rng.randint(max(3, len(typed) - 4), len(typed))])
+
+    latencies = []
+    for text in samples:
+        start = time.perf_counter()
+        index.search(text, limit=20)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+
+    for label, quantile in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}: {latencies[int(quantile * (len(latencies) - 1))]:.1f} us")
+
+    start = time.perf_counter()
+    for product in products[:1000]:
+        index.remove(product)
+        index.add(product)
+    print(f"reindex one product: {(time.perf_counter() - start) / 1000 * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Latency and throughput of every function in app/services.py at different
+catalog sizes.
+
+Each size gets a fresh store of synthetic products, swapped in for the
+service module's store. Call arguments come from a seeded generator, so two
+runs with the same options make exactly the same calls. Save the results
+with --output and check them against a baseline with `benchmarks.compare`.
+
+Run from the project root:
+    python -m benchmarks.service_benchmark
+    python -m benchmarks.service_benchmark --sizes 1000 100000 --ops 2000 --output results.json
+"""
+import argparse
+import random
+import time
+
+from app import services
+from app.changes import ChangeLog
+from app.store import ProductStore
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import make_products
+
+BATCH_SIZE = 100  # items per call for the bulk functions
+
+
+def time_calls(func, args_list):
+    """
+    Call `func` once per argument tuple, timing every call.
+
+    Returns:
+        dict: The summary from `benchmarks.results.summarize`.
+    """
+    latencies = []
+    started = time.perf_counter()
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def adjust_quantity(item_id, delta):
+    # Taking out more than is in stock is a normal outcome, not a failure
+    try:
+        services.adjust_product_quantity(item_id, delta)
+    except services.InsufficientStock:
+        pass
+
+
+def new_product(rng):
+    return {
+        "name": f"Benchmark Product {rng.randrange(10**6)}",
+        "price": round(rng.uniform(5, 500), 2),
+        "quantity": rng.randint(0, 100),
+        "description": "Synthetic product used for benchmarking",
+        "category": f"Category {rng.randrange(20)}",
+        "date_added": "2024-06-01",
+        "image_url": "https://via.placeholder.com/150",
+    }
+
+
+def run(size, ops, seed):
+    """
+    Benchmark every service function against a catalog of `size` products.
+
+    Returns:
+        dict: Operation name -> latency and throughput summary.
+    """
+    rng = random.Random(seed)
+    services.store = ProductStore(make_products(size, seed), indexes=services.make_indexes())
+    services.lock = services.store.lock
+    services.response_cache.clear()
+    services.change_log = ChangeLog(services.CHANGE_LOG_SIZE)
+    services.store.add_listener(services.change_log.record)
+
+    def ids(count):
+        return [(rng.randint(1, size),) for _ in range(count)]
+
+    full_list_ops = max(3, min(ops, 200_000 // size))
+    batches = max(1, ops // BATCH_SIZE)
+    results = {
+        "find_product_by_id": time_calls(services.find_product_by_id, ids(ops)),
+        "find_product_response": time_calls(services.find_product_response, ids(ops)),
+        "fetch_all_products": time_calls(services.fetch_all_products, [()] * full_list_ops),
+        "fetch_all_products_response": time_calls(services.fetch_all_products_response, [()] * full_list_ops),
+        "query_products (price)": time_calls(
+            lambda low: services.query_products(ranges={"price": (low, None)}, sort="price", limit=50),
+            [(rng.uniform(5, 400),) for _ in range(ops)],
+        ),
+        "query_products (category)": time_calls(
+            lambda category: services.query_products({"category": category}, limit=50),
+            [(f"Category {rng.randrange(20)}",) for _ in range(ops)],
+        ),
+        "search_products": time_calls(
+            services.search_products,
+            [(f"product {rng.randint(1, size)}"[:rng.randint(9, 14)],) for _ in range(ops)],
+        ),
+        "find_product_image": time_calls(services.find_product_image, ids(ops)),
+        "product_stats_response": time_calls(services.product_stats_response, [()] * ops),
+        "product_stats_response (category)": time_calls(services.product_stats_response, [("category",)] * ops),
+        "add_product": time_calls(services.add_product, [(new_product(rng),) for _ in range(ops)]),
+        "update_product": time_calls(
+            services.update_product, [(item_id, {"quantity": rng.randint(0, 100)}) for (item_id,) in ids(ops)]
+        ),
+        "adjust_product_quantity": time_calls(
+            adjust_quantity, [(item_id, rng.choice([-1, 1]) * rng.randint(1, 5)) for (item_id,) in ids(ops)]
+        ),
+        # Polling clients a few writes behind, right after the single-product writes above
+        "fetch_changes": time_calls(
+            lambda behind: services.fetch_changes(services.changes_version() - behind),
+            [(rng.randint(1, 100),) for _ in range(ops)],
+        ),
+        "add_products": time_calls(
+            services.add_products, [([new_product(rng) for _ in range(BATCH_SIZE)],) for _ in range(batches)]
+        ),
+        "update_products": time_calls(
+            services.update_products,
+            [([(item_id, {"price": 9.99}) for (item_id,) in ids(BATCH_SIZE)],) for _ in range(batches)],
+        ),
+    }
+    # Deletes take distinct ids, so every call removes a product
+    doomed = rng.sample(range(1, size + 1), min(size, ops + batches * BATCH_SIZE))
+    results["delete_product"] = time_calls(services.delete_product, [(item_id,) for item_id in doomed[:ops]])
+    results["delete_products"] = time_calls(services.delete_products, [
+        (doomed[ops + start:ops + start + BATCH_SIZE],) for start in range(0, len(doomed) - ops, BATCH_SIZE)
+    ] or [([],)])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--ops", type=int, default=2_000, help="calls timed per function")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    combined = {}
+    for size in args.sizes:
+        print(f"\n{size} products")
+        results = run(size, args.ops, args.seed)
+        print_results(results)
+        combined.update({f"{name} @{size}": stats for name, stats in results.items()})
+
+    if args.output:
+        save(args.output, "service_benchmark", {"sizes": args.sizes, "ops": args.ops, "seed": args.seed}, combined)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
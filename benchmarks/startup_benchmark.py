@@ -0,0 +1,114 @@
+"""
+Cold start: how long a new worker takes to import the app and answer its
+first request.
+
+Measures, over `--runs` fresh processes each:
+- import: `python -X importtime -c "import app"`, the cumulative import time
+  of the app package (the slowest modules of the last run are listed too)
+- first response: from spawning `app.py` to the first 200 from `--path`
+- first spec, cold / warm: from spawning `app.py` to the first 200 from
+  /apispec_1.json, with an empty spec cache and with the cache left by the
+  previous run
+
+Run from the project root:
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --runs 20 --output startup.json
+"""
+import argparse
+import http.client
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.load_test import ROOT, free_port
+from benchmarks.results import print_results, save, summarize
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times():
+    """
+    Returns:
+        tuple: (seconds to import the app package, [(self seconds, module), ...] slowest first)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    total, modules = None, []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        own, cumulative, indent, name = match.groups()
+        modules.append((int(own) / 1e6, name))
+        if name == "app" and len(indent) == 1:  # the top-level import, not a nested one
+            total = int(cumulative) / 1e6
+    return total, sorted(modules, reverse=True)
+
+
+def time_to_first_response(path, args, env):
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "app.py", "--mode", args.mode, "--port", str(port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < 60:
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                connection.request("GET", path)
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"No response from {path} within 60s")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--mode", choices=["threaded", "single", "async"], default="threaded")
+    parser.add_argument("--path", default="/api/products/1")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    spec_cache = tempfile.mkdtemp(prefix="apispec-")
+    env = {**os.environ, "SPEC_CACHE_DIR": spec_cache}
+    timings = {"import": [], "first response": [], "first spec, cold": [], "first spec, warm": []}
+    started = time.perf_counter()
+    try:
+        for _ in range(args.runs):
+            total, modules = import_times()
+            timings["import"].append(total)
+            timings["first response"].append(time_to_first_response(args.path, args, env))
+            shutil.rmtree(spec_cache, ignore_errors=True)
+            timings["first spec, cold"].append(time_to_first_response("/apispec_1.json", args, env))
+            timings["first spec, warm"].append(time_to_first_response("/apispec_1.json", args, env))
+    finally:
+        shutil.rmtree(spec_cache, ignore_errors=True)
+    elapsed = time.perf_counter() - started
+    results = {name: summarize(values, elapsed) for name, values in timings.items()}
+
+    print("slowest imports (self time) of the last run:")
+    for seconds, name in modules[:args.top]:
+        print(f"  {seconds * 1000:8.2f} ms  {name}")
+    print()
+    print_results(results)
+
+    if args.output:
+        save(args.output, "startup_benchmark", {"runs": args.runs, "mode": args.mode, "path": args.path}, results)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
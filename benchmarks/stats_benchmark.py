@@ -0,0 +1,85 @@
+"""
+Catalog statistics: reading the running totals versus recomputing them.
+
+For each size, builds a store with the server's indexes and times:
+- stats / stats by category: reading the StatsIndex (what GET /api/products/stats does)
+- recompute / recompute by category: the full-scan `compute_stats`
+  (NumPy when installed)
+- update with stats / update without stats: a price change, with and without
+  the StatsIndex registered, to show what keeping the totals costs a write
+
+After the writes, checks that the running totals still match a recompute.
+
+Run from the project root:
+    python -m benchmarks.stats_benchmark
+    python -m benchmarks.stats_benchmark --sizes 100000 1000000 --output stats.json
+"""
+import argparse
+import random
+import time
+
+from app import services, stats
+from app.stats import compute_stats, stats_match
+from app.store import ProductStore
+from benchmarks.results import print_results, save, summarize
+from benchmarks.store_benchmark import generate_products
+
+
+def time_calls(func, args_list):
+    latencies = []
+    started = time.perf_counter()
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def measure(size, ops, seed):
+    store = ProductStore(generate_products(size, seed), indexes=services.make_indexes())
+    indexes = services.make_indexes()
+    del indexes["stats"]
+    plain_store = ProductStore(generate_products(size, seed), indexes=indexes)
+
+    rng = random.Random(seed)
+    scans = max(3, min(ops, 2_000_000 // size))
+    updates = [(rng.randint(1, size), round(rng.uniform(5, 500), 2)) for _ in range(ops)]
+    results = {
+        "stats": time_calls(store.stats, [()] * ops),
+        "stats by category": time_calls(store.stats, [("category",)] * ops),
+        "recompute": time_calls(lambda: compute_stats(store.all()), [()] * scans),
+        "recompute by category": time_calls(lambda: compute_stats(store.all(), "category"), [()] * scans),
+        "update with stats": time_calls(lambda item_id, price: store.update(item_id, {"price": price}), updates),
+        "update without stats": time_calls(
+            lambda item_id, price: plain_store.update(item_id, {"price": price}), updates
+        ),
+    }
+    matches = all(
+        stats_match(store.stats(group_by), compute_stats(store.all(), group_by)) for group_by in (None, "category")
+    )
+    return results, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--ops", type=int, default=1_000, help="calls timed per read and write operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    print(f"recompute uses {'NumPy' if stats.numpy is not None else 'pure Python'}")
+    combined = {}
+    for size in args.sizes:
+        results, matches = measure(size, args.ops, args.seed)
+        print(f"\n{size} products, running totals {'match' if matches else 'DO NOT match'} a recompute")
+        print_results(results)
+        combined.update({f"{name} @{size}": value for name, value in results.items()})
+
+    if args.output:
+        save(args.output, "stats_benchmark", {"sizes": args.sizes, "ops": args.ops, "seed": args.seed}, combined)
+        print(f"\nsaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
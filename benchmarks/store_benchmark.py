@@ -0,0 +1,97 @@
+"""
+Per-operation latency of the product store at different catalog sizes.
+
+Run from the project root:
+    python -m benchmarks.store_benchmark
+    python -m benchmarks.store_benchmark --sizes 1000 100000 --ops 5000
+"""
+import argparse
+import random
+import time
+
+from app.indexes import HashIndex, SortedIndex, numeric_key, text_key
+from app.store import ProductStore
+
+OPS = ("get", "update", "insert", "delete", "all", "price page", "cat. page")
+
+
+def generate_products(count, seed=0):
+    """
+    Yield `count` synthetic products with ids 1..count, one at a time.
+    """
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        yield {
+            "id": i,
+            "name": f"Product {i}",
+            "price": round(rng.uniform(5, 500), 2),
+            "quantity": rng.randint(0, 100),
+            "description": "Synthetic product used for benchmarking",
+            "category": f"Category {rng.randrange(20)}",
+            "date_added": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "image_url": "https://via.placeholder.com/150",
+        }
+
+
+def make_products(count, seed=0):
+    """
+    Build `count` synthetic products with ids 1..count.
+    """
+    return list(generate_products(count, seed))
+
+
+def time_op(func, args_list):
+    """
+    Run `func` once per argument tuple and return the mean latency in microseconds.
+    """
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def run(size, ops, seed):
+    rng = random.Random(seed)
+    store = ProductStore(make_products(size, seed), indexes={
+        "category": HashIndex("category"),
+        "price": SortedIndex("price", numeric_key),
+        "quantity": SortedIndex("quantity", numeric_key),
+        "date_added": SortedIndex("date_added", text_key),
+    })
+    ids = [rng.randint(1, size) for _ in range(ops)]
+    new_product = make_products(1)[0]
+
+    results = {
+        "get": time_op(store.get, [(i,) for i in ids]),
+        "update": time_op(store.update, [(i, {"quantity": 1}) for i in ids]),
+        "insert": time_op(store.insert, [(new_product,)] * ops),
+        "delete": time_op(store.delete, [(i,) for i in set(ids)]),
+        "all": time_op(store.all, [()] * max(1, ops // 1000)),
+        # 50-product pages: a price range sorted by price, and one category by id
+        "price page": time_op(
+            lambda low: store.query(ranges={"price": (low, None)}, sort="price", limit=50),
+            [(rng.uniform(5, 400),) for _ in range(ops // 10)],
+        ),
+        "cat. page": time_op(
+            lambda after: store.query({"category": "Category 3"}, after=((0, after), after), limit=50),
+            [(rng.randint(1, size // 2),) for _ in range(ops // 10)],
+        ),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=10_000, help="operations timed per measurement")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'products':>10} " + " ".join(f"{name + ' (us)':>15}" for name in OPS))
+    for size in args.sizes:
+        results = run(size, args.ops, args.seed)
+        print(f"{size:>10} " + " ".join(f"{value:>15.2f}" for value in results.values()))
+
+
+if __name__ == "__main__":
+    main()
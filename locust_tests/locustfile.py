@@ -1,93 +1,154 @@
-from locust import HttpUser, task, between
+"""
+Locust scenarios for the product API.
+
+Runs are reproducible: every simulated user draws its requests from its own
+random generator, seeded from LOCUST_SEED and the user's number, and keeps its
+own list of the products it created. The request mix and the wait between
+requests are fixed by environment variables:
+
+    LOCUST_MIX    read-heavy, mixed (the default), write-heavy or overload;
+                  see MIXES
+    LOCUST_WAIT   seconds between a user's requests (default 1); 0 saturates
+                  the server, with every user sending requests back to back
+    LOCUST_SEED   base seed (default 42)
+
+Requests that admission control turns away (429 or 503 with Retry-After)
+are not failures: they are counted under "<name> [rejected]", so the
+latency of each request type only covers the requests the server admitted.
+The overload mix adds full listings (bulk requests) to show reads keeping
+a bounded p99 while the server sheds load:
+
+    python -m benchmarks.load_test --serve threaded --mix overload --users 200 --saturate
+
+Interactive:   locust -f locust_tests/locustfile.py
+Headless:      python -m benchmarks.load_test --mix read-heavy --users 50
+"""
+import itertools
+import os
 import random
 
+from locust import HttpUser, constant, task
+
+# Relative weight of each request type in a scenario
+MIXES = {
+    "read-heavy": {"get": 70, "list page": 15, "search": 10, "create": 3, "update": 2, "delete": 0},
+    "mixed": {"get": 40, "list page": 15, "search": 10, "create": 15, "update": 15, "delete": 5},
+    "write-heavy": {"get": 15, "list page": 5, "search": 0, "create": 35, "update": 35, "delete": 10},
+    "overload": {"get": 45, "list page": 10, "search": 10, "list all": 10, "create": 10, "update": 10, "delete": 5},
+}
+
+MIX = os.environ.get("LOCUST_MIX", "mixed")
+WAIT = float(os.environ.get("LOCUST_WAIT", "1"))
+SEED = int(os.environ.get("LOCUST_SEED", "42"))
+
+SEARCH_TERMS = ["wireless", "board", "head", "kitchen", "test product", "updated", "safe"]
+
+# Numbers users in the order they start, so user N always gets the same seed
+_user_numbers = itertools.count()
+
+
 class ProductManagementUser(HttpUser):
-    wait_time = between(1, 2)  # Wait 1-2 seconds between tasks
-    product_ids = []  # Shared list of product IDs for the user
+    wait_time = constant(WAIT)
+
+    def on_start(self):
+        if MIX not in MIXES:
+            raise ValueError(f"Unknown LOCUST_MIX '{MIX}', expected one of {', '.join(MIXES)}")
+        self.rng = random.Random(SEED * 100003 + next(_user_numbers))
+        self.product_ids = []  # the products this user created and hasn't deleted
+        names, weights = zip(*MIXES[MIX].items())
+        self.actions = [getattr(self, name.replace(" ", "_")) for name in names]
+        self.weights = weights
 
     @task
-    def add_product(self):
+    def step(self):
         """
-        Test POST /api/products
+        Pick the next request from the scenario's mix with this user's generator.
         """
-        payload = {
-            "name": f"Test Product {random.randint(1, 1000)}",
-            "price": random.uniform(5.0, 500.0),  # Random price between $5 and $500
-            "quantity": random.randint(1, 100),  # Random quantity between 1 and 100
+        self.rng.choices(self.actions, self.weights)[0]()
+
+    def _payload(self):
+        return {
+            "name": f"Test Product {self.rng.randint(1, 1000)}",
+            "price": round(self.rng.uniform(5.0, 500.0), 2),
+            "quantity": self.rng.randint(1, 100),
             "description": "A product for load testing",
-            "category": "Test Category",
+            "category": f"Test Category {self.rng.randint(1, 10)}",
             "date_added": "2024-12-09",
             "image_url": "https://via.placeholder.com/150"
         }
-        headers = {"Content-Type": "application/json"}
-        response = self.client.post("/api/products", json=payload, headers=headers)
 
-        if response.status_code == 201:
-            product = response.json()
-            self.product_ids.append(product["id"])  # Save the product ID for other tasks
-            print(f"Added product with ID: {product['id']}")
-        else:
-            print(f"Failed to add product: {response.status_code} - {response.text}")
+    def _request(self, method, url, name=None, expected=None, **kwargs):
+        """
+        Send a request, counting admission control rejections under "<name> [rejected]".
 
-    @task
-    def fetch_all_products(self):
+        Args:
+            expected (int): Optional. Any other status (except a rejection) is a failure.
+
+        Returns:
+            The response.
         """
-        Test GET /api/products
+        with self.client.request(method, url, name=name, catch_response=True, **kwargs) as response:
+            if response.status_code in (429, 503):
+                response.request_meta["name"] = f"{name or url} [rejected]"
+                response.success()
+            elif expected is not None and response.status_code != expected:
+                response.failure(f"{response.status_code}: {response.text}")
+        return response
+
+    def _pick_product(self):
+        # Products from the seed data are shared; a user only deletes its own
+        if self.product_ids and self.rng.random() < 0.8:
+            return self.rng.choice(self.product_ids)
+        return self.rng.randint(1, 3)
+
+    def create(self):
         """
-        response = self.client.get("/api/products")
-        if response.status_code == 200:
-            print(f"Fetched all products: {len(response.json())} items.")
-        else:
-            print(f"Failed to fetch all products: {response.status_code} - {response.text}")
+        Test POST /api/products
+        """
+        response = self._request("POST", "/api/products", expected=201, json=self._payload())
+        if response.status_code == 201:
+            self.product_ids.append(response.json()["id"])
 
-    @task
-    def fetch_product_by_id(self):
+    def get(self):
         """
         Test GET /api/products/<id>
         """
-        if self.product_ids:
-            product_id = random.choice(self.product_ids)  # Pick a random existing product ID
-            response = self.client.get(f"/api/products/{product_id}")
-            if response.status_code == 200:
-                print(f"Fetched product ID: {product_id}")
-            else:
-                print(f"Failed to fetch product ID {product_id}: {response.status_code} - {response.text}")
+        self._request("GET", f"/api/products/{self._pick_product()}", name="/api/products/[id]")
 
-    @task
-    def update_product(self):
+    def list_page(self):
+        """
+        Test GET /api/products with a filtered, sorted page
+        """
+        low = self.rng.randint(5, 400)
+        self._request("GET", f"/api/products?min_price={low}&sort=price&limit=50", name="/api/products?[page]")
+
+    def list_all(self):
+        """
+        Test GET /api/products, the full listing
+        """
+        self._request("GET", "/api/products", name="/api/products [all]")
+
+    def search(self):
+        """
+        Test GET /api/products/search
+        """
+        term = self.rng.choice(SEARCH_TERMS)
+        self._request("GET", f"/api/products/search?q={term}", name="/api/products/search")
+
+    def update(self):
         """
         Test PUT /api/products/<id>
         """
-        if self.product_ids:
-            product_id = random.choice(self.product_ids)  # Pick a random existing product ID
-            payload = {
-                "name": "Updated Product Name",
-                "price": random.uniform(10.0, 1000.0),
-                "quantity": random.randint(1, 200),
-                "description": "Updated product description",
-                "category": "Updated Category",
-                "date_added": "2024-12-10",
-                "image_url": "https://via.placeholder.com/150"
-            }
-            headers = {"Content-Type": "application/json"}
-            response = self.client.put(f"/api/products/{product_id}", json=payload, headers=headers)
-
-            if response.status_code == 200:
-                print(f"Updated product ID: {product_id}")
-            else:
-                print(f"Failed to update product ID {product_id}: {response.status_code} - {response.text}")
+        payload = self._payload()
+        payload["name"] = "Updated Product Name"
+        self._request("PUT", f"/api/products/{self._pick_product()}", name="/api/products/[id]", json=payload)
 
-    @task
-    def delete_product(self):
+    def delete(self):
         """
         Test DELETE /api/products/<id>
         """
-        if self.product_ids:
-            product_id = random.choice(self.product_ids)  # Pick a random existing product ID
-            response = self.client.delete(f"/api/products/{product_id}")
-
-            if response.status_code == 200:
-                self.product_ids.remove(product_id)  # Remove the product ID from the list
-                print(f"Deleted product ID: {product_id}")
-            else:
-                print(f"Failed to delete product ID {product_id}: {response.status_code} - {response.text}")
+        if not self.product_ids:
+            self.create()
+            return
+        product_id = self.product_ids.pop(self.rng.randrange(len(self.product_ids)))
+        self._request("DELETE", f"/api/products/{product_id}", name="/api/products/[id]")
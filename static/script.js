@@ -1,5 +1,8 @@
 const apiEndpoint = '/api/products';
-let allProducts = []; // Store all products for filtering
+let allProducts = new Map(); // All products by id, kept up to date from the change feed
+let changesVersion = null; // The change feed version allProducts is up to date with
+let changeStream = null;
+let pollTimer = null;
 
 // Fetch and display products
 async function fetchProducts() {
@@ -8,46 +11,141 @@ async function fetchProducts() {
         if (!response.ok) {
             throw new Error('Failed to fetch products.');
         }
-        allProducts = await response.json(); // Store fetched products in a global variable
-        displayProducts(allProducts); // Display all products initially
+        const products = await response.json();
+        allProducts = new Map(products.map(product => [product.id, product]));
+        displayProducts(products); // Display all products initially
+        followChanges(Number(response.headers.get('X-Changes-Version')));
     } catch (error) {
         console.error('Error fetching products:', error);
     }
 }
 
+// Keep the products up to date with the changes made since `version`,
+// instead of fetching the whole list again after every change
+function followChanges(version) {
+    changesVersion = version;
+    if (changeStream) {
+        changeStream.close();
+    }
+    clearTimeout(pollTimer);
+    changeStream = new EventSource(`${apiEndpoint}/changes/stream?since=${version}`);
+    changeStream.addEventListener('changes', (event) => {
+        const data = JSON.parse(event.data);
+        applyChanges(data.changes);
+        changesVersion = data.version;
+    });
+    changeStream.addEventListener('reset', () => {
+        changeStream.close();
+        fetchProducts(); // Too far behind, start over from the full list
+    });
+    changeStream.onerror = () => {
+        // EventSource reconnects by itself, unless the server has no stream (the plain Flask server)
+        if (changeStream.readyState === EventSource.CLOSED) {
+            pollChanges();
+        }
+    };
+}
+
+// Fallback for servers without the event stream: ask for the changes every few seconds
+async function pollChanges() {
+    try {
+        const response = await fetch(`${apiEndpoint}/changes?since=${changesVersion}`);
+        if (response.status === 410) {
+            fetchProducts();
+            return;
+        }
+        if (response.ok) {
+            const data = await response.json();
+            applyChanges(data.changes);
+            changesVersion = data.version;
+        }
+    } catch (error) {
+        console.error('Error fetching changes:', error);
+    }
+    pollTimer = setTimeout(pollChanges, 5000);
+}
+
+// Update, add or remove the tiles of changed products in place
+function applyChanges(changes) {
+    const productGrid = document.getElementById('product-grid');
+    const searching = document.getElementById('search-input').value.trim() !== '';
+    changes.forEach(change => {
+        const id = change.op === 'put' ? change.product.id : change.id;
+        const tile = productGrid.querySelector(`[data-id="${id}"]`);
+        if (change.op === 'delete') {
+            allProducts.delete(id);
+            if (tile) {
+                tile.remove();
+            }
+            return;
+        }
+        allProducts.set(id, change.product);
+        if (tile) {
+            tile.replaceWith(renderTile(change.product));
+        } else if (!searching) {
+            productGrid.appendChild(renderTile(change.product)); // New products have the highest ids
+        }
+    });
+}
+
+function renderTile(product) {
+    const tile = document.createElement('div');
+    tile.className = 'product-tile';
+    tile.dataset.id = product.id;
+    tile.innerHTML = `
+        <img src="${product.image_url}" alt="${product.name}">
+        <h3>${product.name}</h3>
+        <p><strong>Price:</strong> $${product.price}</p>
+        <p><strong>Quantity:</strong> ${product.quantity}</p>
+        <p><strong>Description:</strong> ${product.description}</p>
+        <p><strong>Category:</strong> ${product.category}</p>
+        <p><strong>Date Added:</strong> ${product.date_added}</p>
+        <button onclick="editProduct(${product.id})">Edit</button>
+        <button onclick="deleteProduct(${product.id})">Delete</button>
+    `;
+    return tile;
+}
+
 // Display products in the grid
 function displayProducts(products) {
     const productGrid = document.getElementById('product-grid');
     productGrid.innerHTML = ''; // Clear previous content
-
-    products.forEach(product => {
-        const tile = document.createElement('div');
-        tile.className = 'product-tile';
-        tile.innerHTML = `
-            <img src="${product.image_url}" alt="${product.name}">
-            <h3>${product.name}</h3>
-            <p><strong>Price:</strong> $${product.price}</p>
-            <p><strong>Quantity:</strong> ${product.quantity}</p>
-            <p><strong>Description:</strong> ${product.description}</p>
-            <p><strong>Category:</strong> ${product.category}</p>
-            <p><strong>Date Added:</strong> ${product.date_added}</p>
-            <button onclick="editProduct(${product.id})">Edit</button>
-            <button onclick="deleteProduct(${product.id})">Delete</button>
-        `;
-        productGrid.appendChild(tile);
-    });
+    products.forEach(product => productGrid.appendChild(renderTile(product)));
 }
 
-// Search functionality
+// Search functionality (runs on the server, debounced while typing)
+let searchTimer = null;
+let searchController = null;
+
 document.getElementById('search-input').addEventListener('input', (event) => {
-    const searchTerm = event.target.value.toLowerCase();
-    const filteredProducts = allProducts.filter(product =>
-        product.name.toLowerCase().includes(searchTerm) ||
-        product.description.toLowerCase().includes(searchTerm)
-    );
-    displayProducts(filteredProducts); // Display filtered products
+    const searchTerm = event.target.value.trim();
+    clearTimeout(searchTimer);
+    if (searchController) {
+        searchController.abort(); // Drop the results of an older, slower search
+    }
+    if (!searchTerm) {
+        displayProducts([...allProducts.values()]);
+        return;
+    }
+    searchTimer = setTimeout(() => searchProducts(searchTerm), 150);
 });
 
+async function searchProducts(searchTerm) {
+    searchController = new AbortController();
+    try {
+        const params = new URLSearchParams({ q: searchTerm, limit: 100 });
+        const response = await fetch(`${apiEndpoint}/search?${params}`, { signal: searchController.signal });
+        if (!response.ok) {
+            throw new Error('Failed to search products.');
+        }
+        displayProducts(await response.json()); // Display matching products
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            console.error('Error searching products:', error);
+        }
+    }
+}
+
 // Open Modal for Add Product
 document.getElementById('add-product-button').addEventListener('click', () => {
     openModal(); // Open empty modal for adding a product
@@ -114,7 +212,8 @@ document.getElementById('product-form').addEventListener('submit', async (e) =>
         }
 
         closeModal();
-        fetchProducts(); // Refresh the product list
+        const product = await response.json();
+        applyChanges([{ op: 'put', product }]); // Show it now, the change feed will repeat it harmlessly
     } catch (error) {
         console.error('Error saving product:', error);
         alert(`Error: ${error.message}`);
@@ -128,7 +227,7 @@ async function deleteProduct(id) {
         if (!response.ok) {
             throw new Error('Failed to delete product');
         }
-        fetchProducts(); // Refresh the product list after deletion
+        applyChanges([{ op: 'delete', id }]);
     } catch (error) {
         console.error('Error deleting product:', error);
     }
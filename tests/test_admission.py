@@ -0,0 +1,35 @@
+import pytest
+from tornado.httputil import HTTPHeaders, HTTPServerRequest
+
+from app.admission import client_address
+
+PROXIES = frozenset(["10.0.0.1", "10.0.0.2"])
+
+
+def make_request(peer, forwarded_for=None):
+    headers = HTTPHeaders()
+    if forwarded_for is not None:
+        headers.add("X-Forwarded-For", forwarded_for)
+    request = HTTPServerRequest(method="GET", uri="/api/products/1", headers=headers)
+    request.remote_ip = peer
+    return request
+
+
+@pytest.mark.parametrize("peer, forwarded_for, expected", [
+    # X-Forwarded-For from an untrusted peer is ignored, so it can't dodge the rate limit
+    ("203.0.113.7", "198.51.100.1", "203.0.113.7"),
+    ("203.0.113.7", None, "203.0.113.7"),
+    # From a trusted proxy, the address it forwards for
+    ("10.0.0.1", "198.51.100.1", "198.51.100.1"),
+    # Addresses the client put in front of the proxy's are not believed
+    ("10.0.0.1", "1.2.3.4, 198.51.100.1", "198.51.100.1"),
+    # Through a chain of trusted proxies
+    ("10.0.0.1", "198.51.100.1, 10.0.0.2", "198.51.100.1"),
+    ("10.0.0.1", None, "10.0.0.1"),
+])
+def test_client_address(peer, forwarded_for, expected):
+    assert client_address(make_request(peer, forwarded_for), PROXIES) == expected
+
+
+def test_client_address_ignores_forwarded_for_by_default():
+    assert client_address(make_request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
@@ -0,0 +1,58 @@
+import pytest
+
+from app import initialize_app
+
+
+@pytest.fixture(scope="module")
+def client():
+    return initialize_app().test_client()
+
+
+@pytest.fixture
+def product(client):
+    # Long enough for its JSON to be compressed
+    response = client.post("/api/products", json={
+        "name": "Compressed Product",
+        "price": 10.0,
+        "quantity": 5,
+        "description": "x" * 2000,
+        "category": "Tests",
+        "date_added": "2024-06-01",
+        "image_url": "https://via.placeholder.com/150",
+    })
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def get_compressed(client, item_id):
+    response = client.get(f"/api/products/{item_id}", headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] in ("br", "gzip")
+    return response.headers["ETag"]
+
+
+def test_put_if_match_accepts_compressed_etag(client, product):
+    etag = get_compressed(client, product["id"])
+    assert etag.endswith(('-br"', '-gzip"'))
+
+    response = client.put(f"/api/products/{product['id']}", json={"price": 11.0}, headers={"If-Match": etag})
+    assert response.status_code == 200
+
+    # The product changed, so the same ETag no longer matches
+    response = client.put(f"/api/products/{product['id']}", json={"price": 12.0}, headers={"If-Match": etag})
+    assert response.status_code == 412
+
+
+def test_adjust_if_match_accepts_compressed_etag(client, product):
+    etag = get_compressed(client, product["id"])
+    response = client.post(f"/api/products/{product['id']}/adjust", json={"delta": -1}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["quantity"] == 4
+
+
+def test_if_none_match_accepts_compressed_etag(client, product):
+    etag = get_compressed(client, product["id"])
+    response = client.get(
+        f"/api/products/{product['id']}", headers={"Accept-Encoding": "gzip, br", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,156 @@
+"""
+The Flask routes and the asyncio Tornado handlers (--mode async) must answer
+the same requests the same way.
+"""
+import json
+
+import pytest
+from tornado.testing import AsyncHTTPTestCase
+
+from app import initialize_app
+from app.async_api import make_tornado_app
+
+flask_app = initialize_app()
+
+
+class TornadoClient(AsyncHTTPTestCase):
+    # Drives the native handlers with the same calls as the Flask test client
+
+    def get_app(self):
+        return make_tornado_app(flask_app, native_crud=True)
+
+    def runTest(self):
+        pass
+
+    def request(self, method, path, body=None, content_type="application/json"):
+        response = self.fetch(path, method=method, body=body, headers={"Content-Type": content_type},
+                              allow_nonstandard_methods=True)
+        return response.code, json.loads(response.body) if response.body else None
+
+
+class FlaskClient:
+    def __init__(self):
+        self.client = flask_app.test_client()
+
+    def request(self, method, path, body=None, content_type="application/json"):
+        response = self.client.open(path, method=method, data=body, content_type=content_type)
+        return response.status_code, response.get_json() if response.data else None
+
+
+@pytest.fixture(params=["flask", "tornado"])
+def client(request):
+    if request.param == "flask":
+        yield FlaskClient()
+        return
+    tornado_client = TornadoClient()
+    tornado_client.setUp()
+    yield tornado_client
+    tornado_client.tearDown()
+
+
+NEW_PRODUCT = json.dumps({
+    "name": "Contract Product",
+    "price": 1.5,
+    "quantity": 1,
+    "description": "",
+    "category": "Tests",
+    "date_added": "2024-06-01",
+    "image_url": "https://via.placeholder.com/150",
+})
+
+
+def test_delete_missing_product(client):
+    assert client.request("DELETE", "/api/products/999999") == (404, {"error": "Item not found"})
+
+
+def test_delete_product(client):
+    status, product = client.request("POST", "/api/products", NEW_PRODUCT)
+    assert status == 201
+    path = f"/api/products/{product['id']}"
+    assert client.request("DELETE", path) == (200, {"message": "Item deleted successfully"})
+    assert client.request("DELETE", path) == (404, {"error": "Item not found"})
+
+
+@pytest.mark.parametrize("method, path", [
+    ("POST", "/api/products"),
+    ("PUT", "/api/products/1"),
+    ("POST", "/api/products/1/adjust"),
+])
+@pytest.mark.parametrize("body", ["{not json", "[1, 2]"])
+def test_invalid_body(client, method, path, body):
+    assert client.request(method, path, body) == (400, {"error": "Request body must be a JSON object."})
+
+
+@pytest.mark.parametrize("query", ["min_price=nan", "max_price=NaN", "min_price=inf", "max_price=-Infinity"])
+def test_rejects_non_finite_price_bounds(client, query):
+    param = query.split("=")[0]
+    assert client.request("GET", f"/api/products?{query}") == (400, {"error": f"Invalid value for '{param}'."})
+
+
+def test_accepts_finite_price_bounds(client):
+    status, products = client.request("GET", "/api/products?min_price=0&max_price=1e6")
+    assert status == 200
+    assert products
+
+
+def test_deleted_product_is_not_served_from_cache(client):
+    status, product = client.request("POST", "/api/products", NEW_PRODUCT)
+    path = f"/api/products/{product['id']}"
+    assert client.request("GET", path)[0] == 200  # cached
+    assert client.request("DELETE", path)[0] == 200
+    assert client.request("GET", path) == (404, {"error": "Item not found"})
+
+
+def adjust(client, path, body):
+    return client.request("POST", f"{path}/adjust", json.dumps(body))
+
+
+def test_adjust_keeps_quantity_within_the_schema(client):
+    status, product = client.request("POST", "/api/products", NEW_PRODUCT)
+    path = f"/api/products/{product['id']}"
+
+    status, body = adjust(client, path, {"delta": -50, "floor": -100})
+    assert status == 400
+    assert body == {"error": "'floor' must be at least 0."}
+    assert adjust(client, path, {"delta": -2})[0] == 409
+
+    assert adjust(client, path, {"delta": 2**53 - 2})[0] == 200
+    status, body = adjust(client, path, {"delta": 1})
+    assert status == 400
+    assert "more than 9007199254740991" in body["error"]
+
+    # Whatever /adjust stores, PUT accepts back
+    status, product = client.request("GET", path)
+    assert product["quantity"] == 2**53 - 1
+    assert client.request("PUT", path, json.dumps({"quantity": product["quantity"]}))[0] == 200
+
+
+@pytest.mark.parametrize("path", ["/api/products", "/api/products/1", "/api/products?limit=2"])
+def test_head(client, path):
+    assert client.request("HEAD", path) == (200, None)
+
+
+def test_head_missing_product(client):
+    assert client.request("HEAD", "/api/products/999999") == (404, None)
+
+
+@pytest.mark.parametrize("content_type", ["text/plain", "application/x-www-form-urlencoded"])
+def test_json_body_needs_json_content_type(client, content_type):
+    body = json.dumps({"price": 2.5})
+    expected = (400, {"error": "Request body must be a JSON object."})
+    assert client.request("PUT", "/api/products/1", body, content_type) == expected
+    assert client.request("POST", "/api/products", NEW_PRODUCT, content_type) == expected
+
+
+def test_json_body_accepts_json_content_types(client):
+    body = json.dumps({"price": 2.5})
+    assert client.request("PUT", "/api/products/1", body, "application/json; charset=utf-8")[0] == 200
+    assert client.request("PUT", "/api/products/1", body, "application/merge-patch+json")[0] == 200
+
+
+def test_repeated_query_parameter_takes_the_first_value(client):
+    status, products = client.request("GET", "/api/products?limit=1&limit=2")
+    assert status == 200
+    assert len(products) == 1
+    status, products = client.request("GET", "/api/products?sort=-price&sort=price&limit=2")
+    assert [product["price"] for product in products] == sorted((p["price"] for p in products), reverse=True)
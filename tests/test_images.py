@@ -0,0 +1,67 @@
+import base64
+
+import pytest
+
+from app import initialize_app, services
+from app.blobs import BlobStore
+
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n" + bytes(32)).decode()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(services, "blobs", BlobStore(str(tmp_path)))
+    return initialize_app().test_client()
+
+
+def new_product(image_url):
+    return {
+        "name": "Image Product",
+        "price": 10.0,
+        "quantity": 1,
+        "description": "A product with an inline image",
+        "category": "Tests",
+        "date_added": "2024-06-01",
+        "image_url": image_url,
+    }
+
+
+@pytest.mark.parametrize("image_url", [
+    "data:text/html;base64," + base64.b64encode(b"<script>alert(1)</script>").decode(),
+    "data:image/svg+xml,<svg onload='alert(1)'/>",
+    "data:,<script>alert(1)</script>",
+])
+def test_rejects_non_image_data_urls(client, image_url):
+    response = client.post("/api/products", json=new_product(image_url))
+    assert response.status_code == 400
+    assert "Unsupported image type" in response.get_json()["error"]
+
+
+def test_serves_images_with_nosniff(client):
+    response = client.post("/api/products", json=new_product(f"data:image/png;base64,{PNG}"))
+    assert response.status_code == 201
+
+    response = client.get(response.get_json()["image_url"])
+    assert response.status_code == 200
+    assert response.mimetype == "image/png"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert "sandbox" in response.headers["Content-Security-Policy"]
+    assert "attachment" not in response.headers.get("Content-Disposition", "")
+    response.close()
+
+
+def test_serves_other_stored_blobs_as_downloads(client, tmp_path):
+    # A blob stored before types were checked
+    key = "0" * 64 + ".html"
+    path = services.blobs.path(key)
+    (tmp_path / key[:2]).mkdir()
+    with open(path, "wb") as blob:
+        blob.write(b"<script>alert(1)</script>")
+    product = services.store.insert(new_product(f"/api/products/0/image?v={key}"))
+
+    response = client.get(f"/api/products/{product['id']}/image")
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
+    assert response.headers["Content-Disposition"].startswith("attachment")
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    response.close()
@@ -0,0 +1,182 @@
+import glob
+import os
+import random
+import threading
+
+import pytest
+
+from app.persistence import GroupCommitBackend, SQLiteBackend, WALBackend
+from app.store import ProductStore
+
+PRODUCTS = [
+    {"id": item_id, "name": f"Product {item_id}", "price": float(item_id), "quantity": item_id, "version": 1}
+    for item_id in range(1, 21)
+]
+
+
+def make_backend(kind, path, **options):
+    if kind == "wal":
+        return WALBackend(str(path / "wal"), fsync=False, **options)
+    return SQLiteBackend(str(path / "products.db"))
+
+
+def contents(store):
+    return [dict(record) for record in store.all()], store._last_id
+
+
+def reload(kind, path, **options):
+    store = ProductStore(backend=make_backend(kind, path, **options))
+    try:
+        return contents(store)
+    finally:
+        store.close()
+
+
+def test_wal_replays_segments_on_top_of_the_snapshot(tmp_path):
+    store = ProductStore(PRODUCTS, backend=make_backend("wal", tmp_path, snapshot_every=10))
+    for item_id in range(1, 11):
+        store.update(item_id, {"price": item_id * 10.0})
+    store.backend._snapshot_thread.join()
+    # Changes after the snapshot only exist in the segments
+    store.insert({"name": "After the snapshot", "price": 1.0})
+    store.delete(20)
+    store.update(1, {"quantity": 100})
+    expected = contents(store)
+    store.close()
+
+    directory = tmp_path / "wal"
+    assert os.path.exists(directory / "snapshot.jsonl")
+    # The segments the snapshot covers are gone
+    assert len(glob.glob(str(directory / "wal-*.log"))) == 1
+    assert reload("wal", tmp_path) == expected
+    assert expected[1] == 21
+
+
+def test_wal_drops_only_a_torn_final_entry(tmp_path):
+    store = ProductStore(PRODUCTS, backend=make_backend("wal", tmp_path))
+    store.update(1, {"price": 99.0})
+    store.delete(2)
+    expected = contents(store)
+    store.insert({"name": "Torn", "price": 1.0})
+    store.close()
+
+    # Crash halfway through writing the last entry
+    segment = max(glob.glob(str(tmp_path / "wal" / "wal-*.log")))
+    with open(segment, "rb") as log:
+        lines = log.read().splitlines(keepends=True)
+    assert b"Torn" in lines[-1]
+    with open(segment, "wb") as log:
+        log.write(b"".join(lines[:-1]) + lines[-1][:len(lines[-1]) // 2])
+
+    assert reload("wal", tmp_path) == expected
+
+    # Writes after the restart go to a new segment and survive the next one
+    store = ProductStore(backend=make_backend("wal", tmp_path))
+    assert store.insert({"name": "Retried", "price": 1.0})["id"] == 21
+    expected = contents(store)
+    store.close()
+    assert reload("wal", tmp_path) == expected
+
+
+def test_sqlite_round_trip(tmp_path):
+    assert SQLiteBackend(str(tmp_path / "products.db")).load() is None
+
+    store = ProductStore(PRODUCTS, backend=make_backend("sqlite", tmp_path))
+    store.insert({"name": "New", "price": 5.0, "quantity": 1})
+    store.bulk_update([(3, {"price": 30.0}), (4, {"name": "Renamed"})])
+    store.bulk_delete([5, 21])
+    expected = contents(store)
+    store.close()
+
+    assert reload("sqlite", tmp_path) == expected
+    # The id sequence survives the restart, even though id 21 was deleted
+    store = ProductStore(PRODUCTS, backend=make_backend("sqlite", tmp_path))
+    assert store.insert({"name": "Next", "price": 1.0})["id"] == 22
+    store.close()
+
+
+class RecordingBackend(GroupCommitBackend):
+    # Blocks in _persist until released, so writers can queue up behind a flush
+    def __init__(self):
+        super().__init__()
+        self.persisted = []
+        self.flushing = threading.Event()
+        self.release = threading.Event()
+        self.failures = 0
+
+    def _persist(self, batches):
+        self.flushing.set()
+        self.release.wait()
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.persisted.append([operations for operations, _ in batches])
+
+
+def test_group_commit_flushes_queued_writers_together():
+    backend = RecordingBackend()
+    leader = threading.Thread(target=backend.sync, args=(backend.append(["first"], 1),))
+    leader.start()
+    backend.flushing.wait()
+
+    # These queue up while the leader is persisting
+    followers = [
+        threading.Thread(target=backend.sync, args=(backend.append([name], 1),))
+        for name in ("second", "third", "fourth")
+    ]
+    for follower in followers:
+        follower.start()
+    backend.release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+        assert not thread.is_alive()
+
+    assert backend.persisted == [[["first"]], [["second"], ["third"], ["fourth"]]]
+    assert backend._synced == backend._written == 4
+    # Nothing pending, so syncing an old ticket returns right away
+    backend.sync(1)
+    assert len(backend.persisted) == 2
+
+
+def test_group_commit_retries_a_failed_flush():
+    backend = RecordingBackend()
+    backend.release.set()
+    backend.failures = 1
+    ticket = backend.append(["lost?"], 1)
+    with pytest.raises(OSError):
+        backend.sync(ticket)
+    assert backend.persisted == []
+
+    backend.sync(backend.append(["next"], 2))
+    assert backend.persisted == [[["lost?"], ["next"]]]
+
+
+@pytest.mark.parametrize("kind", ["wal", "sqlite"])
+def test_concurrent_writes_reload_identically(tmp_path, kind):
+    # A small snapshot interval, so WAL snapshots happen while writers run
+    options = {"snapshot_every": 50} if kind == "wal" else {}
+    store = ProductStore(PRODUCTS, backend=make_backend(kind, tmp_path, **options))
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(100):
+            item_id = rng.randint(1, store._last_id)
+            action = rng.choice(["insert", "update", "delete", "modify"])
+            if action == "insert":
+                store.insert({"name": f"Worker {seed}", "price": rng.uniform(1, 100), "quantity": 0})
+            elif action == "update":
+                store.update(item_id, {"price": rng.uniform(1, 100)})
+            elif action == "delete":
+                store.delete(item_id)
+            else:
+                store.modify(item_id, lambda current: {"quantity": current["quantity"] + 1})
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    expected = contents(store)
+    store.close()
+
+    assert reload(kind, tmp_path, **options) == expected
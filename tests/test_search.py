@@ -0,0 +1,36 @@
+import random
+
+from app.search import SearchIndex
+
+
+def make_index(records):
+    index = SearchIndex()
+    index.build(records)
+    return index
+
+
+def test_ties_go_to_the_lower_id_across_tiers():
+    # "ab" and "ac" are separate completions of "a" with the same score, so
+    # id 1 sits in a tier visited after id 5 has already filled the top
+    index = make_index([{"id": 5, "name": "ab"}, {"id": 1, "name": "ac"}])
+    assert index.search("a", 1) == [1]
+    assert index.search("a", 2) == [1, 5]
+
+
+def test_top_k_is_a_prefix_of_top_k_plus_one():
+    rng = random.Random(7)
+    words = ["alpha", "alpine", "album", "amber", "anchor", "apple", "arch", "atlas"]
+    records = [
+        {
+            "id": item_id,
+            "name": " ".join(rng.sample(words, 2)),
+            "category": rng.choice(words),
+            "description": " ".join(rng.choices(words, k=3)),
+        }
+        for item_id in rng.sample(range(1, 1000), 200)
+    ]
+    index = make_index(records)
+    for query in ("a", "al", "alp", "apple a", "arch"):
+        full = index.search(query, len(records))
+        for limit in range(1, 30):
+            assert index.search(query, limit) == full[:limit], (query, limit)
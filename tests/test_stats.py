@@ -0,0 +1,32 @@
+import pytest
+
+from app.stats import StatsIndex, compute_stats, stats_match
+
+PRODUCTS = [
+    {"id": 1, "category": "a", "price": 19.99, "quantity": 10},
+    {"id": 2, "category": "a", "price": 5.5, "quantity": 3},
+    {"id": 3, "category": "b", "price": 100, "quantity": 4},
+]
+
+
+@pytest.mark.parametrize("huge", [
+    {"price": 1e308, "quantity": 10},
+    {"price": 10**400, "quantity": 1},
+    {"price": 1.5, "quantity": 10**400},
+    {"price": float("inf"), "quantity": 1},
+    {"price": float("nan"), "quantity": 1},
+])
+def test_huge_numbers_dont_break_the_sums(huge):
+    index = StatsIndex(group_by=["category"])
+    index.build(PRODUCTS)
+    product = {"id": 4, "category": "a", **huge}
+
+    index.add(product)
+    records = PRODUCTS + [product]
+    assert stats_match(index.summary(), compute_stats(records))
+    assert stats_match(index.summary("category"), compute_stats(records, "category"))
+
+    index.remove(product)
+    assert stats_match(index.summary(), compute_stats(PRODUCTS))
+    assert stats_match(index.summary("category"), compute_stats(PRODUCTS, "category"))
+    assert index.summary()["inventory_value"] == pytest.approx(616.4)
@@ -0,0 +1,106 @@
+import pytest
+
+from app.indexes import HashIndex, SortedIndex
+from app.stats import StatsIndex
+from app.store import ProductStore
+
+PRODUCTS = [
+    {"id": item_id, "name": f"Product {item_id}", "price": float(item_id), "category": "a" if item_id % 2 else "b"}
+    for item_id in range(1, 6)
+]
+
+
+class Poisoned(Exception):
+    pass
+
+
+class PoisonIndex(HashIndex):
+    # Fails to index any product named "poison"
+    def __init__(self):
+        super().__init__("name")
+
+    def build(self, records):
+        records = list(records)
+        for record in records:
+            self._check(record)
+        super().build(records)
+
+    def add(self, record):
+        self._check(record)
+        super().add(record)
+
+    def _check(self, record):
+        if record["name"] == "poison":
+            raise Poisoned()
+
+
+@pytest.fixture
+def store():
+    store = ProductStore(PRODUCTS, indexes={
+        "category": HashIndex("category"),
+        "price": SortedIndex("price"),
+        # Before and after the failing index, so both get rolled back
+        "stats": StatsIndex(group_by=["category"]),
+        "poison": PoisonIndex(),
+        "stats after": StatsIndex(),
+    })
+    store.logged = []
+    store.add_listener(lambda version, operations: store.logged.append(operations))
+    return store
+
+
+def state(store):
+    return (
+        store.all(),
+        store.version,
+        store._last_id,
+        store.query(equals={"category": "a"}),
+        store.query(ranges={"price": (2, 4)}, sort="price"),
+        store.stats("category", index="stats"),
+        store.stats(index="stats after"),
+        store.logged[:],
+    )
+
+
+@pytest.mark.parametrize("write", [
+    lambda store: store.insert({"name": "poison", "price": 1.0, "category": "a"}),
+    lambda store: store.update(3, {"name": "poison"}),
+    lambda store: store.bulk_insert([{"name": "fine", "category": "a"}, {"name": "poison", "category": "a"}]),
+    lambda store: store.bulk_update([(1, {"price": 10.0}), (2, {"name": "poison"})]),
+    lambda store: store.apply([("delete", 1), ("put", {"id": 9, "name": "poison", "version": 1})]),
+    lambda store: store.apply([("put", {"id": 9, "name": "poison", "version": 1})], replace=True),
+], ids=["insert", "update", "bulk_insert", "bulk_update", "apply", "apply replace"])
+def test_failed_index_update_rolls_back_the_write(store, write):
+    before = state(store)
+    with pytest.raises(Poisoned):
+        write(store)
+    assert state(store) == before
+    # The index was rolled back too, so the product can still change
+    assert store.update(3, {"price": 30.0})["price"] == 30.0
+
+
+@pytest.mark.parametrize("write", [
+    lambda store: store.bulk_update([(5, {"price": 50.0}), (1, {"name": "poison"})]),
+    lambda store: store.apply([("delete", 2), ("put", {"id": 9, "name": "poison", "version": 1})]),
+], ids=["bulk_update", "apply"])
+def test_failed_index_rebuild_rolls_back_the_write(store, write, monkeypatch):
+    # Large batches rebuild the indexes once at the end instead
+    monkeypatch.setattr(store, "_is_small_batch", lambda size: False)
+    before = state(store)
+    with pytest.raises(Poisoned):
+        write(store)
+    assert state(store) == before
+
+
+def test_item_versions_forget_deleted_products(store):
+    for _ in range(100):
+        store.delete(store.insert({"name": "churn", "category": "a"})["id"])
+    assert len(store._item_versions) == 0
+    assert store.item_version(6) == -1
+
+
+def test_item_version_changes_when_product_is_deleted(store):
+    # A product that never changed has version 0, and so does a cached response built from it
+    version = store.item_version(3)
+    store.delete(3)
+    assert store.item_version(3) != version
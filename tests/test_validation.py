@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from app import codec, initialize_app, services
+
+
+@pytest.fixture(params=["codec", "json"])
+def client(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(codec, "loads", json.loads)
+    return initialize_app().test_client()
+
+
+@pytest.mark.parametrize("price", ["1" + "0" * 400, "1e308", "1000000000001"])
+def test_rejects_huge_prices(client, price):
+    count = len(services.store)
+    body = (
+        '{"name": "Huge", "price": %s, "quantity": 1, "description": "", "category": "Tests",'
+        ' "date_added": "2024-06-01", "image_url": "https://via.placeholder.com/150"}' % price
+    )
+    response = client.post("/api/products", data=body, content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "'price' must be at most 1000000000000."
+    assert len(services.store) == count